@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:03:15 2026
+
+Solve every truss CSV file in a set of folders on a process pool
+
+    python Batch_Runner.py CSV_Files --output results.npz --workers 4
+
+Models are sent to the workers in chunks, and only a bounded number of
+chunks are in flight at once. Bar forces and reactions of all models are
+written to one columnar .npz file: model k owns bar_force[bar_ptr[k]:
+bar_ptr[k+1]] and the reaction_* entries between reaction_ptr[k] and
+reaction_ptr[k+1]. Columns are appended to temporary files as chunks
+complete and only copied into the .npz at the end, so memory holds the
+chunks in flight and a path, status and message per model. Models that
+fail (including the sys.exit calls of the solver) are reported with their
+message instead of stopping the batch.
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+
+from Main_for_Final_Testing import MethodOfJoints
+
+BATCH_CHUNK_SIZE = 16
+
+# Sorted CSV files of a list of files and folders (searched recursively)
+def FindModels(paths, pattern='*.csv'):
+    models = []
+    for path in paths:
+        if(os.path.isdir(path)):
+            models.extend(glob.glob(os.path.join(path, '**', pattern), recursive=True))
+        else:
+            models.append(path)
+    return sorted(set(models))
+
+# Result of a model without any bar forces or reactions
+def EmptyResult(path, status='ok', message=''):
+    return {'path': path, 'status': status, 'message': message,
+            'bar_force': np.zeros(0), 'reaction_node': np.zeros(0, dtype=np.int64),
+            'reaction_direction': np.zeros(0, dtype=np.int8), 'reaction_force': np.zeros(0)}
+
+# Solve one model. Returns a dictionary with the status ("ok" or "failed"),
+# the failure message, and the bar forces and support reactions of the
+# solved truss. Nothing raised by the solver, including SystemExit, escapes.
+# use_cache caches the parsed model next to its CSV file.
+def SolveModel(path, solver="joints", use_cache=False):
+    result = EmptyResult(path)
+    try:
+        nodes, bars = MethodOfJoints(path, solver, use_cache=use_cache)[:2]
+        model = nodes.model
+        dofs = np.flatnonzero(model.SupportMask().ravel())
+        result['bar_force'] = model.axial_load.copy()
+        result['reaction_node'] = model.node_list_idx[dofs // 2]
+        result['reaction_direction'] = (dofs % 2).astype(np.int8)
+        result['reaction_force'] = model.reaction.ravel()[dofs]
+    except SystemExit as error:
+        result = EmptyResult(path, 'failed', str(error.code) if error.code is not None else 'exited')
+    except Exception as error:
+        result = EmptyResult(path, 'failed', '%s: %s' % (type(error).__name__, error))
+    return result
+
+# Solve a chunk of models in one worker call
+def SolveChunk(paths, solver="joints", use_cache=False):
+    return [SolveModel(path, solver, use_cache) for path in paths]
+
+# Path, status and message of a result, without its arrays
+def Summary(result):
+    return {key: result[key] for key in ('path', 'status', 'message')}
+
+# Solve many models, in this process when workers is 1 and on a process
+# pool otherwise. At most max_in_flight chunks of chunk_size models are
+# submitted or waiting to be written at once, so memory stays bounded
+# however many models there are. Completed chunks are passed to
+# writer.Add in the order of the paths. Returns the summaries of the
+# results in that order.
+def RunBatch(paths, solver="joints", workers=None, chunk_size=BATCH_CHUNK_SIZE, max_in_flight=None, log=None,
+             use_cache=False, writer=None):
+    chunks = [paths[k:k + chunk_size] for k in range(0, len(paths), chunk_size)]
+    summaries = []
+
+    def Completed(results):
+        if writer is not None:
+            writer.Add(results)
+        summaries.extend(Summary(result) for result in results)
+
+    if(workers == 1):
+        for chunk in chunks:
+            results = SolveChunk(chunk, solver, use_cache)
+            Report(results, log)
+            Completed(results)
+        return summaries
+
+    if(workers is None):
+        workers = os.cpu_count() or 1
+    if(max_in_flight is None):
+        max_in_flight = 2*workers
+    # chunks that finish early wait here until the chunks before them are
+    # written; they count against max_in_flight
+    finished = {}
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        next_chunk = 0
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) + len(finished) < max_in_flight:
+                pending[pool.submit(SolveChunk, chunks[next_chunk], solver, use_cache)] = next_chunk
+                next_chunk += 1
+            done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                k = pending.pop(future)
+                try:
+                    finished[k] = future.result()
+                except Exception as error:
+                    # the worker itself died; fail the whole chunk
+                    message = '%s: %s' % (type(error).__name__, error)
+                    finished[k] = [EmptyResult(path, 'failed', message) for path in chunks[k]]
+                Report(finished[k], log)
+            while written in finished:
+                Completed(finished.pop(written))
+                written += 1
+    return summaries
+
+# Log failed models as they complete
+def Report(results, log):
+    if(log is None):
+        return
+    for result in results:
+        if(result['status'] != 'ok'):
+            log("FAILED %s: %s" % (result['path'], result['message']))
+
+# Columns of the results file that are concatenated over all models
+RESULT_COLUMNS = (('bar_force', float), ('reaction_node', np.int64),
+                  ('reaction_direction', np.int8), ('reaction_force', float))
+
+# Writer of batch results as columnar arrays to an .npz file. Every column
+# is appended to its own temporary file next to the output as results are
+# added, and streamed into the .npz on Close.
+class ResultWriter:
+
+    def __init__(self, path):
+        self.path = path
+        self.folder = tempfile.mkdtemp(prefix='.batch', dir=os.path.dirname(os.path.abspath(path)))
+        self.columns = {key: open(os.path.join(self.folder, key), 'wb') for key, dtype in RESULT_COLUMNS}
+        self.summaries = []
+        self.bar_counts = [0]
+        self.reaction_counts = [0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, kind, value, traceback):
+        if kind is None:
+            self.Close()
+        else:
+            self.Discard()
+
+    # Append a list of results
+    def Add(self, results):
+        for result in results:
+            self.summaries.append(Summary(result))
+            self.bar_counts.append(len(result.get('bar_force', ())))
+            self.reaction_counts.append(len(result.get('reaction_force', ())))
+            for key, dtype in RESULT_COLUMNS:
+                self.columns[key].write(np.ascontiguousarray(result.get(key, ()), dtype=dtype).tobytes())
+
+    # Write the .npz file and remove the temporary files
+    def Close(self):
+        for f in self.columns.values():
+            f.close()
+        arrays = {'model_path': np.array([summary['path'] for summary in self.summaries], dtype=str),
+                  'status': np.array([summary['status'] for summary in self.summaries], dtype=str),
+                  'message': np.array([summary['message'] for summary in self.summaries], dtype=str),
+                  'bar_ptr': np.cumsum(self.bar_counts).astype(np.int64),
+                  'reaction_ptr': np.cumsum(self.reaction_counts).astype(np.int64)}
+        try:
+            with zipfile.ZipFile(self.path, 'w', allowZip64=True) as archive:
+                for key, array in arrays.items():
+                    with archive.open(key + '.npy', 'w', force_zip64=True) as f:
+                        np.lib.format.write_array(f, array)
+                for key, dtype in RESULT_COLUMNS:
+                    source = os.path.join(self.folder, key)
+                    header = {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)), 'fortran_order': False,
+                              'shape': (os.path.getsize(source) // np.dtype(dtype).itemsize,)}
+                    with archive.open(key + '.npy', 'w', force_zip64=True) as f, open(source, 'rb') as g:
+                        np.lib.format.write_array_header_2_0(f, header)
+                        shutil.copyfileobj(g, f)
+        finally:
+            shutil.rmtree(self.folder, ignore_errors=True)
+
+    # Remove the temporary files without writing the .npz file
+    def Discard(self):
+        for f in self.columns.values():
+            f.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+# Write a list of batch results as columnar arrays to an .npz file
+def WriteResults(results, path):
+    with ResultWriter(path) as writer:
+        writer.Add(results)
+
+def Main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve every truss CSV file in a set of folders")
+    parser.add_argument('paths', nargs='+', help="CSV files or folders searched recursively")
+    parser.add_argument('--output', default='batch_results.npz', help="columnar results file")
+    parser.add_argument('--solver', default='joints', choices=['joints', 'matrix', 'stiffness'])
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (1 runs in process)")
+    parser.add_argument('--chunk-size', type=int, default=BATCH_CHUNK_SIZE, help="models per worker call")
+    parser.add_argument('--max-in-flight', type=int, default=None, help="chunks submitted or waiting to be written")
+    parser.add_argument('--use-cache', action='store_true', help="cache parsed models next to their CSV files")
+    args = parser.parse_args(argv)
+
+    paths = FindModels(args.paths)
+    with ResultWriter(args.output) as writer:
+        results = RunBatch(paths, args.solver, args.workers, args.chunk_size, args.max_in_flight, print,
+                           args.use_cache, writer)
+
+    n_failed = sum(1 for result in results if result['status'] != 'ok')
+    print("Solved %d of %d models, results written to %s" % (len(results) - n_failed, len(results), args.output))
+    if(n_failed > 0):
+        sys.exit("%d models failed" % n_failed)
+
+if __name__ == '__main__':
+    Main()
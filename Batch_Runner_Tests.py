@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:31:47 2026
+
+Tests for the parallel batch runner
+"""
+
+import os
+import shutil
+import tempfile
+import numpy as np
+import Batch_Runner as batch
+import Truss_Generator as generator
+
+import unittest
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        shutil.copy("Example_3_3.csv", self.folder)
+        os.mkdir(os.path.join(self.folder, "generated"))
+        for n_panels in (2, 4, 6):
+            generator.WriteTrussCSV(generator.GenerateTruss('howe', n_panels),
+                                    os.path.join(self.folder, "generated", "howe_%d.csv" % n_panels))
+        # a model whose bars reference a node that does not exist
+        with open("Example_3_2.csv", 'r') as f:
+            text = f.read()
+        with open(os.path.join(self.folder, "broken.csv"), 'w') as f:
+            f.write(text.replace("10,3,4,", "10,3,44,"))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_Failures_Do_Not_Stop_The_Batch(self):
+        paths = batch.FindModels([self.folder])
+        output = os.path.join(self.folder, "results.npz")
+        with batch.ResultWriter(output) as writer:
+            results = batch.RunBatch(paths, workers=1, chunk_size=2, writer=writer)
+
+        # only the summaries are kept in memory
+        self.assertEqual(5, len(paths))
+        self.assertEqual(paths, [result['path'] for result in results])
+        self.assertEqual(['ok', 'failed', 'ok', 'ok', 'ok'], [result['status'] for result in results])
+        self.assertEqual("Bars reference undefined nodes [44]", results[1]['message'])
+        self.assertNotIn('bar_force', results[0])
+        with np.load(output) as columns:
+            self.assertAlmostEqual(-692.781, columns['bar_force'][0], 2)
+            self.assertEqual(columns['bar_ptr'][1], columns['bar_ptr'][2])
+        self.assertEqual(["results.npz"], [name for name in os.listdir(self.folder) if name.startswith(('.', 'results'))])
+
+    def test_Process_Pool_And_Columnar_Results(self):
+        paths = batch.FindModels([self.folder])
+        serial = [batch.SolveModel(path) for path in paths]
+        output = os.path.join(self.folder, "results.npz")
+        with batch.ResultWriter(output) as writer:
+            batch.RunBatch(paths, workers=2, chunk_size=1, max_in_flight=2, writer=writer)
+
+        with np.load(output) as results:
+            self.assertEqual(list(paths), results['model_path'].tolist())
+            for k, result in enumerate(serial):
+                np.testing.assert_allclose(result['bar_force'],
+                                           results['bar_force'][results['bar_ptr'][k]:results['bar_ptr'][k + 1]])
+                np.testing.assert_allclose(result['reaction_force'],
+                                           results['reaction_force'][results['reaction_ptr'][k]:results['reaction_ptr'][k + 1]])
+            self.assertEqual([0, 1, 1], results['reaction_direction'][:3].tolist())
+
+if __name__ == '__main__':
+    unittest.main()
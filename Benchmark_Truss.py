@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:34:12 2026
+
+Scaling benchmark of the method of joints pipeline on generated trusses
+
+Run as a script to time LoadData, StaticallyDeterminate, ComputeReactions
+and IterateUsingMethodOfJoints on generated trusses of increasing size,
+write the results to a JSON baseline and compare against an earlier one:
+
+    python Benchmark_Truss.py --sizes 10 1000 100000 --output baseline.json
+    python Benchmark_Truss.py --sizes 10 1000 100000 --compare baseline.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+from ImportCSVData import LoadData
+from Method_of_Joints import IterateUsingMethodOfJoints
+from Structure_Operations import StaticallyDeterminate
+from Structure_Operations import ComputeReactions
+import Truss_Generator as generator
+
+BENCHMARK_VERSION = 1
+BENCHMARK_SIZES = (10, 100, 1000, 10000, 100000, 1000000)
+BENCHMARK_PHASES = ('LoadData', 'StaticallyDeterminate', 'ComputeReactions', 'IterateUsingMethodOfJoints')
+
+# Run the method of joints pipeline on a truss CSV file, calling
+# measure(phase, function) for every phase
+def RunPipeline(path, measure):
+    nodes, bars = measure('LoadData', lambda: LoadData(path))
+    if not measure('StaticallyDeterminate', lambda: StaticallyDeterminate(nodes, bars)):
+        sys.exit("Benchmark truss %s is not statically determinate" % path)
+    measure('ComputeReactions', lambda: ComputeReactions(nodes))
+    measure('IterateUsingMethodOfJoints', lambda: IterateUsingMethodOfJoints(nodes, bars))
+
+# Wall time of every phase in seconds
+def TimePhases(path):
+    times = {}
+    def Measure(phase, function):
+        start = time.perf_counter()
+        result = function()
+        times[phase] = time.perf_counter() - start
+        return result
+    gc.collect()
+    RunPipeline(path, Measure)
+    return times
+
+# Peak traced memory during every phase in bytes, including what earlier
+# phases still hold (a separate run, since tracing slows the pipeline down)
+def PeakMemoryOfPhases(path):
+    peaks = {}
+    def Measure(phase, function):
+        tracemalloc.reset_peak()
+        result = function()
+        peaks[phase] = tracemalloc.get_traced_memory()[1]
+        return result
+    gc.collect()
+    tracemalloc.start()
+    try:
+        RunPipeline(path, Measure)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+# Benchmark one generated truss. Phase times are the best of repeat runs.
+def BenchmarkTruss(kind, n_bars, folder, repeat=3, memory=True):
+    model = generator.GenerateTruss(kind, generator.PanelsForBars(kind, n_bars))
+    path = os.path.join(folder, "%s_%d.csv" % (kind, model.n_bars))
+    generator.WriteTrussCSV(model, path)
+
+    runs = [TimePhases(path) for _ in range(max(1, repeat))]
+    phases = {phase: {'time': min(run[phase] for run in runs)} for phase in BENCHMARK_PHASES}
+    result = {'kind': kind, 'n_nodes': model.n_nodes, 'n_bars': model.n_bars,
+              'wall_time': sum(phase['time'] for phase in phases.values())}
+    if(memory):
+        peaks = PeakMemoryOfPhases(path)
+        for phase in BENCHMARK_PHASES:
+            phases[phase]['peak_memory'] = peaks[phase]
+        result['peak_memory'] = max(peaks.values())
+    result['phases'] = phases
+    os.remove(path)
+    return result
+
+# Benchmark every truss kind at every size. Large trusses are only run once.
+def RunBenchmarks(kinds=('pratt',), sizes=BENCHMARK_SIZES, repeat=3, memory=True, log=None):
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for kind in kinds:
+            for n_bars in sizes:
+                runs = repeat if n_bars < 100000 else 1
+                result = BenchmarkTruss(kind, n_bars, folder, runs, memory)
+                results["%s/%d" % (kind, n_bars)] = result
+                if(log is not None):
+                    log("%-16s %8d bars %10.4f s" % (kind, result['n_bars'], result['wall_time']))
+    return {'version': BENCHMARK_VERSION,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'results': results}
+
+# Compare benchmark results against a baseline. Returns a list of
+# (truss, phase, metric, baseline value, new value) for every measurement
+# that grew by more than the tolerance (a fraction). Times below min_time
+# seconds are too noisy to compare.
+def CompareToBaseline(benchmark, baseline, tolerance=0.25, min_time=1e-3):
+    regressions = []
+    for key, result in benchmark['results'].items():
+        base = baseline.get('results', {}).get(key)
+        if(base is None):
+            continue
+        for phase, values in result['phases'].items():
+            base_values = base['phases'].get(phase, {})
+            for metric, value in values.items():
+                base_value = base_values.get(metric)
+                if(base_value is None or (metric == 'time' and max(value, base_value) < min_time)):
+                    continue
+                if(value > base_value * (1 + tolerance)):
+                    regressions.append((key, phase, metric, base_value, value))
+    return regressions
+
+def WriteBenchmark(benchmark, path):
+    with open(path, 'w') as f:
+        json.dump(benchmark, f, indent=2, sort_keys=True)
+
+def ReadBenchmark(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def Main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the method of joints on generated trusses")
+    parser.add_argument('--kinds', nargs='+', default=['pratt'], choices=generator.TRUSS_KINDS)
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(BENCHMARK_SIZES),
+                        help="approximate numbers of bars")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced peak memory run")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="baseline JSON file to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    benchmark = RunBenchmarks(args.kinds, args.sizes, args.repeat, not args.no_memory, print)
+    if(args.output):
+        WriteBenchmark(benchmark, args.output)
+    if(args.compare):
+        regressions = CompareToBaseline(benchmark, ReadBenchmark(args.compare), args.tolerance)
+        for key, phase, metric, base_value, value in regressions:
+            print("%s %s %s: %.6g -> %.6g" % (key, phase, metric, base_value, value))
+        if(regressions):
+            sys.exit("%d benchmark regressions against %s" % (len(regressions), args.compare))
+
+if __name__ == '__main__':
+    Main()
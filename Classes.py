@@ -9,78 +9,571 @@ import math
 import sys
 import numpy as np
 
-# Node member information
+# Directions restrained by each named constraint
+# -1 if incompatible, 0 if x, 1 if y, 2 if moment
+CONSTRAINT_TYPES = {
+    'none': [],
+    '': [],
+    'roller_no_xdisp': [0],
+    'roller_no_ydisp': [1],
+    'adisp': [-1], # cannot operate in generic frame of reference at the moment
+    'moment': [2],
+    'pin': [0, 1],
+    'xdispmoment': [0, 2],
+    'ydispmoment': [1, 2],
+    'adispmoment': [-1, 2],
+    'fixed': [0, 1, 2],
+}
+
+# Look up the restrained directions of a constraint name
+def ConstraintType(constraint):
+    # the current constraint type is not defined
+    return list(CONSTRAINT_TYPES.get(constraint.lower(), [-1]))
+
+# List of node or bar views that remembers the model it views
+class ViewList(list):
+
+    def __init__(self, views, model):
+        super().__init__(views)
+        self.model = model
+
+# Return the model behind a node and bar list when the lists are exactly the
+# model's own views, so that solvers can work on the arrays directly
+def ModelOf(nodes, bars=None):
+    model = getattr(nodes, 'model', None)
+    if(model is None or len(nodes) != model.n_nodes):
+        return None
+    if(bars is not None and (getattr(bars, 'model', None) is not model or len(bars) != model.n_bars)):
+        return None
+    return model
+
+# Struct-of-arrays storage for a whole truss. Node and Bar objects are thin
+# views onto one row of these arrays.
+class TrussModel:
+
+    def __init__(self, n_nodes=0, n_bars=0):
+        # node data
+        self.node_list_idx = np.arange(n_nodes, dtype=np.int64)
+        self.xy = np.full((n_nodes, 2), float("NAN"))
+        self.force_external = np.zeros((n_nodes, 2))
+        self.constraint_code = np.zeros(n_nodes, dtype=np.int16)
+        self.constraint_names = ['none']
+
+        # bar data: node rows at the start and end of each bar
+        self.conn = np.full((n_bars, 2), -1, dtype=np.int32)
+
+        self.ResetResults()
+
+        # section type and material of each bar as codes into the name lists
+        self.section_code = np.zeros(n_bars, dtype=np.int32)
+        self.section_names = ['']
+        self.material_code = np.zeros(n_bars, dtype=np.int32)
+        self.material_names = ['']
+
+        # node -> bar incidence in CSR form, built on demand
+        self.incidence_ptr = None
+        self.incidence_bars = None
+
+        # bar geometry (init -> end vectors, lengths, direction cosines),
+        # built on demand and invalidated whenever a node moves
+        self.bar_delta = None
+        self.bar_length = None
+        self.bar_unit = None
+
+        # incremented whenever the geometry, supports or sections change, so
+        # that solvers know when a cached factorization may be stale
+        self.revision = 0
+
+        # load DOFs (2*row + direction) edited through the node views, kept
+        # only while an incremental solver tracks them (None otherwise)
+        self.load_edits = None
+
+        self._node_views = None
+        self._bar_views = None
+        self._list_idx_lookup = None
+        self._list_idx_rows = None
+        # buffers with spare capacity behind arrays grown by _Append
+        self._buffers = {}
+
+    # (Re)allocate reactions and bar forces for the current numbers of nodes
+    # and bars, marking everything as not yet computed
+    def ResetResults(self):
+        self.reaction = np.full((self.n_nodes, 2), float("NAN"))
+        self.moment_reaction = np.full(self.n_nodes, float("NAN"))
+        self.displacement = np.full((self.n_nodes, 2), float("NAN"))
+        self.accepts_moment = np.zeros(self.n_nodes, dtype=bool)
+        self.axial_load = np.full(self.n_bars, float("NAN"))
+        self.is_computed = np.zeros(self.n_bars, dtype=bool)
+
+    @property
+    def n_nodes(self):
+        return len(self.xy)
+
+    @property
+    def n_bars(self):
+        return len(self.conn)
+
+    # Views onto every node of the model
+    @property
+    def nodes(self):
+        if(self._node_views is None):
+            self._node_views = ViewList([Node(row, self) for row in range(self.n_nodes)], self)
+        return self._node_views
+
+    # Views onto every bar of the model
+    @property
+    def bars(self):
+        if(self._bar_views is None):
+            self._bar_views = ViewList([Bar(row, self) for row in range(self.n_bars)], self)
+        return self._bar_views
+
+    # Code of a constraint name, adding it to the model's names if needed
+    def ConstraintCode(self, constraint):
+        return self.CategoryCode(self.constraint_names, constraint)
+
+    # Code of a name in a list of category names, adding it if needed
+    @staticmethod
+    def CategoryCode(names, name):
+        try:
+            return names.index(name)
+        except ValueError:
+            names.append(name)
+            return len(names) - 1
+
+    # Set the constraints of all nodes from a list of names
+    def SetConstraints(self, constraints):
+        names, codes = np.unique(np.asarray(constraints, dtype=str), return_inverse=True)
+        lookup = np.array([self.ConstraintCode(name) for name in names], dtype=np.int16)
+        self.constraint_code = lookup[codes.ravel()] if len(names) else np.zeros(0, dtype=np.int16)
+        self.InvalidateStructure()
+
+    # Per-node flags for restrained x, restrained y, moment and invalid
+    # constraints as an (n_nodes, 4) boolean array
+    def ConstraintFlags(self):
+        table = np.zeros((len(self.constraint_names), 4), dtype=bool)
+        for code, name in enumerate(self.constraint_names):
+            for direction in ConstraintType(name):
+                table[code, direction] = True
+        return table[self.constraint_code]
+
+    # Restrained x and y directions of every node as an (n_nodes, 2) array
+    def SupportMask(self):
+        return self.ConstraintFlags()[:, :2]
+
+    # Node rows corresponding to node list indices from the input file
+    def RowsOfListIdxs(self, list_idxs):
+        if(self._list_idx_lookup is None):
+            order = np.argsort(self.node_list_idx, kind='stable')
+            self._list_idx_lookup = (self.node_list_idx[order], order)
+        sorted_idxs, order = self._list_idx_lookup
+        list_idxs = np.asarray(list_idxs, dtype=np.int64)
+        if(list_idxs.size == 0):
+            return np.zeros(list_idxs.shape, dtype=np.int64)
+        pos = np.clip(np.searchsorted(sorted_idxs, list_idxs), 0, max(len(sorted_idxs) - 1, 0))
+        if(len(sorted_idxs) == 0 or np.any(sorted_idxs[pos] != list_idxs)):
+            missing = np.setdiff1d(list_idxs, sorted_idxs)
+            sys.exit("Bars reference undefined nodes %s" % missing.tolist())
+        return order[pos]
+
+    # Dict from node list index to the first node row with it, built on
+    # demand and kept up to date as nodes are appended
+    def ListIdxRows(self):
+        if(self._list_idx_rows is None):
+            self._list_idx_rows = {}
+            for row, list_idx in enumerate(self.node_list_idx.tolist()):
+                self._list_idx_rows.setdefault(list_idx, row)
+        return self._list_idx_rows
+
+    # Build the CSR node -> bar incidence from the bar connectivity. Bars
+    # appear in increasing index order for every node.
+    def BuildIncidence(self):
+        attached = np.flatnonzero(self.conn.ravel() >= 0)
+        ends = self.conn.ravel()[attached]
+        bar_ids = (attached // 2).astype(np.int32)
+        order = np.argsort(ends, kind='stable')
+        self.incidence_bars = bar_ids[order]
+        self.incidence_ptr = np.zeros(self.n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ends, minlength=self.n_nodes), out=self.incidence_ptr[1:])
+
+    # Compute the vector, length and unit vector of every bar in one pass
+    def BuildGeometry(self):
+        self.bar_delta = self.xy[self.conn[:, 1]] - self.xy[self.conn[:, 0]]
+        self.bar_delta[np.any(self.conn < 0, axis=1)] = float("NAN")
+        self.bar_length = np.hypot(self.bar_delta[:, 0], self.bar_delta[:, 1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.bar_unit = self.bar_delta / self.bar_length[:, None]
+
+    # Cached bar geometry as (delta, length, unit) arrays
+    def BarGeometry(self):
+        if(self.bar_delta is None):
+            self.BuildGeometry()
+        return self.bar_delta, self.bar_length, self.bar_unit
+
+    # Mark the cached bar geometry as stale
+    def InvalidateGeometry(self):
+        self.bar_delta = None
+        self.bar_length = None
+        self.bar_unit = None
+        self.InvalidateStructure()
+
+    # Mark the structure as changed. Call after writing to xy, conn,
+    # constraint_code, section_code or material_code directly.
+    def InvalidateStructure(self):
+        self.revision += 1
+
+    # Note an edited external load DOF for an incremental solver
+    def RecordLoadEdit(self, dof):
+        if(self.load_edits is not None):
+            self.load_edits.add(dof)
+
+    # Mark node-related derived data as stale
+    def InvalidateNodes(self):
+        self._list_idx_lookup = None
+        self._list_idx_rows = None
+
+    # Mark bar-related derived data as stale
+    def InvalidateIncidence(self):
+        self.incidence_ptr = None
+        self.incidence_bars = None
+        self.InvalidateGeometry()
+
+    # Insert a bar between two node rows at a bar index (later bars move up
+    # one index). The incidence and bar geometry are updated in place when
+    # they are built, and so are the bar views: views of later bars move up
+    # with their rows and the view list gains one for the new bar.
+    def InsertBar(self, bar, init, end, section='', material=''):
+        if(init == end or min(init, end) < 0 or max(init, end) >= self.n_nodes):
+            sys.exit("A bar needs two different nodes of the truss")
+        self.conn = np.insert(self.conn, bar, [init, end], axis=0)
+        self.section_code = np.insert(self.section_code, bar, self.CategoryCode(self.section_names, section))
+        self.material_code = np.insert(self.material_code, bar, self.CategoryCode(self.material_names, material))
+        self.axial_load = np.insert(self.axial_load, bar, float("NAN"))
+        self.is_computed = np.insert(self.is_computed, bar, False)
+        if(self.incidence_ptr is not None):
+            ptr = self.incidence_ptr
+            bars = self.incidence_bars
+            bars[bars >= bar] += 1
+            # keep the bars of each node in increasing order
+            positions = [ptr[row] + np.searchsorted(bars[ptr[row]:ptr[row + 1]], bar) for row in (init, end)]
+            self.incidence_bars = np.insert(bars, positions, bar).astype(bars.dtype)
+            ptr[init + 1:] += 1
+            ptr[end + 1:] += 1
+        if(self.bar_delta is not None):
+            delta = self.xy[end] - self.xy[init]
+            length = np.hypot(delta[0], delta[1])
+            self.bar_delta = np.insert(self.bar_delta, bar, delta, axis=0)
+            self.bar_length = np.insert(self.bar_length, bar, length)
+            self.bar_unit = np.insert(self.bar_unit, bar, delta / length, axis=0)
+        if(self._bar_views is not None):
+            for view in self._bar_views[bar:]:
+                view.row += 1
+                view.idx += 1
+            self._bar_views.insert(bar, Bar(bar, self))
+        self.InvalidateStructure()
+        return bar
+
+    # Delete a bar (later bars move down one index), updating the incidence,
+    # bar geometry and bar views in place. The view of the deleted bar is
+    # detached into a stand-alone bar that keeps its section, material and
+    # axial load.
+    def DeleteBar(self, bar):
+        if(bar < 0 or bar >= self.n_bars):
+            sys.exit("Bar %d is not in the truss" % bar)
+        if(self._bar_views is not None):
+            self._bar_views.pop(bar)._Detach()
+            for view in self._bar_views[bar:]:
+                view.row -= 1
+                view.idx -= 1
+        init, end = self.conn[bar]
+        self.conn = np.delete(self.conn, bar, axis=0)
+        self.section_code = np.delete(self.section_code, bar)
+        self.material_code = np.delete(self.material_code, bar)
+        self.axial_load = np.delete(self.axial_load, bar)
+        self.is_computed = np.delete(self.is_computed, bar)
+        if(self.incidence_ptr is not None):
+            bars = self.incidence_bars[self.incidence_bars != bar]
+            bars[bars > bar] -= 1
+            self.incidence_bars = bars
+            self.incidence_ptr[init + 1:] -= 1
+            self.incidence_ptr[end + 1:] -= 1
+        if(self.bar_delta is not None):
+            self.bar_delta = np.delete(self.bar_delta, bar, axis=0)
+            self.bar_length = np.delete(self.bar_length, bar)
+            self.bar_unit = np.delete(self.bar_unit, bar, axis=0)
+        self.InvalidateStructure()
+
+    # Move a node, recomputing the cached geometry of its bars only
+    def MoveNode(self, row, location):
+        self.xy[row] = location
+        if(self.bar_delta is not None):
+            bars = self.NodeBarIdxs(row)
+            self.bar_delta[bars] = self.xy[self.conn[bars, 1]] - self.xy[self.conn[bars, 0]]
+            self.bar_length[bars] = np.hypot(self.bar_delta[bars, 0], self.bar_delta[bars, 1])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.bar_unit[bars] = self.bar_delta[bars] / self.bar_length[bars, None]
+        self.InvalidateStructure()
+
+    # Indices of the bars incident with a node row
+    def NodeBarIdxs(self, row):
+        if(self.incidence_ptr is None):
+            self.BuildIncidence()
+        return self.incidence_bars[self.incidence_ptr[row]:self.incidence_ptr[row + 1]]
+
+    # Per-node arrays, which Merge and AppendNodes extend together
+    NODE_ARRAYS = ('node_list_idx', 'xy', 'force_external', 'constraint_code', 'reaction',
+                   'moment_reaction', 'displacement', 'accepts_moment')
+
+    # Append unlocated nodes with the given list indices, such as the nodes
+    # a hand-built bar names before they are created. Returns their rows.
+    def AppendNodes(self, list_idxs):
+        placeholder = TrussModel(len(list_idxs), 0)
+        placeholder.node_list_idx[:] = list_idxs
+        return self.Merge(placeholder)
+
+    # Append rows to a per-node or per-bar array. Arrays grown this way are
+    # views onto a buffer with spare capacity, which is only reallocated (at
+    # twice the size) when it is full, so appending costs amortized
+    # constant time per row. Arrays replaced wholesale elsewhere simply get
+    # a new buffer on their next append.
+    def _Append(self, name, values):
+        array = getattr(self, name)
+        n = len(array)
+        m = n + len(values)
+        buffer = self._buffers.get(name)
+        if(buffer is None or array.base is not buffer or len(buffer) < m or buffer.dtype != array.dtype):
+            buffer = np.empty((max(m, 2*n),) + array.shape[1:], dtype=array.dtype)
+            buffer[:n] = array
+            self._buffers[name] = buffer
+        buffer[n:m] = values
+        setattr(self, name, buffer[:m])
+
+    # Append the nodes and bars of another model and move its views onto
+    # this one, which is how stand-alone nodes and bars are linked. Nodes
+    # with the same list index of which one is not located yet become one
+    # node. Returns the rows of the other model's nodes in this model. The
+    # cost grows with the size of the other model only, so linking a truss
+    # node by node and bar by bar takes linear time.
+    def Merge(self, other):
+        # the views moved over join this model's views, so build those first
+        if(other._node_views is not None):
+            self.nodes
+        if(other._bar_views is not None):
+            self.bars
+        lookup = self.ListIdxRows()
+        rows = np.empty(other.n_nodes, dtype=np.int64)
+        appended = []
+        for k, list_idx in enumerate(other.node_list_idx.tolist()):
+            match = lookup.get(list_idx, -1) if list_idx >= 0 else -1
+            if(match >= 0 and (np.isnan(self.xy[match, 0]) or np.isnan(other.xy[k, 0]))):
+                rows[k] = match
+                if not np.isnan(other.xy[k, 0]):
+                    for name in self.NODE_ARRAYS:
+                        getattr(self, name)[match] = getattr(other, name)[k]
+                    self.constraint_code[match] = self.ConstraintCode(other.constraint_names[other.constraint_code[k]])
+            else:
+                rows[k] = self.n_nodes + len(appended)
+                appended.append(k)
+                lookup.setdefault(list_idx, int(rows[k]))
+
+        constraint_codes = np.array([self.ConstraintCode(name) for name in other.constraint_names], dtype=np.int16)
+        for name in self.NODE_ARRAYS:
+            values = getattr(other, name)[appended]
+            if(name == 'constraint_code'):
+                values = constraint_codes[values]
+            self._Append(name, values)
+
+        conn = np.where(other.conn >= 0, rows[np.maximum(other.conn, 0)], -1)
+        section_codes = np.array([self.CategoryCode(self.section_names, name) for name in other.section_names])
+        material_codes = np.array([self.CategoryCode(self.material_names, name) for name in other.material_names])
+        first_bar = self.n_bars
+        self._Append('conn', conn)
+        self._Append('section_code', section_codes[other.section_code])
+        self._Append('material_code', material_codes[other.material_code])
+        self._Append('axial_load', other.axial_load)
+        self._Append('is_computed', other.is_computed)
+
+        # views of the other model now look at their rows here, and replace
+        # the views of nodes they were merged with
+        if(other._node_views is not None):
+            self._node_views.extend(Node(int(rows[k]), self) for k in appended)
+            for k, view in enumerate(other._node_views):
+                view._model = self
+                view.row = int(rows[k])
+                self._node_views[view.row] = view
+        elif(self._node_views is not None):
+            self._node_views.extend(Node(int(rows[k]), self) for k in appended)
+        if(other._bar_views is not None):
+            for k, view in enumerate(other._bar_views):
+                view._model = self
+                view.row = first_bar + k
+            self._bar_views.extend(other._bar_views)
+        elif(self._bar_views is not None):
+            self._bar_views.extend(Bar(first_bar + k, self) for k in range(other.n_bars))
+        other._node_views = None
+        other._bar_views = None
+
+        # the list index dict is already up to date
+        self._list_idx_lookup = None
+        self.InvalidateIncidence()
+        return rows
+
+    # Build a model from whole arrays at once
+    @classmethod
+    def FromArrays(cls, xy, conn, constraints=None, force_external=None, node_list_idx=None):
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        conn = np.asarray(conn).reshape(-1, 2)
+        model = cls(len(xy), len(conn))
+        model.xy[:] = xy
+        model.conn[:] = conn
+        if(constraints is not None):
+            model.SetConstraints(constraints)
+        if(force_external is not None):
+            model.force_external[:] = np.asarray(force_external, dtype=float).reshape(-1, 2)
+        if(node_list_idx is not None):
+            model.node_list_idx[:] = node_list_idx
+        return model
+
+# Node member information (a view onto one row of a TrussModel)
 class Node:
-    
-    def __init__(self, idx):
+
+    __slots__ = ('idx', '_model', 'row')
+
+    def __init__(self, idx, model=None):
         self.idx = idx
-        self.location = []
-        self.constraint = 'none'
-        self.xforce_external = 0
-        self.yforce_external = 0
-        self.xforce_reaction = float("NAN")
-        self.yforce_reaction = float("NAN")
-        self.bars = []
-        self.accepts_moment = False
-    
+        if(model is None):
+            # a stand-alone node owns a single-node model, without a list
+            # index until one is added
+            model = TrussModel(1, 0)
+            model.node_list_idx[0] = -1
+            model._node_views = ViewList([self], model)
+            self.row = 0
+        else:
+            self.row = idx
+        self._model = model
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def list_idx(self):
+        return int(self._model.node_list_idx[self.row])
+
+    @property
+    def location(self):
+        loc = self._model.xy[self.row]
+        if(np.isnan(loc[0])):
+            return []
+        return [float(loc[0]), float(loc[1])]
+
+    @property
+    def constraint(self):
+        return self._model.constraint_names[self._model.constraint_code[self.row]]
+
+    @property
+    def xforce_external(self):
+        return float(self._model.force_external[self.row, 0])
+
+    @xforce_external.setter
+    def xforce_external(self, xforce):
+        self._model.force_external[self.row, 0] = xforce
+        self._model.RecordLoadEdit(2*self.row)
+
+    @property
+    def yforce_external(self):
+        return float(self._model.force_external[self.row, 1])
+
+    @yforce_external.setter
+    def yforce_external(self, yforce):
+        self._model.force_external[self.row, 1] = yforce
+        self._model.RecordLoadEdit(2*self.row + 1)
+
+    @property
+    def xforce_reaction(self):
+        return float(self._model.reaction[self.row, 0])
+
+    @xforce_reaction.setter
+    def xforce_reaction(self, xforce):
+        self._model.reaction[self.row, 0] = xforce
+
+    @property
+    def yforce_reaction(self):
+        return float(self._model.reaction[self.row, 1])
+
+    @yforce_reaction.setter
+    def yforce_reaction(self, yforce):
+        self._model.reaction[self.row, 1] = yforce
+
+    @property
+    def moment_reaction(self):
+        return float(self._model.moment_reaction[self.row])
+
+    @moment_reaction.setter
+    def moment_reaction(self, moment):
+        self._model.moment_reaction[self.row] = moment
+
+    @property
+    def displacement(self):
+        return [float(value) for value in self._model.displacement[self.row]]
+
+    @property
+    def bars(self):
+        model_bars = self._model.bars
+        return [model_bars[k] for k in self._model.NodeBarIdxs(self.row)]
+
+    @property
+    def accepts_moment(self):
+        return bool(self._model.accepts_moment[self.row])
+
     def AddListIdx(self, list_idx):
-        self.list_idx = list_idx
-                   
+        self._model.node_list_idx[self.row] = list_idx
+        self._model.InvalidateNodes()
+
     def AddLocation(self, location):
-        self.location = location
-        
+        self._model.xy[self.row] = location
+        self._model.InvalidateGeometry()
+
     def AddConstraint(self, constraint):
-        self.constraint = constraint
-    
+        self._model.constraint_code[self.row] = self._model.ConstraintCode(constraint)
+        self._model.InvalidateStructure()
+
     def AddExternalXForce(self, xforce):
         self.xforce_external = xforce
-        
+
     def AddExternalYForce(self, yforce):
         self.yforce_external = yforce
-                    
+
     def AddReactionXForce(self, xforce):
         if(0 in self.ConstraintType()):
             self.xforce_reaction = xforce
         else:
             sys.exit("Cannot append reaction force in x when constraint %s cannot support it" % self.constraint)
-        
+
     def AddReactionYForce(self, yforce):
         if(1 in self.ConstraintType()):
             self.yforce_reaction = yforce
         else:
             sys.exit("Cannot append reaction force in y when constraint %s cannot support it" % self.constraint)
 
+    def AddReactionMoment(self, moment):
+        if(2 in self.ConstraintType()):
+            self.moment_reaction = moment
+        else:
+            sys.exit("Cannot append reaction moment when constraint %s cannot support it" % self.constraint)
+
+    # bar incidence is derived from the bar connectivity, so appending only
+    # checks that the bar really ends at this node
     def AppendToBars(self, beam):
-        self.bars.append(beam)
-                
+        if(beam._model is not self._model or self.row not in beam._model.conn[beam.row]):
+            sys.exit("Bar %d does not end at node %d" % (beam.idx, self.idx))
+        self._model.InvalidateIncidence()
+
     def SetNoMoment(self):
-        self.accepts_moment = False
-        
+        self._model.accepts_moment[self.row] = False
+
     def ConstraintType(self):
-        # -1 if incompatible, 0 if x, 1 if y, 2 if moment
-        if(self.constraint.lower() == 'none' or self.constraint.lower() == ''):
-            return []
-        elif(self.constraint.lower() == 'roller_no_xdisp'):
-            return [0]
-        elif(self.constraint.lower() == 'roller_no_ydisp'):
-            return [1]
-        elif(self.constraint.lower() == 'adisp'):
-            return [-1] # cannot operate in generic frame of reference at the moment
-        elif(self.constraint.lower() == 'moment'):
-            return [2]
-        elif(self.constraint.lower() == 'pin'):
-            return [0, 1]
-        elif(self.constraint.lower() == 'xdispmoment'):
-            return [0, 2]
-        elif(self.constraint.lower() == 'ydispmoment'):
-             return [1, 2]
-        elif(self.constraint.lower() == 'adispmoment'):
-            return [-1, 2]
-        elif(self.constraint.lower() == 'fixed'):
-            return [0, 1, 2]
-        else: # the current constraint type is not defined
-            return [-1]
-        
+        return ConstraintType(self.constraint)
+
     def GetNetXForce(self):
         if(0 in self.ConstraintType() and np.isnan(self.xforce_reaction)):
             sys.exit("Cannot compute net x force without resolved x reaction force")
@@ -89,7 +582,7 @@ class Node:
                 return self.xforce_external + self.xforce_reaction
             else:
                 return self.xforce_external
-    
+
     def GetNetYForce(self):
         if(1 in self.ConstraintType() and np.isnan(self.yforce_reaction)):
             sys.exit("Cannot compute net y force without resolved y reaction force")
@@ -103,42 +596,131 @@ class Node:
         print('NodeIdx = ', self.idx)
         print('Location = ', self.location)
         print('Constraint = ', self.constraint)
-        print('X Force = ', self.xforce)
-        print('Y Force = ', self.yforce)
-        
+        print('X Force = ', self.xforce_external)
+        print('Y Force = ', self.yforce_external)
+
         if(0 in self.ConstraintType()):
             print('Reaction X = ', self.xforce_reaction)
         if(1 in self.ConstraintType()):
             print('Reaction Y = ', self.yforce_reaction)
+        if(2 in self.ConstraintType()):
+            print('Reaction Moment = ', self.moment_reaction)
         print('')
 
-# Beam member information
+# Beam member information (a view onto one row of a TrussModel)
 class Bar:
-    
-    def __init__(self, idx):
+
+    __slots__ = ('idx', '_model', 'row')
+
+    def __init__(self, idx, model=None):
         self.idx = idx
-        self.init_node_list_idx = -1
-        self.end_node_list_idx = -1
-        self.init_node = Node(-1)
-        self.end_node = Node(-1)
-        self.axial_load = float("NAN")
-        self.is_computed = False
-        
+        if(model is None):
+            # a stand-alone bar owns a single-bar model without nodes
+            model = TrussModel(0, 1)
+            model._bar_views = ViewList([self], model)
+            self.row = 0
+        else:
+            self.row = idx
+        self._model = model
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def init_node_list_idx(self):
+        row = self._model.conn[self.row, 0]
+        return int(self._model.node_list_idx[row]) if row >= 0 else -1
+
+    @property
+    def end_node_list_idx(self):
+        row = self._model.conn[self.row, 1]
+        return int(self._model.node_list_idx[row]) if row >= 0 else -1
+
+    @property
+    def init_node(self):
+        row = self._model.conn[self.row, 0]
+        return self._model.nodes[row] if row >= 0 else None
+
+    @property
+    def end_node(self):
+        row = self._model.conn[self.row, 1]
+        return self._model.nodes[row] if row >= 0 else None
+
+    @property
+    def axial_load(self):
+        return float(self._model.axial_load[self.row])
+
+    @axial_load.setter
+    def axial_load(self, force):
+        self._model.axial_load[self.row] = force
+
+    @property
+    def is_computed(self):
+        return bool(self._model.is_computed[self.row])
+
+    @is_computed.setter
+    def is_computed(self, computed):
+        self._model.is_computed[self.row] = computed
+
+    @property
+    def section(self):
+        return self._model.section_names[self._model.section_code[self.row]]
+
+    @property
+    def material(self):
+        return self._model.material_names[self._model.material_code[self.row]]
+
+    def AddSection(self, section):
+        self._model.section_code[self.row] = self._model.CategoryCode(self._model.section_names, section)
+        self._model.InvalidateStructure()
+
+    def AddMaterial(self, material):
+        self._model.material_code[self.row] = self._model.CategoryCode(self._model.material_names, material)
+        self._model.InvalidateStructure()
+
+    # nodes that are not in the model yet are added unlocated, and take the
+    # place of the nodes linked later with the same list indices
     def AddNodeListIdxs(self, list_idxs):
-        self.init_node_list_idx = list_idxs[0]
-        self.end_node_list_idx = list_idxs[1]
-                
+        list_idxs = [int(list_idx) for list_idx in list_idxs[:2]]
+        missing = [list_idx for list_idx in dict.fromkeys(list_idxs) if list_idx not in self._model.ListIdxRows()]
+        if(len(missing) > 0):
+            self._model.AppendNodes(missing)
+        lookup = self._model.ListIdxRows()
+        self._model.conn[self.row] = [lookup[list_idx] for list_idx in list_idxs]
+        self._model.InvalidateIncidence()
+
     def AddInitNode(self, init_node):
-        self.init_node = init_node
-        
+        self._SetNode(0, init_node)
+
     def AddEndNode(self, end_node):
-        self.end_node = end_node
-                
+        self._SetNode(1, end_node)
+
+    # a node of another model is linked by merging the smaller of the two
+    # models into the larger one
+    def _SetNode(self, end, node):
+        if(node._model is not self._model):
+            small, large = sorted([node._model, self._model], key=lambda model: model.n_nodes + model.n_bars)
+            large.Merge(small)
+        self._model.conn[self.row, end] = node.row
+        self._model.InvalidateIncidence()
+
+    # Move the bar into a stand-alone model of its own, keeping its section,
+    # material and results but none of its nodes
+    def _Detach(self):
+        model = TrussModel(0, 1)
+        model.section_code[0] = model.CategoryCode(model.section_names, self.section)
+        model.material_code[0] = model.CategoryCode(model.material_names, self.material)
+        model.axial_load[0] = self.axial_load
+        model.is_computed[0] = self.is_computed
+        self._model = model
+        self.row = 0
+
     def SetAxialLoad(self, force):
         self.axial_load = force
-        
+
     def Print(self):
         print('BarIdx = ', self.idx)
         print('ListIdx Nodes = ', self.init_node_list_idx, ', ', self.end_node_list_idx)
         print('Axial load is ', self.axial_load)
-        print('')
\ No newline at end of file
+        print('')
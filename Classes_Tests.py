@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:31:07 2026
+
+Tests for the struct-of-arrays truss model and its Node/Bar views
+"""
+
+import numpy as np
+import Main_for_Final_Testing as Main
+from Classes import Node, Bar, ModelOf
+
+import unittest
+
+class TestTrussModel(unittest.TestCase):
+
+    def test_Views_Share_Model_Arrays(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        model = ModelOf(nodes, bars)
+
+        self.assertIsNotNone(model)
+        self.assertEqual((6, 2), model.xy.shape)
+        self.assertEqual((9, 2), model.conn.shape)
+        self.assertEqual(np.int32, model.conn.dtype)
+
+        bars[3].axial_load = -639.19
+        bars[3].is_computed = True
+        self.assertAlmostEqual(-639.19, model.axial_load[3])
+        self.assertTrue(model.is_computed[3])
+
+        nodes[2].AddExternalYForce(-100)
+        self.assertEqual(-100, model.force_external[2, 1])
+
+    def test_Incidence_Example_3_3(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+
+        self.assertEqual([1, 2, 5, 6, 8], [bar.idx for bar in nodes[5].bars])
+        self.assertIs(nodes[5], bars[8].end_node)
+        self.assertIs(bars[8], nodes[4].bars[1])
+        self.assertEqual(['pin', 'roller_no_ydisp'],
+                         [node.constraint for node in nodes if node.ConstraintType()])
+
+    def test_Views_Follow_Bar_Edits(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        model = ModelOf(nodes, bars)
+        bars[5].axial_load = 12.5
+        moved = bars[7]
+        ends = (moved.init_node_list_idx, moved.end_node_list_idx)
+
+        # the held list and views stay on their bars when a bar is deleted
+        deleted = bars[5]
+        model.DeleteBar(5)
+        self.assertIs(bars, model.bars)
+        self.assertEqual(8, len(bars))
+        self.assertIs(moved, bars[6])
+        self.assertEqual((6, 6), (moved.idx, moved.row))
+        self.assertEqual(ends, (moved.init_node_list_idx, moved.end_node_list_idx))
+        self.assertEqual([1, 2, 5, 7], [bar.idx for bar in nodes[5].bars])
+
+        # the deleted view is a stand-alone bar with its old data
+        self.assertIsNot(model, deleted.model)
+        self.assertEqual("W Shapes:W12X26", deleted.section)
+        self.assertEqual(12.5, deleted.axial_load)
+        self.assertIsNone(deleted.init_node)
+
+        model.InsertBar(5, 2, 5, "W Shapes:W12X26", "Steel ASTM A36")
+        self.assertEqual(9, len(bars))
+        self.assertIs(moved, bars[7])
+        self.assertEqual(7, moved.row)
+        self.assertEqual((2, 5), (bars[5].init_node_list_idx, bars[5].end_node_list_idx))
+
+    def test_Standalone_Node_And_Bar(self):
+        node = Node(-1)
+        node.AddLocation([1.5, 2])
+        node.AddConstraint('pin')
+        node.AddReactionXForce(3)
+
+        self.assertEqual([1.5, 2.0], node.location)
+        self.assertEqual([0, 1], node.ConstraintType())
+        self.assertEqual(3, node.xforce_reaction)
+        self.assertIsNone(Bar(0).init_node)
+
+    def test_Link_Standalone_Views(self):
+        # hand-built nodes and bars, linked the way the original loader did
+        nodes = []
+        for list_idx, location in ((5, [0, 0]), (6, [4, 0]), (7, [2, 3])):
+            node = Node(len(nodes))
+            node.AddListIdx(list_idx)
+            node.AddLocation(location)
+            nodes.append(node)
+        nodes[0].AddConstraint('pin')
+        bars = []
+        for init, end in ((0, 1), (1, 2), (0, 2)):
+            bar = Bar(len(bars))
+            bar.AddNodeListIdxs([nodes[init].list_idx, nodes[end].list_idx])
+            bar.AddInitNode(nodes[init])
+            bar.AddEndNode(nodes[end])
+            nodes[init].AppendToBars(bar)
+            nodes[end].AppendToBars(bar)
+            bars.append(bar)
+
+        model = bars[0].model
+        self.assertEqual(3, model.n_nodes)
+        self.assertEqual(3, model.n_bars)
+        self.assertTrue(all(view.model is model for view in nodes + bars))
+        self.assertIs(nodes[2], bars[1].end_node)
+        self.assertEqual((6, 7), (bars[1].init_node_list_idx, bars[1].end_node_list_idx))
+        self.assertEqual([0, 2], [bar.idx for bar in nodes[0].bars])
+        self.assertEqual('pin', nodes[0].constraint)
+        self.assertEqual([2.0, 3.0], nodes[2].location)
+
+        # list indices alone name unlocated nodes until the nodes are linked
+        bar = Bar(1)
+        bar.AddNodeListIdxs([5, 6])
+        self.assertEqual((5, 6), (bar.init_node_list_idx, bar.end_node_list_idx))
+        self.assertEqual([], bar.init_node.location)
+
+    def test_Hand_Built_Truss_Grows_In_Place(self):
+        # a long strip of triangles linked node by node and bar by bar
+        n_nodes = 2000
+        nodes = []
+        for k in range(n_nodes):
+            node = Node(k)
+            node.AddListIdx(100 + k)
+            node.AddLocation([k // 2, k % 2])
+            nodes.append(node)
+        bars = []
+        moves = 0
+        data = None
+        for init, end in [(k, k + step) for k in range(n_nodes) for step in (1, 2) if k + step < n_nodes]:
+            bar = Bar(len(bars))
+            bar.AddNodeListIdxs([100 + init, 100 + end])
+            bar.AddInitNode(nodes[init])
+            bar.AddEndNode(nodes[end])
+            bars.append(bar)
+            pointer = bar.model.conn.__array_interface__['data'][0]
+            moves += pointer != data
+            data = pointer
+
+        model = bars[0].model
+        self.assertEqual(n_nodes, model.n_nodes)
+        self.assertEqual(2*n_nodes - 3, model.n_bars)
+        self.assertTrue(all(view.model is model for view in nodes + bars))
+        self.assertEqual([(100 + k, 101 + k) for k in range(3)],
+                         [(bar.init_node_list_idx, bar.end_node_list_idx) for bar in bars[:6:2]])
+        self.assertIs(nodes[1501], bars[2999].end_node)
+        self.assertEqual((1099, 1101), (bars[1999].init_node_list_idx, bars[1999].end_node_list_idx))
+        # the arrays grow into spare capacity instead of being copied on
+        # every link
+        self.assertLess(moves, 40)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:21:44 2026
+
+Direct stiffness analysis for statically determinate or indeterminate trusses
+
+Axial stiffnesses EA are in kips (A in in^2 from the shape catalog, E in
+ksi from Material_Data.csv), so displacements come out in the length units
+of the node coordinates.
+"""
+
+import sys
+import numpy as np
+
+from Classes import ModelOf
+from Structure_Operations import GeometricallyStable
+import Member_Checks as checks
+
+# scipy is optional; without it the stiffness system is solved densely
+try:
+    import scipy.sparse as sparse
+    import scipy.sparse.linalg as sparse_linalg
+except ImportError:
+    sparse = None
+    sparse_linalg = None
+
+# Pivots of the free-dof stiffness matrix (relative to the largest) below
+# this are taken as a mechanism. The stiffness matrix squares the
+# conditioning of the equilibrium matrix, so this is about the square of the
+# stability tolerance of Structure_Operations, well above round-off.
+STIFFNESS_PIVOT_TOLERANCE = 1e-12
+
+# Axial stiffness EA of every bar from its section area and material E
+def AxialStiffness(model, catalog=None, materials=None):
+    properties = checks.MemberProperties(model, catalog, materials)
+    return properties.area * properties.E
+
+# Global dofs [2i, 2i+1, 2j, 2j+1] of every bar as an (n_bars, 4) array
+def BarDofs(model):
+    conn = model.conn.astype(np.int64)
+    return np.column_stack([2*conn[:, 0], 2*conn[:, 0] + 1, 2*conn[:, 1], 2*conn[:, 1] + 1])
+
+# Direction vector [-c, -s, c, s] of every bar, so that the bar elongation is
+# direction @ u_bar, as an (n_bars, 4) array
+def BarDirections(model):
+    delta, lengths, unit = model.BarGeometry()
+    return np.column_stack([-unit, unit])
+
+# Assemble the global stiffness matrix (2j x 2j) of a truss. Every bar adds
+# (EA/L) * g g^T on its four dofs; all bars are assembled at once in COO
+# form and converted to CSR, which sums the overlapping entries.
+def AssembleStiffnessMatrix(model, EA):
+    delta, lengths, unit = model.BarGeometry()
+    if(np.any(lengths == 0)):
+        sys.exit("Zero-length bar detected")
+    dofs = BarDofs(model)
+    g = BarDirections(model)
+    k = np.asarray(EA, dtype=float) / lengths
+    data = (k[:, None, None] * g[:, :, None] * g[:, None, :]).ravel()
+    rows = np.repeat(dofs, 4, axis=1).ravel()
+    cols = np.tile(dofs, (1, 4)).ravel()
+    n_dofs = 2*model.n_nodes
+    if sparse is not None:
+        return sparse.coo_matrix((data, (rows, cols)), shape=(n_dofs, n_dofs)).tocsr()
+    matrix = np.zeros((n_dofs, n_dofs))
+    np.add.at(matrix, (rows, cols), data)
+    return matrix
+
+# Restrained x/y dofs of a truss from its node constraints
+def RestrainedDofs(model):
+    flags = model.ConstraintFlags()
+    if(np.any(flags[:, 2])):
+        sys.exit("Truss cannot support a moment reaction force")
+    elif(np.any(flags[:, 3])):
+        sys.exit("Invalid constraint type specified for the truss")
+    return np.flatnonzero(flags[:, :2].ravel())
+
+# Factorization of the free-dof block of the stiffness matrix, computed
+# once and reused for any number of load cases
+class StiffnessFactorization:
+
+    def __init__(self, model, EA=None):
+        if EA is None:
+            EA = AxialStiffness(model)
+        self.n_nodes = model.n_nodes
+        self.EA = np.asarray(EA, dtype=float) * np.ones(model.n_bars)
+        self.matrix = AssembleStiffnessMatrix(model, self.EA)
+        self.reaction_dofs = RestrainedDofs(model)
+
+        # keep what bar force recovery needs, so that later solves do not
+        # depend on the model staying unchanged
+        self.bar_dofs = BarDofs(model)
+        self.bar_coefficients = BarDirections(model) * (self.EA / model.BarGeometry()[1])[:, None]
+
+        free = np.ones(2*self.n_nodes, dtype=bool)
+        free[self.reaction_dofs] = False
+        self.free_dofs = np.flatnonzero(free)
+
+        self._reaction_rows = self.matrix[self.reaction_dofs]
+        free_matrix = self.matrix[self.free_dofs][:, self.free_dofs]
+        try:
+            if sparse is not None:
+                self._lu = sparse_linalg.splu(free_matrix.tocsc())
+                self._inverse = None
+            else:
+                self._lu = None
+                self._inverse = np.linalg.inv(free_matrix)
+            pivots = np.abs(self._lu.U.diagonal()) if self._lu is not None else np.abs(np.linalg.eigvalsh(free_matrix))
+        except (RuntimeError, np.linalg.LinAlgError):
+            sys.exit("The stiffness matrix is singular: the truss is geometrically unstable")
+
+        # a mechanism factors without error, leaving a pivot at round-off
+        # level; confirm it with the stability analysis, which exits with
+        # the mechanism and its nodes
+        if not np.all(pivots > STIFFNESS_PIVOT_TOLERANCE * pivots.max(initial=0)):
+            if GeometricallyStable(model.nodes, model.bars) is None:
+                sys.exit("The stiffness matrix is singular: the truss is geometrically unstable")
+
+    # Solve K_ff u_f = rhs for one vector or an (n_free, n_rhs) matrix
+    def Solve(self, rhs):
+        if self._lu is not None:
+            solution = self._lu.solve(np.asarray(rhs, dtype=float))
+        else:
+            solution = self._inverse @ rhs
+        if(not np.all(np.isfinite(solution))):
+            sys.exit("The stiffness matrix is singular: the truss is geometrically unstable")
+        return solution
+
+    # Solve an (n_cases, n_nodes, 2) array of external nodal loads. Returns
+    # displacements (n_cases, n_nodes, 2), bar forces (n_cases, n_bars) and
+    # reactions (n_cases, n_reactions) ordered like reaction_dofs.
+    def SolveLoadCases(self, loads):
+        loads = np.asarray(loads, dtype=float)
+        if(loads.ndim == 2):
+            loads = loads[None]
+        if(loads.shape[1:] != (self.n_nodes, 2)):
+            sys.exit("Loads must have shape (n_cases, %d, 2)" % self.n_nodes)
+        n_cases = len(loads)
+        forces = loads.reshape(n_cases, -1)
+
+        displacements = np.zeros((n_cases, 2*self.n_nodes))
+        displacements[:, self.free_dofs] = self.Solve(forces[:, self.free_dofs].T).T
+
+        # N = (EA/L) g . u_bar for every bar and case
+        bar_forces = np.einsum('cbk,bk->cb', displacements[:, self.bar_dofs], self.bar_coefficients)
+
+        # K u = F + R at the restrained dofs
+        reactions = (self._reaction_rows @ displacements.T).T - forces[:, self.reaction_dofs]
+        return displacements.reshape(n_cases, -1, 2), bar_forces, reactions
+
+# Analyse a truss by the direct stiffness method and store displacements,
+# bar forces and reactions on the nodes and bars. EA defaults to the
+# section area times material E of every bar.
+def SolveUsingDirectStiffness(nodes, bars, EA=None):
+    model = ModelOf(nodes, bars)
+    if(model is None):
+        sys.exit("The direct stiffness method needs the nodes and bars of a loaded truss model")
+    factorization = StiffnessFactorization(model, EA)
+    displacements, bar_forces, reactions = factorization.SolveLoadCases(model.force_external)
+
+    model.displacement[:] = displacements[0]
+    model.axial_load[:] = bar_forces[0]
+    model.is_computed[:] = True
+    model.reaction.ravel()[factorization.reaction_dofs] = reactions[0]
+    return factorization
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:58:13 2026
+
+Tests for the direct stiffness solver
+"""
+
+import math
+import os
+import tempfile
+import numpy as np
+import Main_for_Final_Testing as Main
+import Direct_Stiffness as ds
+from Classes import TrussModel
+import Truss_Generator as generator
+
+import unittest
+
+class TestDirectStiffness(unittest.TestCase):
+
+    def test_Determinate_Matches_Statics_Example_3_3(self):
+        decimal_place = 2
+        nodes_j, bars_j = Main.MethodOfJoints("Example_3_3.csv")
+        nodes_k, bars_k = Main.MethodOfJoints("Example_3_3.csv", solver="stiffness")
+
+        for bar_j, bar_k in zip(bars_j, bars_k):
+            self.assertAlmostEqual(bar_j.axial_load, bar_k.axial_load, decimal_place)
+        self.assertAlmostEqual(191.0275, nodes_k[4].yforce_reaction, 3)
+        self.assertTrue(np.all(np.isfinite(nodes_k.model.displacement)))
+        self.assertEqual([0, 0], nodes_k[0].displacement)
+
+    def test_Indeterminate_Three_Bar_Hanger(self):
+        # three bars of equal EA meeting at a loaded node below three pins
+        model = TrussModel.FromArrays([[-1, 1], [0, 1], [1, 1], [0, 0]], [[0, 3], [1, 3], [2, 3]],
+                                      ['pin', 'pin', 'pin', ''], [[0, 0], [0, 0], [0, 0], [0, -1]])
+        ds.SolveUsingDirectStiffness(model.nodes, model.bars, EA=1000)
+        cos_theta = math.cos(math.pi/4)
+        vertical = 1/(1 + 2*cos_theta**3)
+        decimal_place = 6
+
+        self.assertAlmostEqual(vertical, model.bars[1].axial_load, decimal_place)
+        self.assertAlmostEqual(vertical*cos_theta**2, model.bars[0].axial_load, decimal_place)
+        self.assertAlmostEqual(-vertical/1000, model.nodes[3].displacement[1], decimal_place)
+        self.assertAlmostEqual(1, np.nansum(model.reaction[:, 1]), decimal_place)
+
+    def test_Load_Cases(self):
+        nodes, bars = Main.LoadCSV("Example_3_2.csv")
+        factorization = ds.StiffnessFactorization(nodes.model)
+        loads = np.stack([nodes.model.force_external, -nodes.model.force_external])
+        displacements, bar_forces, reactions = factorization.SolveLoadCases(loads)
+
+        self.assertEqual((2, 7, 2), displacements.shape)
+        self.assertAlmostEqual(-8, bar_forces[0, 0], 3)
+        self.assertAlmostEqual(8, bar_forces[1, 0], 3)
+        self.assertAlmostEqual(-4, reactions[1, 2], 3)
+
+    def test_Mechanism(self):
+        # without bar 5 the howe truss is a mechanism that still factors
+        # without error, with a pivot at round-off level
+        model = generator.GenerateTruss('howe', 4)
+        model.DeleteBar(5)
+        with self.assertRaises(SystemExit) as error:
+            ds.SolveUsingDirectStiffness(model.nodes, model.bars)
+        self.assertIn("geometrically unstable", str(error.exception))
+
+        # the stiffness solver of the main driver checks stability first
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "howe_mechanism.csv")
+            generator.WriteTrussCSV(model, path)
+            with self.assertRaises(SystemExit) as error:
+                Main.MethodOfJoints(path, "stiffness")
+            self.assertIn("mechanism modes", str(error.exception))
+
+        # a long stable truss has small pivots but is not rejected
+        model = generator.GenerateTruss('howe', 500)
+        ds.SolveUsingDirectStiffness(model.nodes, model.bars)
+        self.assertTrue(np.all(np.isfinite(model.axial_load)))
+
+if __name__ == '__main__':
+    unittest.main()
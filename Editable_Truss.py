@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:58:37 2026
+
+Editable truss with fast re-solves after adding, removing or moving members
+
+Every bar adds (EA/L) g g^T to the stiffness matrix, so an edit changes it
+by a few rank-one terms: +k g g^T for an added bar, -k g g^T for a removed
+one, and both for every bar of a moved node. The edits are collected as
+K = K0 + U C U^T on top of one factorization of K0 and solved with the
+Sherman-Morrison-Woodbury formula
+
+    K^-1 f = y - Z (C^-1 + U^T Z)^-1 U^T y,   y = K0^-1 f,  Z = K0^-1 U
+
+until the rank grows past max_rank or the capacitance matrix
+C^-1 + U^T Z becomes ill-conditioned, when K is factored again. An edit
+that leaves the truss geometrically unstable is undone.
+"""
+
+import sys
+import numpy as np
+
+from Classes import ModelOf
+from Direct_Stiffness import AxialStiffness, StiffnessFactorization
+import Member_Checks as checks
+import Shape_Catalog as shapes
+
+EDIT_MAX_RANK = 64
+EDIT_CONDITION_LIMIT = 1e10
+
+class EditableTruss:
+
+    def __init__(self, nodes, bars, EA=None, max_rank=EDIT_MAX_RANK, condition_limit=EDIT_CONDITION_LIMIT):
+        self.model = ModelOf(nodes, bars)
+        if(self.model is None):
+            sys.exit("An editable truss needs the nodes and bars of a loaded truss model")
+        self.max_rank = max_rank
+        self.condition_limit = condition_limit
+        self.EA = (AxialStiffness(self.model) if EA is None else np.asarray(EA, dtype=float)) * np.ones(self.model.n_bars)
+        self.model.BuildIncidence()
+        self.refactorizations = 0
+        self.Refactor()
+
+    @property
+    def rank(self):
+        return self._rank
+
+    # Factor the stiffness matrix of the current truss and clear the
+    # low-rank corrections
+    def Refactor(self):
+        self.base = StiffnessFactorization(self.model, self.EA)
+        self.free_index = np.full(2*self.model.n_nodes, -1, dtype=np.int64)
+        self.free_index[self.base.free_dofs] = np.arange(len(self.base.free_dofs))
+        n_free = len(self.base.free_dofs)
+        self._U = np.zeros((n_free, self.max_rank))
+        self._Z = np.zeros((n_free, self.max_rank))
+        self._inverse = np.zeros((self.max_rank, self.max_rank))
+        self._rank = 0
+        self.refactorizations += 1
+
+    # Stiffness k and direction g over the free dofs of bars, as (n_free,
+    # n_bars) columns, for the current geometry
+    def _Columns(self, bars):
+        model = self.model
+        delta, lengths, unit = model.BarGeometry()
+        conn = model.conn[bars].astype(np.int64)
+        dofs = np.column_stack([2*conn[:, 0], 2*conn[:, 0] + 1, 2*conn[:, 1], 2*conn[:, 1] + 1])
+        g = np.column_stack([-unit[bars], unit[bars]])
+        columns = np.zeros((len(self.base.free_dofs), len(bars)))
+        rows = self.free_index[dofs]
+        free = rows >= 0
+        columns[rows[free], np.nonzero(free)[0]] = g[free]
+        return self.EA[bars] / lengths[bars], columns
+
+    # Add rank-one terms coefficient * column column^T to the stiffness
+    # matrix, keeping the inverse of the capacitance matrix C^-1 + U^T Z up
+    # to date block by block. Returns False, leaving everything unchanged,
+    # when there is no room for the terms or when they (nearly) cancel what
+    # is there, such as removing a bar the truss needs.
+    def _Update(self, coefficients, columns):
+        r = self._rank
+        m = len(coefficients)
+        if(r + m > self.max_rank):
+            return False
+        Z = self.base.Solve(columns)
+        U_old, Z_old, inverse = self._U[:, :r], self._Z[:, :r], self._inverse[:r, :r]
+        B = U_old.T @ Z
+        IB = inverse @ B
+        # Schur complement of the new block, compared with the flexibilities
+        # 1/k it is built from
+        schur = columns.T @ Z + np.diag(1 / coefficients) - B.T @ IB
+        singular_values = np.linalg.svd(schur, compute_uv=False)
+        scale = max(singular_values[0], np.abs(1 / coefficients).max())
+        if not (singular_values[-1] * self.condition_limit >= scale):
+            return False
+        schur_inverse = np.linalg.inv(schur)
+        IBS = IB @ schur_inverse
+        self._inverse[:r, :r] += IBS @ IB.T
+        self._inverse[:r, r:r + m] = -IBS
+        self._inverse[r:r + m, :r] = -IBS.T
+        self._inverse[r:r + m, r:r + m] = schur_inverse
+        self._U[:, r:r + m] = columns
+        self._Z[:, r:r + m] = Z
+        self._rank = r + m
+        return True
+
+    # Apply a stiffness change from the low-rank terms when possible and
+    # refactor otherwise. The factorization exits on a mechanism, in which
+    # case undo restores the truss before the edit exits.
+    def _Apply(self, coefficients, columns, undo, action):
+        if(self._rank + len(coefficients) <= self.max_rank and self._Update(coefficients, columns)):
+            return
+        try:
+            self.Refactor()
+        except SystemExit:
+            undo()
+            self.Refactor()
+            sys.exit("%s would leave the truss geometrically unstable" % action)
+
+    # Axial stiffness of a bar from its section and material
+    def BarStiffness(self, section, material, catalog=None, materials=None):
+        if catalog is None:
+            catalog = shapes.GetShapeCatalog()
+        if materials is None:
+            materials = checks.LoadMaterialData()
+        row = catalog.Row(section)
+        if(row < 0):
+            sys.exit("Shape %s is not in the catalog" % section)
+        E = materials.get(material.strip(), {}).get('E', float("NAN"))
+        return float(catalog.Column('A')[row]) * E
+
+    # Add a bar between two node rows. EA defaults to that of the section
+    # and material, which default to those of the first bar. Returns the
+    # new bar index.
+    def AddBar(self, init, end, section=None, material=None, EA=None):
+        model = self.model
+        if section is None:
+            section = model.section_names[model.section_code[0]]
+        if material is None:
+            material = model.material_names[model.material_code[0]]
+        if EA is None:
+            EA = self.BarStiffness(section, material)
+        bar = model.n_bars
+        model.InsertBar(bar, init, end, section, material)
+        self.EA = np.append(self.EA, EA)
+        if(model.bar_length[bar] == 0):
+            self._UndoAdd(bar)
+            sys.exit("Zero-length bar detected")
+        k, columns = self._Columns([bar])
+        self._Apply(k, columns, lambda: self._UndoAdd(bar), "Adding a bar between nodes %d and %d" % (init, end))
+        return bar
+
+    def _UndoAdd(self, bar):
+        self.model.DeleteBar(bar)
+        self.EA = np.delete(self.EA, bar)
+
+    # Remove a bar (later bars move down one index)
+    def RemoveBar(self, bar):
+        model = self.model
+        if(bar < 0 or bar >= model.n_bars):
+            sys.exit("Bar %d is not in the truss" % bar)
+        k, columns = self._Columns([bar])
+        init, end = model.conn[bar]
+        section = model.section_names[model.section_code[bar]]
+        material = model.material_names[model.material_code[bar]]
+        EA = self.EA[bar]
+        model.DeleteBar(bar)
+        self.EA = np.delete(self.EA, bar)
+
+        def Undo():
+            model.InsertBar(bar, init, end, section, material)
+            self.EA = np.insert(self.EA, bar, EA)
+        self._Apply(-k, columns, Undo, "Removing bar %d" % bar)
+
+    # Move a node row to a new location
+    def MoveNode(self, row, location):
+        model = self.model
+        bars = model.NodeBarIdxs(row).copy()
+        old_location = model.xy[row].copy()
+        k_old, old_columns = self._Columns(bars)
+        model.MoveNode(row, location)
+        if(np.any(model.bar_length[bars] == 0)):
+            model.MoveNode(row, old_location)
+            sys.exit("Zero-length bar detected")
+        k_new, new_columns = self._Columns(bars)
+        self._Apply(np.concatenate([-k_old, k_new]), np.hstack([old_columns, new_columns]),
+                    lambda: model.MoveNode(row, old_location), "Moving node %d" % row)
+
+    # Solve K u = f over the free dofs for one vector or an (n_free, n_rhs)
+    # matrix
+    def SolveFree(self, rhs):
+        y = self.base.Solve(rhs)
+        r = self._rank
+        if(r > 0):
+            y = y - self._Z[:, :r] @ (self._inverse[:r, :r] @ (self._U[:, :r].T @ y))
+        return y
+
+    # Solve an (n_cases, n_nodes, 2) array of external nodal loads of the
+    # edited truss. Returns displacements (n_cases, n_nodes, 2), bar forces
+    # (n_cases, n_bars) and reactions (n_cases, n_reactions) ordered like
+    # reaction_dofs.
+    def SolveLoadCases(self, loads):
+        model = self.model
+        loads = np.asarray(loads, dtype=float)
+        if(loads.ndim == 2):
+            loads = loads[None]
+        if(loads.shape[1:] != (model.n_nodes, 2)):
+            sys.exit("Loads must have shape (n_cases, %d, 2)" % model.n_nodes)
+        n_cases = len(loads)
+        forces = loads.reshape(n_cases, -1)
+        free_dofs = self.base.free_dofs
+
+        displacements = np.zeros((n_cases, 2*model.n_nodes))
+        displacements[:, free_dofs] = self.SolveFree(forces[:, free_dofs].T).T
+
+        # N = (EA/L) g . u_bar, and the reactions balance the bar forces
+        delta, lengths, unit = model.BarGeometry()
+        conn = model.conn.astype(np.int64)
+        elongation = np.einsum('cbk,bk->cb', displacements.reshape(n_cases, -1, 2)[:, conn].reshape(n_cases, -1, 4),
+                               np.column_stack([-unit, unit]))
+        bar_forces = elongation * (self.EA / lengths)
+        internal = np.zeros((n_cases, model.n_nodes, 2))
+        np.add.at(internal, (slice(None), conn[:, 0]), -bar_forces[:, :, None] * unit)
+        np.add.at(internal, (slice(None), conn[:, 1]), bar_forces[:, :, None] * unit)
+        reactions = internal.reshape(n_cases, -1)[:, self.reaction_dofs] - forces[:, self.reaction_dofs]
+        return displacements.reshape(n_cases, -1, 2), bar_forces, reactions
+
+    @property
+    def reaction_dofs(self):
+        return self.base.reaction_dofs
+
+    # Solve the external loads of the model and store the results on the
+    # nodes and bars
+    def Solve(self):
+        model = self.model
+        displacements, bar_forces, reactions = self.SolveLoadCases(model.force_external)
+        model.displacement[:] = displacements[0]
+        model.axial_load[:] = bar_forces[0]
+        model.is_computed[:] = True
+        model.reaction.ravel()[self.reaction_dofs] = reactions[0]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:26:14 2026
+
+Tests for low-rank updates of an editable truss
+"""
+
+import numpy as np
+import Editable_Truss as editable
+import Truss_Generator as generator
+from Direct_Stiffness import StiffnessFactorization
+
+import unittest
+
+EA = 29000.0 * 7.65
+
+# Displacements, bar forces and reactions of a fresh factorization
+def FullSolve(model):
+    factorization = StiffnessFactorization(model, EA)
+    return factorization.SolveLoadCases(model.force_external)
+
+class TestEditableTruss(unittest.TestCase):
+
+    def assertMatchesFullSolve(self, truss):
+        expected = FullSolve(truss.model)
+        for value, expected_value in zip(truss.SolveLoadCases(truss.model.force_external), expected):
+            np.testing.assert_allclose(expected_value, value, rtol=1e-8, atol=1e-8)
+
+    def test_Edits_Match_Refactored_Solution(self):
+        model = generator.GenerateTruss('pratt', 6)
+        truss = editable.EditableTruss(model.nodes, model.bars, EA)
+
+        # brace panel 3 with a second diagonal, move a top chord node and
+        # drop the brace again
+        bar = truss.AddBar(3, 10, EA=EA)
+        self.assertEqual(model.n_bars - 1, bar)
+        self.assertMatchesFullSolve(truss)
+        truss.MoveNode(9, [30.0, 14.0])
+        self.assertMatchesFullSolve(truss)
+        truss.RemoveBar(bar)
+        self.assertMatchesFullSolve(truss)
+
+        self.assertEqual(1, truss.refactorizations)
+        # one term per added or removed bar, two per bar of the moved node
+        self.assertEqual(1 + 2*3 + 1, truss.rank)
+
+        # the in place incidence and geometry agree with rebuilt ones
+        incidence = model.incidence_bars.copy(), model.incidence_ptr.copy()
+        geometry = model.bar_length.copy()
+        model.BuildIncidence()
+        model.BuildGeometry()
+        np.testing.assert_array_equal(incidence[0], model.incidence_bars)
+        np.testing.assert_array_equal(incidence[1], model.incidence_ptr)
+        np.testing.assert_allclose(geometry, model.bar_length)
+
+    def test_Unstable_Edit_Is_Undone(self):
+        model = generator.GenerateTruss('howe', 4)
+        truss = editable.EditableTruss(model.nodes, model.bars, EA)
+        conn = model.conn.copy()
+        with self.assertRaises(SystemExit) as error:
+            truss.RemoveBar(5)
+        self.assertEqual("Removing bar 5 would leave the truss geometrically unstable", str(error.exception))
+        np.testing.assert_array_equal(conn, model.conn)
+        self.assertMatchesFullSolve(truss)
+
+        # without room for low-rank terms the edit is refactored and undone
+        truss = editable.EditableTruss(model.nodes, model.bars, EA, max_rank=0)
+        with self.assertRaises(SystemExit) as error:
+            truss.RemoveBar(5)
+        self.assertEqual("Removing bar 5 would leave the truss geometrically unstable", str(error.exception))
+        np.testing.assert_array_equal(conn, model.conn)
+        self.assertEqual(0, truss.rank)
+        self.assertMatchesFullSolve(truss)
+
+    def test_Refactor_Past_Max_Rank(self):
+        model = generator.GenerateTruss('warren', 8)
+        truss = editable.EditableTruss(model.nodes, model.bars, EA, max_rank=4)
+        rng = np.random.default_rng(3)
+        for row in rng.integers(9, 17, 6):
+            truss.MoveNode(row, model.xy[row] + rng.uniform(-1, 1, 2))
+        self.assertGreater(truss.refactorizations, 1)
+        self.assertLessEqual(truss.rank, 4)
+        truss.Solve()
+        np.testing.assert_allclose(FullSolve(model)[1][0], model.axial_load, rtol=1e-8, atol=1e-8)
+
+if __name__ == '__main__':
+    unittest.main()
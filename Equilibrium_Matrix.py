@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 09:02:11 2026
+
+Global equilibrium (matrix) form of the method of joints
+"""
+
+import sys
+import numpy as np
+from Classes import ModelOf
+
+# scipy is optional; without it the equilibrium system is solved densely
+try:
+    import scipy.sparse as sparse
+    import scipy.sparse.linalg as sparse_linalg
+except ImportError:
+    sparse = None
+    sparse_linalg = None
+
+# Row index of every node in the node list
+def NodeRowLookup(nodes):
+    return {id(node): row for row, node in enumerate(nodes)}
+
+# Coordinates of all nodes as an (n_nodes, 2) array
+def NodeCoordinates(nodes):
+    model = ModelOf(nodes)
+    if(model is not None):
+        return model.xy
+    return np.array([node.location for node in nodes], dtype=float).reshape(-1, 2)
+
+# Node rows at the start and end of every bar as an (n_bars, 2) array
+def BarConnectivity(nodes, bars):
+    model = ModelOf(nodes, bars)
+    if(model is not None):
+        return model.conn
+    lookup = NodeRowLookup(nodes)
+    conn = np.empty((len(bars), 2), dtype=np.int64)
+    for k, bar in enumerate(bars):
+        conn[k, 0] = lookup[id(bar.init_node)]
+        conn[k, 1] = lookup[id(bar.end_node)]
+    return conn
+
+# Degrees of freedom (2*node + direction) that carry a reaction force
+def ReactionDofs(nodes):
+    model = ModelOf(nodes)
+    if(model is not None):
+        flags = model.ConstraintFlags()
+        if(np.any(flags[:, 2])):
+            sys.exit("Truss cannot support a moment reaction force")
+        elif(np.any(flags[:, 3])):
+            sys.exit("Invalid constraint type specified for the truss")
+        return np.flatnonzero(flags[:, :2].ravel())
+    dofs = []
+    for row, node in enumerate(nodes):
+        constraint_type = node.ConstraintType()
+        if(2 in constraint_type):
+            sys.exit("Truss cannot support a moment reaction force")
+        elif(-1 in constraint_type):
+            sys.exit("Invalid constraint type specified for the truss")
+        for direction in constraint_type:
+            dofs.append(2*row + direction)
+    return np.array(dofs, dtype=np.int64)
+
+# Stack external nodal forces into a vector ordered [Fx0, Fy0, Fx1, Fy1, ...]
+def ExternalForceVector(nodes):
+    model = ModelOf(nodes)
+    if(model is not None):
+        return model.force_external.ravel().copy()
+    forces = np.empty(2*len(nodes))
+    forces[0::2] = [node.xforce_external for node in nodes]
+    forces[1::2] = [node.yforce_external for node in nodes]
+    return forces
+
+# Assemble the 2j x (b+r) equilibrium matrix A such that A @ [N, R] = -F.
+# Column k < b holds the unit vectors of bar k pointing away from each of its
+# nodes (tension positive); the remaining columns are the reaction dofs.
+def AssembleEquilibriumMatrix(nodes, bars):
+    xy = NodeCoordinates(nodes)
+    conn = BarConnectivity(nodes, bars)
+    reaction_dofs = ReactionDofs(nodes)
+    n_bars = len(bars)
+    n_reactions = len(reaction_dofs)
+
+    model = ModelOf(nodes, bars)
+    if(model is not None):
+        delta, lengths, unit = model.BarGeometry()
+    else:
+        delta = xy[conn[:, 1]] - xy[conn[:, 0]]
+        lengths = np.hypot(delta[:, 0], delta[:, 1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            unit = delta / lengths[:, None]
+    if(np.any(lengths == 0)):
+        sys.exit("Zero-length bar detected")
+
+    bar_cols = np.arange(n_bars)
+    rows = np.concatenate([2*conn[:, 0], 2*conn[:, 0] + 1,
+                           2*conn[:, 1], 2*conn[:, 1] + 1,
+                           reaction_dofs])
+    cols = np.concatenate([bar_cols, bar_cols, bar_cols, bar_cols,
+                           n_bars + np.arange(n_reactions)])
+    data = np.concatenate([unit[:, 0], unit[:, 1],
+                           -unit[:, 0], -unit[:, 1],
+                           np.ones(n_reactions)])
+
+    shape = (2*len(nodes), n_bars + n_reactions)
+    if sparse is not None:
+        matrix = sparse.csc_matrix((data, (rows, cols)), shape=shape)
+    else:
+        matrix = np.zeros(shape)
+        np.add.at(matrix, (rows, cols), data)
+    return matrix, reaction_dofs
+
+# Factorization of a square equilibrium matrix that is computed once and
+# reused for any number of load cases
+class EquilibriumFactorization:
+
+    def __init__(self, nodes, bars):
+        self.matrix, self.reaction_dofs = AssembleEquilibriumMatrix(nodes, bars)
+        self.n_nodes = len(nodes)
+        self.n_bars = len(bars)
+        if(self.matrix.shape[0] != self.matrix.shape[1]):
+            sys.exit("The equilibrium matrix must be square (b + r = 2j) to be solved directly")
+        try:
+            if sparse is not None:
+                self._lu = sparse_linalg.splu(self.matrix)
+                self._inverse = None
+            else:
+                # without scipy there is no reusable dense LU in numpy, so
+                # keep the inverse instead
+                self._lu = None
+                self._inverse = np.linalg.inv(self.matrix)
+        except (RuntimeError, np.linalg.LinAlgError):
+            sys.exit("The equilibrium matrix is singular: the truss is geometrically unstable")
+
+    # Solve A x = rhs for one right-hand side vector or a (2j, n_rhs) matrix
+    def Solve(self, rhs):
+        if self._lu is not None:
+            solution = self._lu.solve(np.asarray(rhs, dtype=float))
+        else:
+            solution = self._inverse @ rhs
+        if(not np.all(np.isfinite(solution))):
+            sys.exit("The equilibrium matrix is singular: the truss is geometrically unstable")
+        return solution
+
+    # Solve an (n_cases, n_nodes, 2) array of external nodal loads.
+    # Returns bar forces as (n_cases, n_bars) and reactions as
+    # (n_cases, n_reactions) ordered like reaction_dofs.
+    def SolveLoadCases(self, loads):
+        loads = np.asarray(loads, dtype=float)
+        if(loads.ndim == 2):
+            loads = loads[None]
+        if(loads.shape[1:] != (self.n_nodes, 2)):
+            sys.exit("Loads must have shape (n_cases, %d, 2)" % self.n_nodes)
+        solution = self.Solve(-loads.reshape(len(loads), -1).T)
+        return solution[:self.n_bars].T, solution[self.n_bars:].T
+
+# Solve for all bar forces and reactions with a single (sparse) linear solve
+def SolveUsingEquilibriumMatrix(nodes, bars):
+    factorization = EquilibriumFactorization(nodes, bars)
+    reaction_dofs = factorization.reaction_dofs
+    solution = factorization.Solve(-ExternalForceVector(nodes))
+
+    n_bars = len(bars)
+    model = ModelOf(nodes, bars)
+    if(model is not None):
+        model.axial_load[:] = solution[:n_bars]
+        model.is_computed[:] = True
+        model.reaction.ravel()[reaction_dofs] = solution[n_bars:]
+        return
+
+    for bar, force in zip(bars, solution[:n_bars]):
+        bar.axial_load = float(force)
+        bar.is_computed = True
+
+    for dof, reaction in zip(reaction_dofs, solution[n_bars:]):
+        node = nodes[dof // 2]
+        if(dof % 2 == 0):
+            node.AddReactionXForce(float(reaction))
+        else:
+            node.AddReactionYForce(float(reaction))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 09:40:52 2026
+
+Tests for the global equilibrium matrix solver
+"""
+
+import numpy as np
+import Main_for_Final_Testing as Main
+import Equilibrium_Matrix as eqm
+
+import unittest
+
+class TestEquilibriumMatrix(unittest.TestCase):
+
+    def test_Matrix_Shape_Example_3_3(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        matrix, reaction_dofs = eqm.AssembleEquilibriumMatrix(nodes, bars)
+
+        self.assertEqual((12, 12), matrix.shape)
+        self.assertEqual([0, 1, 9], list(reaction_dofs))
+
+    def test_Matrix_Example_3_3(self):
+        decimal_place = 2
+        nodes, bars = Main.MethodOfJoints("Example_3_3.csv", solver="matrix")
+
+        bar_forces = [-692.781,
+                      728.952,
+                      -207.055,
+                      -639.190,
+                      -639.190,
+                      728.951,
+                      0.00,
+                      -639.190,
+                      521.896]
+
+        for i in range(0,len(bars)):
+            self.assertTrue(bars[i].is_computed)
+            self.assertAlmostEqual(bar_forces[i], bars[i].axial_load, decimal_place)
+
+        self.assertAlmostEqual(-141.42136, nodes[0].xforce_reaction, 3)
+        self.assertAlmostEqual(125.39385, nodes[0].yforce_reaction, 3)
+        self.assertAlmostEqual(191.0275, nodes[4].yforce_reaction, 3)
+
+    def test_Matrix_Matches_Joints_Example_3_2(self):
+        decimal_place = 6
+        nodes_j, bars_j = Main.MethodOfJoints("Example_3_2.csv")
+        nodes_m, bars_m = Main.MethodOfJoints("Example_3_2.csv", solver="matrix")
+
+        for bar_j, bar_m in zip(bars_j, bars_m):
+            self.assertAlmostEqual(bar_j.axial_load, bar_m.axial_load, decimal_place)
+        self.assertAlmostEqual(nodes_j[3].yforce_reaction, nodes_m[3].yforce_reaction, decimal_place)
+
+    def test_Load_Cases_Example_3_2(self):
+        decimal_place = 6
+        nodes, bars = Main.MethodOfJoints("Example_3_2.csv", solver="matrix")
+        file_loads = nodes[0].model.force_external.copy()
+        loads = np.stack([file_loads, 2*file_loads, np.zeros_like(file_loads)])
+
+        bar_forces, reactions, reaction_dofs = Main.MethodOfJointsLoadCases("Example_3_2.csv", loads)
+
+        self.assertEqual((3, len(bars)), bar_forces.shape)
+        self.assertEqual((3, 3), reactions.shape)
+        self.assertEqual([0, 1, 7], list(reaction_dofs))
+        for i in range(0,len(bars)):
+            self.assertAlmostEqual(bars[i].axial_load, bar_forces[0, i], decimal_place)
+            self.assertAlmostEqual(2*bars[i].axial_load, bar_forces[1, i], decimal_place)
+            self.assertAlmostEqual(0, bar_forces[2, i], decimal_place)
+        self.assertAlmostEqual(8, reactions[1, 2], decimal_place)
+
+if __name__ == '__main__':
+    unittest.main()
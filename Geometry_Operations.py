@@ -12,38 +12,44 @@ import sys
 
 # length of the beam
 def Length(bar):
-    bar_node = bar.init_node
-    bar_vector =BarNodeToVector(bar.init_node,bar)
-    bar_length = VectorTwoNorm(bar_vector)
-    return bar_length
+    delta, lengths, unit = bar.model.BarGeometry()
+    return float(lengths[bar.row])
 
 # Find two norm (magnitude) of a vector
 def VectorTwoNorm(vector):
-    norm = 0
-    for i in range(0, len(vector)):
-        norm += vector[i]**2
-    return np.sqrt(norm)
+    return math.hypot(*vector)
+
+# Direction (+1 from the initial node, -1 from the end node) of a bar as
+# seen from one of its nodes, or 0 if the node is not on the bar
+def BarDirectionFromNode(node, bar):
+    if(node.model is bar.model):
+        init_row, end_row = bar.model.conn[bar.row]
+        if(node.row == init_row):
+            return 1
+        elif(node.row == end_row):
+            return -1
+    return 0
 
 # Find a shared node between two bars
 def FindSharedNode(bar_1,bar_2):
-    if(bar_1.init_node == bar_2.init_node):
-        return bar_1.init_node
-    elif(bar_1.init_node == bar_2.end_node):
-        return bar_1.init_node
-    elif(bar_1.end_node == bar_2.init_node):
-        return bar_1.end_node
-    elif(bar_1.end_node == bar_2.end_node):
-        return bar_1.end_node
-    else:
-        # the bars do not share a common node
-        # output an error---you should never arrive here
-        sys.exit("The two input bars do not share a node")
+    if(bar_1.model is bar_2.model):
+        conn = bar_1.model.conn
+        init_1, end_1 = conn[bar_1.row]
+        init_2, end_2 = conn[bar_2.row]
+        if(init_1 == init_2 or init_1 == end_2):
+            return bar_1.init_node
+        elif(end_1 == init_2 or end_1 == end_2):
+            return bar_1.end_node
+    # the bars do not share a common node
+    # output an error---you should never arrive here
+    sys.exit("The two input bars do not share a node")
 
 # Given a bar and a node on that bar, find the other node
 def FindOtherNode(node,bar):
-    if(bar.init_node == node):
+    direction = BarDirectionFromNode(node, bar)
+    if(direction == 1):
         return bar.end_node
-    elif(bar.end_node == node):
+    elif(direction == -1):
         return bar.init_node
     else:
         sys.exit("The input node is not on the bar")
@@ -51,11 +57,21 @@ def FindOtherNode(node,bar):
 
 # Find a vector from input node (of the input bar) in the direction of the bar
 def BarNodeToVector(origin_node,bar):
-    other_node = FindOtherNode(origin_node, bar)
-    origin_loc = origin_node.location
-    other_loc = other_node.location
-    vec = [other_loc[0]-origin_loc[0], other_loc[1]-origin_loc[1]]
-    return vec
+    direction = BarDirectionFromNode(origin_node, bar)
+    if(direction == 0):
+        sys.exit("The input node is not on the bar")
+    delta, lengths, unit = bar.model.BarGeometry()
+    return [direction*float(delta[bar.row, 0]), direction*float(delta[bar.row, 1])]
+
+# Unit vector (cosine, sine) from input node in the direction of the bar
+def BarNodeToUnitVector(origin_node,bar):
+    direction = BarDirectionFromNode(origin_node, bar)
+    if(direction == 0):
+        sys.exit("The input node is not on the bar")
+    delta, lengths, unit = bar.model.BarGeometry()
+    if(lengths[bar.row] == 0):
+        sys.exit("Zero-length bar detected")
+    return direction*float(unit[bar.row, 0]), direction*float(unit[bar.row, 1])
 
 # Convert two bars that meet at a node into vectors pointing away from that node
 def BarsToVectors(bar_1,bar_2):
@@ -88,12 +104,17 @@ def SineVectors(local_x_vec,other_vec):
     norm2 = VectorTwoNorm(other_vec)
     return cross / (norm1 * norm2)
 
+# Unit vectors of two bars that meet at a node pointing away from that node
+def BarsToUnitVectors(bar_1,bar_2):
+    shared_node = FindSharedNode(bar_1, bar_2)
+    return BarNodeToUnitVector(shared_node, bar_1), BarNodeToUnitVector(shared_node, bar_2)
+
 # Cosine of angle from local x bar to the other bar
 def CosineBars(local_x_bar,other_bar):
-    vec1, vec2 = BarsToVectors(local_x_bar, other_bar)
-    return CosineVectors(vec1, vec2)
+    unit1, unit2 = BarsToUnitVectors(local_x_bar, other_bar)
+    return unit1[0]*unit2[0] + unit1[1]*unit2[1]
 
 # Sine of angle from local x bar to the other bar
 def SineBars(local_x_bar,other_bar):
-    vec1, vec2 = BarsToVectors(local_x_bar, other_bar)
-    return SineVectors(vec1, vec2)
\ No newline at end of file
+    unit1, unit2 = BarsToUnitVectors(local_x_bar, other_bar)
+    return TwoDCrossProduct(unit1, unit2)
\ No newline at end of file
@@ -177,6 +177,20 @@ class TestGeometryOperationsPart2(unittest.TestCase):
         
         self.assertAlmostEqual(-0.8660268097769906, sinbars, correct_decimals)
         self.assertAlmostEqual(0.8660268097769906, sinrevbars, correct_decimals)
+class TestGeometryCache(unittest.TestCase):
+
+    def test_Cache_Invalidated_By_AddLocation(self):
+        nodes,bars = Main_for_Testing.LoadCSV("Example_3_2.csv")
+        model = nodes[0].model
+        
+        self.assertAlmostEqual(4, geom.Length(bars[1]), 6)
+        self.assertIsNotNone(model.bar_length)
+        
+        nodes[1].AddLocation([3, 4])
+        self.assertIsNone(model.bar_length)
+        self.assertAlmostEqual(5, geom.Length(bars[1]), 6)
+        self.assertAlmostEqual(-3, geom.BarNodeToVector(nodes[1], bars[1])[0], 6)
+        self.assertAlmostEqual(0.6, geom.BarNodeToUnitVector(nodes[0], bars[1])[0], 6)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -6,76 +6,273 @@ Created on Wed Jul 14 09:12:03 2021
 @author: kendrick shepherd
 """
 
+import csv
+import hashlib
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
 import sys
-from Classes import Node
-from Classes import Bar
-
-def LoadData(input_geometry):
-    nodedata = []
-    bardata = []
-    node_idx = 0
-    bar_idx = 0
-    nodeflag = False
-    barflag = False
+import numpy as np
+from Classes import TrussModel
+
+# Number of lines parsed at once when streaming a file
+CHUNK_SIZE = 65536
+
+NODE_DTYPE = np.dtype([('list_idx', np.int64), ('x', float), ('y', float),
+                       ('constraint', 'U64'), ('xforce', float), ('yforce', float)])
+BAR_DTYPE = np.dtype([('init', np.int64), ('end', np.int64),
+                      ('section', 'U128'), ('material', 'U128')])
+
+# Copy of a structured dtype with its string fields sized to the longest
+# value of their column in rows of tuples
+def SizedDtype(dtype, rows):
+    fields = []
+    for k, name in enumerate(dtype.names):
+        field = dtype[name]
+        if(field.kind == 'U'):
+            field = 'U%d' % max([len(row[k]) for row in rows] + [1])
+        fields.append((name, field))
+    return np.dtype(fields)
+
+# Whether a string column of a parsed table fills its whole width, so that
+# longer values may have been cut off
+def Truncated(table, names):
+    return len(table) > 0 and any(np.char.str_len(table[name]).max() >= table.dtype[name].itemsize // 4
+                                  for name in names)
+
+# Convert an array of strings into category codes, adding new names to the
+# list of category names
+def CategoryCodes(strings, names):
+    values = strings.tolist()
+    lookup = {value: TrussModel.CategoryCode(names, value.strip()) for value in set(values)}
+    return np.fromiter(map(lookup.__getitem__, values), dtype=np.int32, count=len(values))
+
+# Parse a run of node lines into typed column arrays
+def ParseNodeLines(lines, constraint_names):
+    try:
+        table = np.loadtxt(lines, delimiter=',', usecols=range(6), dtype=NODE_DTYPE,
+                           comments=None, quotechar='"', ndmin=1)
+    except ValueError:
+        table = None
+    if(table is None or Truncated(table, ['constraint'])):
+        # ragged rows or long names: fall back to the csv module
+        rows = [tuple(row[:6]) for row in csv.reader(lines)]
+        table = np.array(rows, dtype=SizedDtype(NODE_DTYPE, rows))
+    return {'list_idx': table['list_idx'],
+            'xy': np.column_stack([table['x'], table['y']]),
+            'constraint_code': CategoryCodes(table['constraint'], constraint_names).astype(np.int16),
+            'force_external': np.column_stack([table['xforce'], table['yforce']])}
+
+# Parse a run of bar lines into typed column arrays
+def ParseBarLines(lines, section_names, material_names):
+    try:
+        table = np.loadtxt(lines, delimiter=',', usecols=range(1, 5), dtype=BAR_DTYPE,
+                           comments=None, quotechar='"', ndmin=1)
+    except ValueError:
+        table = None
+    if(table is None or Truncated(table, ['section', 'material'])):
+        # section type and material are optional columns, and may be longer
+        # than the default width
+        rows = [tuple((row + ['', ''])[1:5]) for row in csv.reader(lines)]
+        table = np.array(rows, dtype=SizedDtype(BAR_DTYPE, rows))
+    return {'node_list_idxs': np.column_stack([table['init'], table['end']]),
+            'section_code': CategoryCodes(table['section'], section_names),
+            'material_code': CategoryCodes(table['material'], material_names)}
+
+# Data rows start with their (integer) index, which most lines begin with
+# directly. Other lines are classified by their first field: section
+# markers, headers and empty lines are skipped.
+DATA_LINE_STARTS = frozenset('0123456789-')
+MARKER_KEYS = frozenset(['', 'nodes', 'bars', 'beams', 'index'])
+
+# First field of a line, unquoted and in lower case
+def LineKey(line):
+    return line.split(',', 1)[0].strip().strip('"').strip().lower()
+
+# Whether a line that does not start with a digit or sign is a data row,
+# such as one with leading spaces, a plus sign or a quoted index. Exits on
+# lines that are neither data nor a known marker.
+def IsDataLine(line, line_number, input_geometry):
+    key = LineKey(line)
+    if(key in MARKER_KEYS):
+        return False
+    try:
+        int(key)
+    except ValueError:
+        sys.exit("Line %d of %s is neither a node or bar row nor a section header: %s"
+                 % (line_number, input_geometry, line.strip()[:80]))
+    return True
+
+# Stream the Nodes and Bars sections of a truss CSV file. Yields
+# ("nodes", columns) and ("bars", columns) pairs of typed column arrays for
+# runs of at most chunk_size lines, so only one chunk of lines is held as
+# Python objects. Category names are appended to the given name lists.
+def ReadCSVChunks(input_geometry, constraint_names, section_names, material_names, chunk_size=CHUNK_SIZE):
     # ensure that the input file is a CSV file
     if(input_geometry.split('.')[-1] !='csv'):
         print("Input must be a csv file. Please input a csv file with file extension .csv included in the end of the input file name.")
         sys.exit()
-    # open the file
-    with open(input_geometry, 'r') as f:
-        # Iterate through all lines
-        for line in f:
-            # otherwise, split the line
-            splitline = line.split();
-            commaline = line.split(',')
-            if(commaline[0].lower().strip()=='nodes'):
-                barflag = False
-                nodeflag = True
-                continue
-            elif(commaline[0].lower().strip()=='beams' or commaline[0].lower().strip()=='bars'):
-                barflag = True
-                nodeflag = False
-                continue
-            # Skip headers
-            elif(commaline[0].lower().strip()=='index'):
-                continue
-            
-            # node is flagged
-            if(nodeflag):
-                tempnode = Node(node_idx)
-                
-                tempnode.AddListIdx(int(commaline[0]))
-                tempnode.AddLocation([float(commaline[1]), float(commaline[2])])
-                tempnode.AddConstraint(commaline[3])
-                tempnode.AddExternalXForce(float(commaline[4]))
-                tempnode.AddExternalYForce(float(commaline[5]))
-                
-                node_idx += 1
-                nodedata.append(tempnode)
-            elif(barflag):
-                tempbeam = Bar(bar_idx)
-                
-                tempbeam.AddNodeListIdxs([int(commaline[1]),int(commaline[2])])
-                
-                bar_idx += 1
-                bardata.append(tempbeam)
-                    
-    # create dictionary between list indices and their nodes
-    list_idx_to_node = {}
     
-    # print data            
-    for node in nodedata:
-        list_idx_to_node.update({node.list_idx: node})
-    for bar in bardata:        
-        bar.AddInitNode(list_idx_to_node[bar.init_node_list_idx])
-        bar.AddEndNode(list_idx_to_node[bar.end_node_list_idx])
-        
-        list_idx_to_node[bar.init_node_list_idx].AppendToBars(bar)
-        list_idx_to_node[bar.end_node_list_idx].AppendToBars(bar)
+    section = None
+    first_line = 1
+    with open(input_geometry, 'r', newline='', encoding='utf-8-sig') as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                break
+            markers = [i for i, line in enumerate(lines) if line[:1] not in DATA_LINE_STARTS
+                       and not IsDataLine(line, first_line + i, input_geometry)]
+            first_line += len(lines)
+            start = 0
+            for stop in markers + [len(lines)]:
+                if(stop > start and section == 'nodes'):
+                    yield section, ParseNodeLines(lines[start:stop], constraint_names)
+                elif(stop > start and section == 'bars'):
+                    yield section, ParseBarLines(lines[start:stop], section_names, material_names)
+                if(stop < len(lines)):
+                    key = LineKey(lines[stop])
+                    if(key == 'nodes'):
+                        section = 'nodes'
+                    elif(key == 'beams' or key == 'bars'):
+                        section = 'bars'
+                start = stop + 1
+
+# Parse a truss geometry CSV file into a TrussModel
+def ParseModel(input_geometry, chunk_size=CHUNK_SIZE):
+    model = TrussModel()
+    node_chunks = []
+    bar_chunks = []
+    for section, columns in ReadCSVChunks(input_geometry, model.constraint_names, model.section_names,
+                                          model.material_names, chunk_size):
+        if(section == 'nodes'):
+            node_chunks.append(columns)
+        else:
+            bar_chunks.append(columns)
+    
+    def Concatenate(chunks, key, shape, dtype):
+        if not chunks:
+            return np.zeros(shape, dtype=dtype)
+        return np.concatenate([chunk[key] for chunk in chunks])
+    
+    model.node_list_idx = Concatenate(node_chunks, 'list_idx', (0,), np.int64)
+    model.xy = Concatenate(node_chunks, 'xy', (0, 2), float)
+    model.constraint_code = Concatenate(node_chunks, 'constraint_code', (0,), np.int16)
+    model.force_external = Concatenate(node_chunks, 'force_external', (0, 2), float)
+    if(len(np.unique(model.node_list_idx)) != model.n_nodes):
+        sys.exit("Node indices in %s are not unique" % input_geometry)
     
-    # do not add moment dofs when all bars incident with a node 
-    # are truss elements
-    for node in nodedata:
-        node.SetNoMoment()
+    # convert node list indices of the bars into node rows all at once;
+    # this also checks that every referenced node exists
+    model.conn = model.RowsOfListIdxs(Concatenate(bar_chunks, 'node_list_idxs', (0, 2), np.int64)).astype(np.int32)
+    model.section_code = Concatenate(bar_chunks, 'section_code', (0,), np.int32)
+    model.material_code = Concatenate(bar_chunks, 'material_code', (0,), np.int32)
+    # no reactions or bar forces are known yet, and no moment dofs are added
+    # since all bars incident with a node are truss elements
+    model.ResetResults()
+    model.BuildIncidence()
     
-    return [nodedata, bardata]
\ No newline at end of file
+    return model
+
+# Compiled models are stored as one .npy file per array (so they can be
+# memory-mapped) plus a json file of names, in a folder next to the source
+# file named after a hash of its contents
+CACHE_FOLDER = '.truss_cache'
+CACHE_VERSION = 3
+CACHED_ARRAYS = ['node_list_idx', 'xy', 'constraint_code', 'force_external',
+                 'conn', 'section_code', 'material_code',
+                 'incidence_ptr', 'incidence_bars',
+                 'bar_delta', 'bar_length', 'bar_unit']
+CACHED_NAMES = ['constraint_names', 'section_names', 'material_names']
+
+# Hash of the contents of a file
+def FileDigest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# Folder holding the compiled form of a file with the given content hash
+# (and cache format version)
+def CompiledModelPath(input_geometry, digest, version=CACHE_VERSION):
+    folder, name = os.path.split(os.path.abspath(input_geometry))
+    return os.path.join(folder, CACHE_FOLDER, '%s.v%d.%s' % (name, version, digest))
+
+# Remove the cached forms of a file other than the one at cache_path, those
+# of older cache versions and of earlier contents of the file. Temporary
+# folders of writers still at work do not match and are left alone.
+def PruneCompiledModels(input_geometry, cache_path):
+    folder, current = os.path.split(cache_path)
+    name = os.path.basename(input_geometry)
+    suffix = os.path.splitext(current)[1] if current.endswith('.npz') else ''
+    stale = re.compile(re.escape(name) + r'\.v\d+\.[0-9a-f]{32}' + re.escape(suffix) + '$')
+    for entry in os.listdir(folder):
+        if(entry == current or not stale.match(entry)):
+            continue
+        entry = os.path.join(folder, entry)
+        if(os.path.isdir(entry)):
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+
+# Write the compiled form of a model. The folder is written under a
+# temporary name and renamed into place so other processes never see a
+# partially written cache.
+def WriteCompiledModel(model, path):
+    model.BarGeometry()
+    if(model.incidence_ptr is None):
+        model.BuildIncidence()
+    temp_path = tempfile.mkdtemp(prefix=os.path.basename(path) + '.tmp', dir=os.path.dirname(path))
+    try:
+        for name in CACHED_ARRAYS:
+            np.save(os.path.join(temp_path, name + '.npy'), getattr(model, name))
+        with open(os.path.join(temp_path, 'names.json'), 'w') as f:
+            json.dump({name: getattr(model, name) for name in CACHED_NAMES}, f)
+    except OSError:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+    try:
+        os.replace(temp_path, path)
+    except OSError:
+        # another process finished writing the same model first
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+# Read the compiled form of a model. Arrays are memory-mapped copy-on-write,
+# so they are shared between processes until a process modifies them.
+def ReadCompiledModel(path):
+    model = TrussModel()
+    for name in CACHED_ARRAYS:
+        setattr(model, name, np.load(os.path.join(path, name + '.npy'), mmap_mode='c'))
+    with open(os.path.join(path, 'names.json'), 'r') as f:
+        for name, values in json.load(f).items():
+            setattr(model, name, values)
+    model.ResetResults()
+    return model
+
+# Load a truss geometry CSV file into a TrussModel. With use_cache the
+# parsed model is compiled to disk on first use and memory-mapped afterwards.
+def LoadModel(input_geometry, chunk_size=CHUNK_SIZE, use_cache=False):
+    if not use_cache:
+        return ParseModel(input_geometry, chunk_size)
+    path = CompiledModelPath(input_geometry, FileDigest(input_geometry))
+    if os.path.isdir(path):
+        return ReadCompiledModel(path)
+    model = ParseModel(input_geometry, chunk_size)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        WriteCompiledModel(model, path)
+        PruneCompiledModels(input_geometry, path)
+    except OSError:
+        # a read-only or full checkout just goes without the cache
+        pass
+    return model
+
+def LoadData(input_geometry, use_cache=False):
+    model = LoadModel(input_geometry, use_cache=use_cache)
+    return [model.nodes, model.bars]
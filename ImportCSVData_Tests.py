@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:52:40 2026
+
+Tests for loading truss CSV files into arrays
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import ImportCSVData as csvdata
+import Main_for_Final_Testing as Main
+
+import unittest
+
+class TestLoadModel(unittest.TestCase):
+
+    def test_Sections_And_Materials_Example_3_2(self):
+        model = csvdata.LoadModel("Example_3_2.csv")
+
+        self.assertEqual(7, model.n_nodes)
+        self.assertEqual(11, model.n_bars)
+        self.assertEqual('W Shapes:W12X26', model.bars[0].section)
+        self.assertEqual('W Shapes:W8X10', model.bars[10].section)
+        self.assertEqual('Steel ASTM A36', model.bars[4].material)
+        self.assertEqual(2, len(np.unique(model.section_code)))
+        self.assertEqual([0, 0, 0, 0, -3], model.force_external[[0, 1, 2, 3, 6], 1].tolist())
+
+    def test_Chunked_Load_Matches_Full_Load(self):
+        full = csvdata.LoadModel("CSV_Files/DO_NOT_EDIT/Scissor_Truss_Eight_Panel.csv")
+        chunked = csvdata.LoadModel("CSV_Files/DO_NOT_EDIT/Scissor_Truss_Eight_Panel.csv", chunk_size=5)
+
+        self.assertTrue(np.array_equal(full.xy, chunked.xy))
+        self.assertTrue(np.array_equal(full.conn, chunked.conn))
+        self.assertTrue(np.array_equal(full.section_code, chunked.section_code))
+
+    def test_Undefined_Node_Reference(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "bad.csv")
+            with open(path, 'w') as f:
+                f.write("Nodes\nIndex,X,Y,Constraint,Fx,Fy\n0,0,0,pin,0,0\n1,1,0,roller_no_ydisp,0,0\n")
+                f.write("Bars\nIndex,Start Node,End Node\n0,0,1\n1,1,5\n")
+
+            with self.assertRaises(SystemExit) as context:
+                csvdata.LoadModel(path)
+            self.assertIn("[5]", str(context.exception))
+
+    def test_Loose_Rows_And_Long_Names(self):
+        section = "W Shapes:" + "W" * 200
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "loose.csv")
+            with open(path, 'w') as f:
+                f.write("Nodes\nIndex,X,Y,Constraint,Fx,Fy\n 0,0,0,pin,0,0\n+1,4,0,roller_no_ydisp,0,0\n")
+                f.write('"2",2,3,,0,-5\n')
+                f.write("Bars\nIndex,Start Node,End Node,Section Type,Material\n")
+                f.write("0,0,1,%s,Steel ASTM A36\n 1,1,2,%s,Steel ASTM A36\n2,0,2,%s,Steel ASTM A36\n"
+                        % (section, section, section))
+            model = csvdata.LoadModel(path)
+            self.assertEqual([0, 1, 2], model.node_list_idx.tolist())
+            self.assertEqual(3, model.n_bars)
+            self.assertEqual(section, model.bars[1].section)
+
+            # quoted markers switch sections like plain ones
+            with open(path, 'r') as f:
+                text = f.read()
+            quoted = os.path.join(folder, "quoted.csv")
+            with open(quoted, 'w') as f:
+                f.write(text.replace("Nodes\n", '"Nodes",,\n').replace("Bars\n", ' "Bars"\n'))
+            model = csvdata.LoadModel(quoted)
+            self.assertEqual(3, model.n_nodes)
+            self.assertEqual(3, model.n_bars)
+
+            # a line that is neither data nor a marker is reported
+            with open(path, 'a') as f:
+                f.write("Loads\n")
+            with self.assertRaises(SystemExit) as context:
+                csvdata.LoadModel(path)
+            self.assertIn("Line 11", str(context.exception))
+
+    def test_Compiled_Model_Cache(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "Example_3_3.csv")
+            shutil.copy("Example_3_3.csv", path)
+
+            parsed = csvdata.LoadModel(path, use_cache=True)
+            cache_path = csvdata.CompiledModelPath(path, csvdata.FileDigest(path))
+            self.assertTrue(os.path.isdir(cache_path))
+
+            cached = csvdata.LoadModel(path, use_cache=True)
+            self.assertIsInstance(cached.xy, np.memmap)
+            self.assertTrue(np.array_equal(parsed.conn, cached.conn))
+            self.assertTrue(np.array_equal(parsed.incidence_bars, cached.incidence_bars))
+            self.assertEqual(parsed.section_names, cached.section_names)
+            self.assertAlmostEqual(parsed.bar_length[4], cached.bar_length[4])
+
+            # editing the file changes its hash, so the model is parsed again
+            with open(path, 'a') as f:
+                f.write("\n9,0,2,W Shapes:W8X10,Steel ASTM A36,,,\n")
+            self.assertEqual(10, csvdata.LoadModel(path, use_cache=True).n_bars)
+            # and the compiled form of the old contents is removed
+            self.assertFalse(os.path.exists(cache_path))
+            self.assertEqual(1, len(os.listdir(os.path.dirname(cache_path))))
+
+    def test_Unwritable_Cache(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "Example_3_3.csv")
+            shutil.copy("Example_3_3.csv", path)
+            # a file where the cache folder belongs makes it unwritable even
+            # for users that ignore permissions
+            open(os.path.join(folder, csvdata.CACHE_FOLDER), 'w').close()
+
+            model = csvdata.LoadModel(path, use_cache=True)
+            self.assertEqual(9, model.n_bars)
+            self.assertNotIsInstance(model.xy, np.memmap)
+
+    def test_Cache_Is_Opt_In(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "Example_3_3.csv")
+            shutil.copy("Example_3_3.csv", path)
+            Main.MethodOfJoints(path)
+            self.assertFalse(os.path.exists(os.path.join(folder, csvdata.CACHE_FOLDER)))
+
+            # threads writing the same model each use their own temporary
+            # folder, and exactly one compiled model is left behind
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                models = list(pool.map(lambda k: Main.LoadCSV(path, use_cache=True)[0].model, range(8)))
+            self.assertEqual([9]*8, [model.n_bars for model in models])
+            self.assertEqual([os.path.basename(csvdata.CompiledModelPath(path, csvdata.FileDigest(path)))],
+                             os.listdir(os.path.join(folder, csvdata.CACHE_FOLDER)))
+
+if __name__ == '__main__':
+    unittest.main()
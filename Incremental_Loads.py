@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:04:51 2026
+
+Incremental re-solve of a truss after a few nodal loads change
+
+The bar forces and reactions of a unit load on every tracked load DOF are
+solved once, in one batch. Load edits made through the node views
+(AddExternalXForce, AddExternalYForce) are recorded by the model, and
+Update adds the change of each edited load times its unit response to the
+results, in O(edited DOFs x bars) instead of a full solve.
+"""
+
+import sys
+import numpy as np
+
+from Classes import ModelOf
+from Truss_Solver import TrussSolver
+
+# Largest number of stored unit response values (about 400 MB of floats)
+INCREMENTAL_MAX_VALUES = 50000000
+
+class IncrementalSolver:
+
+    # Tracks the loaded DOFs of the model, or the given DOFs (2*row +
+    # direction); other DOFs are added to the tracked ones when first edited
+    def __init__(self, nodes, bars, dofs=None, solver=None):
+        self.model = ModelOf(nodes, bars)
+        if(self.model is None):
+            sys.exit("The incremental solver needs the nodes and bars of a loaded truss model")
+        self.solver = TrussSolver(nodes, bars) if solver is None else solver
+        if dofs is None:
+            dofs = np.flatnonzero(self.model.force_external.ravel())
+        self.dofs = np.zeros(0, dtype=np.int64)
+        self.Rebuild(dofs)
+
+    # Unit load responses of a set of DOFs as (n_dofs, n_bars) bar forces
+    # and (n_dofs, n_reactions) reactions
+    def UnitResponses(self, dofs, n_tracked=0):
+        model = self.model
+        n_values = (n_tracked + len(dofs)) * (model.n_bars + len(self.reaction_dofs))
+        if(n_values > INCREMENTAL_MAX_VALUES):
+            sys.exit("Tracking %d load DOFs of a truss with %d bars needs too much memory"
+                     % (n_tracked + len(dofs), model.n_bars))
+        loads = np.zeros((len(dofs), 2*model.n_nodes))
+        loads[np.arange(len(dofs)), dofs] = 1
+        bar_forces, reactions = self.solver.SolveLoadCases(loads.reshape(len(dofs), model.n_nodes, 2))[:2]
+        return bar_forces, reactions
+
+    # Solve the current loads in full and recompute the unit responses of
+    # the tracked DOFs, e.g. after the geometry or supports changed
+    def Rebuild(self, dofs=None):
+        model = self.model
+        if dofs is None:
+            dofs = self.dofs
+        self.dofs = np.unique(np.asarray(dofs, dtype=np.int64))
+        self.slots = np.full(2*model.n_nodes, -1, dtype=np.int64)
+        self.slots[self.dofs] = np.arange(len(self.dofs))
+        self.reaction_dofs = self.solver.reaction_dofs
+        self.bar_response, self.reaction_response = self.UnitResponses(self.dofs)
+
+        # loads of every DOF that the current results include
+        self.applied = model.force_external.ravel().copy()
+        bar_forces, reactions = self.solver.SolveLoadCases(model.force_external[None])[:2]
+        self.bar_forces = bar_forces[0]
+        self.reactions = reactions[0]
+        self.revision = model.revision
+        model.load_edits = set()
+        self.Write()
+
+    # Add DOFs to the tracked ones, solving their unit responses in one batch
+    def Track(self, dofs):
+        dofs = np.unique(np.asarray(dofs, dtype=np.int64))
+        dofs = dofs[self.slots[dofs] < 0]
+        if(len(dofs) == 0):
+            return
+        bar_response, reaction_response = self.UnitResponses(dofs, len(self.dofs))
+        self.slots[dofs] = len(self.dofs) + np.arange(len(dofs))
+        self.dofs = np.concatenate([self.dofs, dofs])
+        self.bar_response = np.vstack([self.bar_response, bar_response])
+        self.reaction_response = np.vstack([self.reaction_response, reaction_response])
+
+    # Apply the load edits made since the last update by superposition, or
+    # rebuild when the structure itself changed. Returns the number of load
+    # DOFs whose change was applied.
+    def Update(self):
+        model = self.model
+        if(model.revision != self.revision):
+            self.Rebuild()
+            return len(self.dofs)
+        edits = model.load_edits
+        model.load_edits = set()
+        if not edits:
+            return 0
+        dofs = np.fromiter(edits, dtype=np.int64, count=len(edits))
+        loads = model.force_external.ravel()[dofs]
+        delta = loads - self.applied[dofs]
+        changed = delta != 0
+        dofs = dofs[changed]
+        if(len(dofs) == 0):
+            return 0
+        self.Track(dofs)
+        rows = self.slots[dofs]
+        self.bar_forces += delta[changed] @ self.bar_response[rows]
+        self.reactions += delta[changed] @ self.reaction_response[rows]
+        self.applied[dofs] = loads[changed]
+        self.Write()
+        return len(dofs)
+
+    # Store the current results on the nodes and bars
+    def Write(self):
+        model = self.model
+        model.axial_load[:] = self.bar_forces
+        model.is_computed[:] = True
+        model.reaction.ravel()[self.reaction_dofs] = self.reactions
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:31:09 2026
+
+Tests for the incremental re-solve after load edits
+"""
+
+import numpy as np
+import Main_for_Final_Testing as Main
+import Incremental_Loads as incremental
+import Truss_Generator as generator
+from Truss_Solver import TrussSolver
+
+import unittest
+
+# Bar forces and reactions of a full solve of the current loads
+def FullSolve(model):
+    solver = TrussSolver(model.nodes, model.bars)
+    bar_forces, reactions = solver.SolveLoadCases(model.force_external[None])[:2]
+    return bar_forces[0], reactions[0]
+
+class TestIncrementalSolver(unittest.TestCase):
+
+    def test_Matches_Full_Solve_After_Edits(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        solver = incremental.IncrementalSolver(nodes, bars)
+        self.assertAlmostEqual(-692.781, bars[0].axial_load, 2)
+
+        # edit a loaded DOF, then one that was not loaded before
+        nodes[1].AddExternalYForce(2*nodes[1].yforce_external)
+        self.assertEqual(1, solver.Update())
+        nodes[2].AddExternalXForce(25.0)
+        nodes[2].AddExternalYForce(nodes[2].yforce_external)
+        self.assertEqual(1, solver.Update())
+        self.assertEqual(0, solver.Update())
+
+        bar_forces, reactions = FullSolve(nodes.model)
+        np.testing.assert_allclose(bar_forces, nodes.model.axial_load, atol=1e-9)
+        np.testing.assert_allclose(reactions, nodes.model.reaction.ravel()[solver.reaction_dofs], atol=1e-9)
+
+    def test_Indeterminate_And_Structure_Changes(self):
+        model = generator.GenerateTruss('pratt', 6)
+        solver = incremental.IncrementalSolver(model.nodes, model.bars, solver=TrussSolver(model.nodes, model.bars, 'stiffness'))
+        model.nodes[3].AddExternalYForce(-30.0)
+        model.nodes[4].AddExternalXForce(5.0)
+        self.assertEqual(2, solver.Update())
+        bar_forces = FullSolve(model)[0]
+        np.testing.assert_allclose(bar_forces, model.axial_load, atol=1e-9)
+
+        # moving a node changes the structure, so the next update rebuilds
+        model.nodes[8].AddLocation(model.xy[8] + [0, 2])
+        model.nodes[3].AddExternalYForce(-20.0)
+        solver.Update()
+        np.testing.assert_allclose(FullSolve(model)[0], model.axial_load, atol=1e-9)
+
+    def test_Memory_Limit(self):
+        model = generator.GenerateTruss('warren', 20)
+        limit = incremental.INCREMENTAL_MAX_VALUES
+        incremental.INCREMENTAL_MAX_VALUES = 100
+        try:
+            with self.assertRaises(SystemExit):
+                incremental.IncrementalSolver(model.nodes, model.bars)
+        finally:
+            incremental.INCREMENTAL_MAX_VALUES = limit
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:05:26 2026
+
+Bar force influence lines and moving load envelopes
+"""
+
+import sys
+import numpy as np
+
+from Classes import ModelOf
+from Truss_Solver import TrussSolver
+
+# Node rows of the loaded nodes, given as node objects or node list indices
+def LoadedNodeRows(model, loaded_nodes):
+    if(len(loaded_nodes) > 0 and hasattr(loaded_nodes[0], 'row')):
+        rows = np.array([node.row for node in loaded_nodes], dtype=np.int64)
+    else:
+        rows = model.RowsOfListIdxs(loaded_nodes)
+    if(len(rows) < 2):
+        sys.exit("Influence lines need at least two loaded nodes")
+    if(len(np.unique(rows)) != len(rows)):
+        sys.exit("Loaded nodes must not repeat")
+    return rows
+
+# Unit loads at each loaded node as an (n_positions, n_nodes, 2) array of
+# load cases
+def UnitLoadCases(model, rows, direction=(0, -1)):
+    loads = np.zeros((len(rows), model.n_nodes, 2))
+    loads[np.arange(len(rows)), rows] = direction
+    return loads
+
+# Distance of every loaded node along the path through them, starting at 0
+def PathPositions(xy):
+    steps = np.hypot(*np.diff(xy, axis=0).T)
+    return np.concatenate([[0], np.cumsum(steps)])
+
+# Linearly interpolate rows of values given at the loaded node positions
+# to arbitrary points along the loaded path (zero off either end)
+def InterpolateRows(positions, values, points):
+    points = np.asarray(points, dtype=float)
+    inside = (points >= positions[0]) & (points <= positions[-1])
+    left = np.clip(np.searchsorted(positions, points, side='right') - 1, 0, len(positions) - 2)
+    t = np.where(inside, (points - positions[left]) / (positions[left + 1] - positions[left]), 0)
+    return (inside*(1 - t))[:, None] * values[left] + t[:, None] * values[left + 1]
+
+# Influence lines of every bar force and reaction for a unit load moving
+# over a list of loaded nodes (for example the bottom chord), computed with
+# one factorization and one batched solve
+class InfluenceLines:
+
+    def __init__(self, nodes, bars, loaded_nodes, direction=(0, -1), solver=None):
+        model = ModelOf(nodes, bars)
+        if(model is None):
+            sys.exit("Influence lines need the nodes and bars of a loaded truss model")
+        if(solver is None):
+            solver = TrussSolver(nodes, bars)
+        self.rows = LoadedNodeRows(model, loaded_nodes)
+        self.positions = PathPositions(model.xy[self.rows])
+        if(np.any(np.diff(self.positions) <= 0)):
+            sys.exit("Loaded nodes must be distinct points along the loaded path")
+
+        # bar_forces is (n_positions, n_bars): row i holds every bar force
+        # for the unit load at loaded node i
+        bar_forces, reactions, displacements = solver.SolveLoadCases(UnitLoadCases(model, self.rows, direction))
+        self.bar_forces = bar_forces
+        self.reactions = reactions
+        self.reaction_dofs = solver.reaction_dofs
+
+    @property
+    def n_positions(self):
+        return len(self.positions)
+
+    # Envelope of bar forces under a train of axle loads moving along the
+    # loaded path. axle_loads are ordered from the leading axle back and
+    # axle_spacings are the n_axles - 1 distances between them. The effect of
+    # a piecewise linear influence line peaks with some axle on a loaded
+    # node, so only those lead axle positions are evaluated.
+    def MovingLoadEnvelope(self, axle_loads, axle_spacings=(), both_directions=True):
+        axle_loads = np.asarray(axle_loads, dtype=float).ravel()
+        offsets = np.concatenate([[0], np.cumsum(np.asarray(axle_spacings, dtype=float).ravel())])
+        if(len(offsets) != len(axle_loads)):
+            sys.exit("Need %d axle spacings for %d axles" % (len(axle_loads) - 1, len(axle_loads)))
+
+        lead_positions = np.unique((self.positions[:, None] + offsets[None, :]).ravel())
+        effects = self.TrainEffects(axle_loads, offsets, lead_positions)
+        if(both_directions):
+            # a train running the other way has its axles in reverse order
+            # behind the lead axle
+            reverse_loads = axle_loads[::-1]
+            reverse_offsets = offsets[-1] - offsets[::-1]
+            reverse_positions = np.unique((self.positions[:, None] + reverse_offsets[None, :]).ravel())
+            reverse_effects = self.TrainEffects(reverse_loads, reverse_offsets, reverse_positions)
+            lead_positions = np.concatenate([lead_positions, reverse_positions])
+            effects = np.vstack([effects, reverse_effects])
+        return MovingLoadEnvelopeResult(effects, lead_positions)
+
+    # Bar forces (n_lead_positions, n_bars) for a train of axles whose lead
+    # axle sits at each of the given positions: a weighted sliding sum of the
+    # influence matrix rows
+    def TrainEffects(self, axle_loads, offsets, lead_positions):
+        lead_positions = np.asarray(lead_positions, dtype=float)
+        effects = np.zeros((len(lead_positions), self.bar_forces.shape[1]))
+        for load, offset in zip(axle_loads, offsets):
+            effects += load * InterpolateRows(self.positions, self.bar_forces, lead_positions - offset)
+        return effects
+
+# Largest and smallest bar forces under a moving load together with the lead
+# axle position (along the loaded path) at which each occurs
+class MovingLoadEnvelopeResult:
+
+    def __init__(self, effects, lead_positions):
+        max_idx = np.argmax(effects, axis=0)
+        min_idx = np.argmin(effects, axis=0)
+        bars = np.arange(effects.shape[1])
+        self.maximum = effects[max_idx, bars]
+        self.minimum = effects[min_idx, bars]
+        self.maximum_position = lead_positions[max_idx]
+        self.minimum_position = lead_positions[min_idx]
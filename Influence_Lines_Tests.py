@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:41:50 2026
+
+Tests for influence lines and moving load envelopes
+"""
+
+import os
+import tempfile
+import numpy as np
+import Main_for_Final_Testing as Main
+import Influence_Lines as il
+
+import unittest
+
+class TestInfluenceLines(unittest.TestCase):
+
+    def setUp(self):
+        self.nodes, self.bars = Main.LoadCSV("Example_3_2.csv")
+        self.influence = il.InfluenceLines(self.nodes, self.bars, [0, 1, 2, 3])
+
+    def test_Matches_Single_Solves_Example_3_2(self):
+        model = self.nodes.model
+        self.assertEqual((4, 11), self.influence.bar_forces.shape)
+        np.testing.assert_allclose([0, 4, 8, 12], self.influence.positions)
+
+        for i, row in enumerate([0, 1, 2, 3]):
+            model.force_external[:] = 0
+            model.force_external[row, 1] = -1
+            Main.SolveUsingEquilibriumMatrix(self.nodes, self.bars)
+            np.testing.assert_allclose(model.axial_load, self.influence.bar_forces[i], atol=1e-12)
+
+        # the roller reaction of a simple span is x / L
+        roller = list(self.influence.reaction_dofs).index(2*3 + 1)
+        np.testing.assert_allclose([0, 1/3, 2/3, 1], self.influence.reactions[:, roller], atol=1e-12)
+
+    def test_Moving_Load_Envelope(self):
+        single = self.influence.MovingLoadEnvelope([10])
+        np.testing.assert_allclose(10*self.influence.bar_forces.max(axis=0), single.maximum, atol=1e-12)
+        np.testing.assert_allclose(10*self.influence.bar_forces.min(axis=0), single.minimum, atol=1e-12)
+
+        # compare a two axle train against brute force sampling of its
+        # position in both directions
+        axle_loads = np.array([8.0, 5.0])
+        envelope = self.influence.MovingLoadEnvelope(axle_loads, [3.0])
+        self.assertIsInstance(envelope, il.MovingLoadEnvelopeResult)
+        leads = np.linspace(-1, 16, 17*40 + 1)
+        forward = self.influence.TrainEffects(axle_loads, np.array([0, 3.0]), leads)
+        backward = self.influence.TrainEffects(axle_loads[::-1], np.array([0, 3.0]), leads)
+        sampled = np.vstack([forward, backward])
+
+        np.testing.assert_allclose(sampled.max(axis=0), envelope.maximum, atol=1e-9)
+        np.testing.assert_allclose(sampled.min(axis=0), envelope.minimum, atol=1e-9)
+
+    def test_Gabled_Pratt_Bottom_Chord(self):
+        path = os.path.join("CSV_Files", "DO_NOT_EDIT", "Modified_Gabled_Pratt_Six_Panel.csv")
+        with open(path, 'r') as f:
+            lines = f.read().split('\n')
+        # the end nodes of the bottom chord are supported by a pin and a roller
+        for k, constraint in ((2, 'pin'), (3, 'roller_no_ydisp')):
+            fields = lines[k].split(',')
+            fields[3] = constraint
+            lines[k] = ','.join(fields)
+
+        with tempfile.TemporaryDirectory() as folder:
+            supported = os.path.join(folder, "Supported_Pratt.csv")
+            with open(supported, 'w') as f:
+                f.write('\n'.join(lines))
+            bar_forces, positions = Main.MethodOfJointsInfluenceLines(supported, [0, 5, 4, 3, 7, 9, 1])
+
+        self.assertEqual((7, 21), bar_forces.shape)
+        self.assertAlmostEqual(52.2203, positions[-1], 3)
+        # a load over a support produces no bar forces
+        np.testing.assert_allclose(0, bar_forces[[0, -1]], atol=1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 11:05:52 2026
+
+Named load patterns, ASCE 7 load combinations and bar force envelopes
+
+Load patterns are nodal load arrays with names such as dead, live, snow or
+wind. They are read from a side file with one load per line,
+
+    Pattern,Node,Xforce (kip),Yforce (kip)
+    dead,1,0,-10
+    snow,2,0,-4.5
+
+or from extra columns of the Nodes section of a truss CSV file headed
+"<pattern> Xforce" and "<pattern> Yforce" after the BarIdxs column. Every
+pattern is solved once (one batched solve), and the bar forces of all
+combinations are a single (combinations x patterns) by (patterns x bars)
+matrix product.
+
+Pattern names map to the ASCE 7 load symbols by their start (dead -> D,
+live -> L, roof live -> Lr, snow -> S, rain -> R, wind -> W, earthquake or
+seismic -> E). Several patterns of one symbol (e.g. "wind left" and "wind
+right") are alternatives: every combination is formed with each of them.
+"""
+
+import csv
+import itertools
+import re
+import sys
+import numpy as np
+
+from Classes import ModelOf
+from Truss_Solver import TrussSolver
+
+# Load symbols of pattern names, matched against the start of the name
+# (longest first, so that "roof live" is not taken for "live")
+PATTERN_SYMBOLS = (('roof live', 'Lr'), ('roof_live', 'Lr'), ('dead', 'D'), ('live', 'L'),
+                   ('snow', 'S'), ('rain', 'R'), ('wind', 'W'), ('earthquake', 'E'), ('seismic', 'E'))
+
+# ASCE 7-16 strength (2.3.1, 2.3.6) and allowable stress (2.4.1, 2.4.5)
+# combinations. A term is a (symbol, factor) pair or a list of alternative
+# pairs, written "(a or b)" in the standard. E is the horizontal seismic
+# load Eh; the vertical effect Ev is not modeled.
+LRFD_COMBINATIONS = (
+    ('LRFD 1', [('D', 1.4)]),
+    ('LRFD 2', [('D', 1.2), ('L', 1.6), [('Lr', 0.5), ('S', 0.5), ('R', 0.5)]]),
+    ('LRFD 3', [('D', 1.2), [('Lr', 1.6), ('S', 1.6), ('R', 1.6)], [('L', 1.0), ('W', 0.5)]]),
+    ('LRFD 4', [('D', 1.2), ('W', 1.0), ('L', 1.0), [('Lr', 0.5), ('S', 0.5), ('R', 0.5)]]),
+    ('LRFD 5', [('D', 0.9), ('W', 1.0)]),
+    ('LRFD 6', [('D', 1.2), ('E', 1.0), ('L', 1.0), ('S', 0.2)]),
+    ('LRFD 7', [('D', 0.9), ('E', 1.0)]),
+)
+ASD_COMBINATIONS = (
+    ('ASD 1', [('D', 1.0)]),
+    ('ASD 2', [('D', 1.0), ('L', 1.0)]),
+    ('ASD 3', [('D', 1.0), [('Lr', 1.0), ('S', 1.0), ('R', 1.0)]]),
+    ('ASD 4', [('D', 1.0), ('L', 0.75), [('Lr', 0.75), ('S', 0.75), ('R', 0.75)]]),
+    ('ASD 5', [('D', 1.0), ('W', 0.6)]),
+    ('ASD 6', [('D', 1.0), ('L', 0.75), ('W', 0.45), [('Lr', 0.75), ('S', 0.75), ('R', 0.75)]]),
+    ('ASD 7', [('D', 0.6), ('W', 0.6)]),
+    ('ASD 8', [('D', 1.0), ('E', 0.7)]),
+    ('ASD 9', [('D', 1.0), ('L', 0.75), ('E', 0.525), ('S', 0.75)]),
+    ('ASD 10', [('D', 0.6), ('E', 0.7)]),
+)
+COMBINATION_TABLES = {'LRFD': LRFD_COMBINATIONS, 'ASD': ASD_COMBINATIONS}
+
+# ASCE 7 symbol of a pattern name (None if it has none)
+def PatternSymbol(name):
+    name = name.strip().lower()
+    for prefix, symbol in PATTERN_SYMBOLS:
+        if(name.startswith(prefix)):
+            return symbol
+    return None
+
+# Named load patterns of a model as {name: (n_nodes, 2) loads}, in the order
+# the names first appear
+class LoadPatterns:
+
+    def __init__(self, model):
+        self.model = model
+        self.loads = {}
+
+    @property
+    def names(self):
+        return list(self.loads)
+
+    # Loads of a pattern, created empty when it does not exist yet
+    def Pattern(self, name):
+        name = name.strip()
+        if(name not in self.loads):
+            self.loads[name] = np.zeros((self.model.n_nodes, 2))
+        return self.loads[name]
+
+    # Add loads of node list indices to a pattern
+    def AddLoads(self, name, list_idxs, forces):
+        list_idxs = np.asarray(list_idxs, dtype=np.int64)
+        unknown = np.setdiff1d(list_idxs, self.model.node_list_idx)
+        if(len(unknown) > 0):
+            sys.exit("Load pattern %s references undefined nodes %s" % (name, unknown[:10].tolist()))
+        np.add.at(self.Pattern(name), self.model.RowsOfListIdxs(list_idxs), np.asarray(forces, dtype=float))
+
+    # Loads of every pattern as an (n_patterns, n_nodes, 2) array
+    def Stack(self):
+        if not self.loads:
+            return np.zeros((0, self.model.n_nodes, 2))
+        return np.stack(list(self.loads.values()))
+
+# Read a side file of pattern loads (pattern, node, x force, y force) into
+# the patterns of a model
+def ReadPatternFile(path, patterns):
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        rows = [row for row in csv.reader(f) if row and row[0].strip()]
+    # skip a header line
+    if(rows and (len(rows[0]) < 2 or not rows[0][1].strip().lstrip('-').isdigit())):
+        rows = rows[1:]
+    by_pattern = {}
+    for line, row in enumerate(rows):
+        if(len(row) < 4):
+            sys.exit("Load pattern line %d of %s needs a pattern, node, x force and y force" % (line + 1, path))
+        by_pattern.setdefault(row[0].strip(), []).append((int(row[1]), float(row[2] or 0), float(row[3] or 0)))
+    for name, entries in by_pattern.items():
+        entries = np.array(entries)
+        patterns.AddLoads(name, entries[:, 0].astype(np.int64), entries[:, 1:])
+    return patterns
+
+PATTERN_COLUMN = re.compile(r'^\s*(.+?)\s+([xy])force\b', re.IGNORECASE)
+INCIDENCE_COLUMN = re.compile(r'^\s*(beam|bar)idxs', re.IGNORECASE)
+
+# Pattern columns of a Nodes header row as (column, pattern, direction)
+# triples. They follow the BeamIdxs/BarIdxs column, whose position depends
+# on whether the file has a ZForce column; other headers there that name a
+# force but are not "<pattern> Xforce" or "<pattern> Yforce" are errors.
+def PatternColumns(header):
+    first = next((k + 1 for k, name in enumerate(header) if INCIDENCE_COLUMN.match(name)), len(header))
+    columns = []
+    for k in range(first, len(header)):
+        match = PATTERN_COLUMN.match(header[k])
+        if match:
+            columns.append((k, match.group(1), 0 if match.group(2).lower() == 'x' else 1))
+        elif('force' in header[k].lower()):
+            sys.exit("Cannot read the load pattern column \"%s\", expected \"<pattern> Xforce\" or "
+                     "\"<pattern> Yforce\"" % header[k].strip())
+    return columns
+
+# Read the "<pattern> Xforce" and "<pattern> Yforce" columns that follow the
+# standard columns of the Nodes section of a truss CSV file
+def ReadPatternColumns(input_geometry, patterns):
+    with open(input_geometry, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        section = None
+        columns = []
+        list_idxs = []
+        values = []
+        for row in reader:
+            if not row:
+                continue
+            key = row[0].strip().lower()
+            if(key in ('nodes', 'bars', 'beams')):
+                section = key
+                continue
+            if(section != 'nodes'):
+                continue
+            if(key == 'index'):
+                columns = PatternColumns(row)
+                continue
+            if(columns):
+                list_idxs.append(int(row[0]))
+                values.append([float(row[k]) if k < len(row) and row[k].strip() else 0.0 for k, name, d in columns])
+    if(columns and list_idxs):
+        values = np.array(values)
+        rows = patterns.model.RowsOfListIdxs(list_idxs)
+        for j, (k, name, direction) in enumerate(columns):
+            patterns.Pattern(name)[rows, direction] += values[:, j]
+    return patterns
+
+# Factor matrix (n_combinations, n_patterns) and names of the combinations
+# of a table for the given pattern names. Symbols without a pattern count
+# as zero, symbols with several patterns are alternatives, and repeated or
+# empty combinations are dropped.
+def CombinationMatrix(pattern_names, method='LRFD'):
+    if(method not in COMBINATION_TABLES):
+        sys.exit("Unknown combination method %s, expected one of %s" % (method, list(COMBINATION_TABLES)))
+    by_symbol = {}
+    for k, name in enumerate(pattern_names):
+        by_symbol.setdefault(PatternSymbol(name), []).append(k)
+
+    names = []
+    rows = []
+    seen = set()
+    for label, terms in COMBINATION_TABLES[method]:
+        choices = []
+        for term in terms:
+            alternatives = term if isinstance(term, list) else [term]
+            options = [(k, factor) for symbol, factor in alternatives for k in by_symbol.get(symbol, [])]
+            choices.append(options if options else [None])
+        for chosen in itertools.product(*choices):
+            row = np.zeros(len(pattern_names))
+            for option in chosen:
+                if option is not None:
+                    row[option[0]] += option[1]
+            key = tuple(row)
+            if(not np.any(row) or key in seen):
+                continue
+            seen.add(key)
+            rows.append(row)
+            names.append("%s: %s" % (label, ' + '.join("%g %s" % (row[k], pattern_names[k])
+                                                        for k in np.flatnonzero(row))))
+    return names, np.array(rows).reshape(-1, len(pattern_names))
+
+# Envelope of the bar forces and reactions over all combinations, with the
+# governing combination of every maximum and minimum
+class CombinationEnvelope:
+
+    def __init__(self, names, bar_forces, reactions, reaction_dofs):
+        self.names = names
+        self.bar_forces = bar_forces
+        self.reactions = reactions
+        self.reaction_dofs = reaction_dofs
+        self.max_combination = np.argmax(bar_forces, axis=0)
+        self.min_combination = np.argmin(bar_forces, axis=0)
+        columns = np.arange(bar_forces.shape[1])
+        self.maximum = bar_forces[self.max_combination, columns]
+        self.minimum = bar_forces[self.min_combination, columns]
+        self.max_reaction = reactions.max(axis=0)
+        self.min_reaction = reactions.min(axis=0)
+
+    # Governing combination names of the maximum and minimum of a bar
+    def Governing(self, bar):
+        return self.names[self.max_combination[bar]], self.names[self.min_combination[bar]]
+
+# Solve every pattern once and form all combinations of a method
+def SolveCombinations(nodes, bars, patterns, method='LRFD', solver=None):
+    model = ModelOf(nodes, bars)
+    if(model is None):
+        sys.exit("Load combinations need the nodes and bars of a loaded truss model")
+    if not patterns.names:
+        sys.exit("There are no load patterns to combine")
+    if solver is None:
+        solver = TrussSolver(nodes, bars)
+    names, factors = CombinationMatrix(patterns.names, method)
+    if(len(names) == 0):
+        sys.exit("None of the patterns %s appear in the %s combinations" % (patterns.names, method))
+    pattern_forces, pattern_reactions = solver.SolveLoadCases(patterns.Stack())[:2]
+    return CombinationEnvelope(names, factors @ pattern_forces, factors @ pattern_reactions,
+                               solver.reaction_dofs)
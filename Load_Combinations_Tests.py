@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 11:48:20 2026
+
+Tests for the load patterns, load combinations and their envelopes
+"""
+
+import os
+import shutil
+import tempfile
+import numpy as np
+import Main_for_Final_Testing as Main
+import Load_Combinations as combinations
+from Truss_Solver import TrussSolver
+
+import unittest
+
+class TestLoadCombinations(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def WriteFile(self, name, lines):
+        path = os.path.join(self.folder, name)
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
+
+    def test_Pattern_Symbols(self):
+        self.assertEqual('D', combinations.PatternSymbol(" Dead"))
+        self.assertEqual('Lr', combinations.PatternSymbol("roof live"))
+        self.assertEqual('L', combinations.PatternSymbol("live 2"))
+        self.assertEqual('W', combinations.PatternSymbol("wind left"))
+        self.assertEqual('E', combinations.PatternSymbol("seismic x"))
+        self.assertIsNone(combinations.PatternSymbol("temperature"))
+
+    def test_Combination_Matrix(self):
+        # only dead and live: LRFD 1 and 2 remain, the rest are repeats
+        names, factors = combinations.CombinationMatrix(["dead", "live"])
+        self.assertEqual(["LRFD 1: 1.4 dead", "LRFD 2: 1.2 dead + 1.6 live",
+                          "LRFD 3: 1.2 dead + 1 live", "LRFD 5: 0.9 dead"], names)
+        np.testing.assert_allclose([[1.4, 0], [1.2, 1.6], [1.2, 1.0], [0.9, 0]], factors)
+
+        # two wind directions are alternatives of every term with W
+        names, factors = combinations.CombinationMatrix(["dead", "wind left", "wind right"], 'ASD')
+        self.assertIn("ASD 5: 1 dead + 0.6 wind left", names)
+        self.assertIn("ASD 5: 1 dead + 0.6 wind right", names)
+        self.assertIn("ASD 7: 0.6 dead + 0.6 wind right", names)
+        self.assertFalse(np.any(factors[:, 1:].sum(axis=1) > 0.6 + 1e-12))
+        self.assertEqual(len(names), len(set(map(tuple, factors))))
+
+        names, factors = combinations.CombinationMatrix(["temperature"])
+        self.assertEqual((0, 1), factors.shape)
+
+    def test_Combinations_Match_Direct_Solves(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        model = nodes.model
+        patterns = combinations.LoadPatterns(model)
+        path = self.WriteFile("patterns.csv", ["Pattern,Node,Xforce (kip),Yforce (kip)",
+                                               "dead,1,0,-20", "dead,2,0,-20", "dead,3,0,-20",
+                                               "snow,2,0,-15",
+                                               "wind left,1,12,0", "wind left,2,6,0",
+                                               "wind right,3,-12,0", "wind right,2,-6,0"])
+        combinations.ReadPatternFile(path, patterns)
+        self.assertEqual(["dead", "snow", "wind left", "wind right"], patterns.names)
+        self.assertEqual(-20, patterns.loads["dead"][model.RowsOfListIdxs([3])[0], 1])
+
+        envelope = combinations.SolveCombinations(nodes, bars, patterns)
+        self.assertIn("LRFD 3: 1.2 dead + 1.6 snow + 0.5 wind left", envelope.names)
+        self.assertIn("LRFD 5: 0.9 dead + 1 wind right", envelope.names)
+        self.assertIn("LRFD 6: 1.2 dead + 0.2 snow", envelope.names)
+
+        names, factors = combinations.CombinationMatrix(patterns.names)
+        solver = TrussSolver(nodes, bars)
+        combined = np.einsum('cp,pnk->cnk', factors, patterns.Stack())
+        bar_forces, reactions = solver.SolveLoadCases(combined)[:2]
+        np.testing.assert_allclose(bar_forces, envelope.bar_forces, atol=1e-9)
+        np.testing.assert_allclose(reactions, envelope.reactions, atol=1e-9)
+        np.testing.assert_allclose(bar_forces.max(axis=0), envelope.maximum, atol=1e-9)
+        np.testing.assert_allclose(bar_forces.min(axis=0), envelope.minimum, atol=1e-9)
+        np.testing.assert_allclose(reactions.max(axis=0), envelope.max_reaction, atol=1e-9)
+
+        # every bar is governed by the combination holding its extreme
+        for bar in range(model.n_bars):
+            maximum, minimum = envelope.Governing(bar)
+            self.assertAlmostEqual(envelope.maximum[bar], bar_forces[envelope.names.index(maximum), bar], 9)
+            self.assertAlmostEqual(envelope.minimum[bar], bar_forces[envelope.names.index(minimum), bar], 9)
+
+        from_main = Main.MethodOfJointsCombinations("Example_3_3.csv", path)
+        self.assertEqual(envelope.names, from_main.names)
+        np.testing.assert_allclose(envelope.maximum, from_main.maximum, atol=1e-9)
+
+    def test_Pattern_Columns(self):
+        with open("Example_3_3.csv", 'r') as f:
+            lines = f.read().splitlines()
+        # add dead and live columns after BeamIdxs
+        extra = {'Index': "Dead Xforce (kip),Dead Yforce (kip),Live Yforce (kip)",
+                 '1': "0,-10,-5", '2': "0,-10,", '3': "2,-10,-5"}
+        for k, line in enumerate(lines):
+            key = line.split(',')[0].strip()
+            if(key in extra and k < lines.index("Bars,,,,,,,")):
+                lines[k] = line + ',' + extra[key]
+        path = self.WriteFile("columns.csv", lines)
+
+        nodes, bars = Main.LoadCSV(path)
+        model = nodes.model
+        patterns = combinations.ReadPatternColumns(path, combinations.LoadPatterns(model))
+        self.assertEqual(["Dead", "Live"], patterns.names)
+        rows = model.RowsOfListIdxs([1, 2, 3])
+        np.testing.assert_allclose([[0, -10], [0, -10], [2, -10]], patterns.loads["Dead"][rows])
+        np.testing.assert_allclose([-5, 0, -5], patterns.loads["Live"][rows, 1])
+
+        envelope = combinations.SolveCombinations(nodes, bars, patterns, 'ASD')
+        self.assertEqual(["ASD 1: 1 Dead", "ASD 2: 1 Dead + 1 Live", "ASD 4: 1 Dead + 0.75 Live",
+                          "ASD 7: 0.6 Dead"], envelope.names)
+        np.testing.assert_allclose(envelope.bar_forces[1], envelope.bar_forces[0] + 4/3*(envelope.bar_forces[2] - envelope.bar_forces[0]),
+                                   atol=1e-9)
+
+    def test_Pattern_Columns_Without_ZForce(self):
+        # BeamIdxs is the 7th column when there is no ZForce column
+        with open(os.path.join("CSV_Files", "DO_NOT_EDIT", "Modified_Gabled_Pratt_Six_Panel.csv"), 'r') as f:
+            lines = f.read().splitlines()
+        header = next(k for k, line in enumerate(lines) if line.startswith("Index"))
+        self.assertEqual(6, lines[header].split(',').index("BeamIdxs"))
+        lines[header] += ",Snow Yforce (kip)"
+        lines[header + 2] += ",-4"
+        path = self.WriteFile("gabled.csv", lines)
+
+        nodes, bars = Main.LoadCSV(path)
+        patterns = combinations.ReadPatternColumns(path, combinations.LoadPatterns(nodes.model))
+        self.assertEqual(["Snow"], patterns.names)
+        self.assertEqual(-4, patterns.loads["Snow"][nodes.model.RowsOfListIdxs([1])[0], 1])
+
+        # a force column that is not a pattern force is an error
+        lines[header] = lines[header].replace("Snow Yforce", "Snow Zforce")
+        path = self.WriteFile("gabled.csv", lines)
+        with self.assertRaises(SystemExit) as error:
+            combinations.ReadPatternColumns(path, combinations.LoadPatterns(nodes.model))
+        self.assertIn("Snow Zforce", str(error.exception))
+
+    def test_Undefined_Nodes(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        patterns = combinations.LoadPatterns(nodes.model)
+        path = self.WriteFile("patterns.csv", ["dead,1,0,-20", "dead,42,0,-20"])
+        with self.assertRaises(SystemExit):
+            combinations.ReadPatternFile(path, patterns)
+        with self.assertRaises(SystemExit):
+            combinations.SolveCombinations(nodes, bars, combinations.LoadPatterns(nodes.model))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,23 +12,35 @@ from ImportCSVData import LoadData
 from Method_of_Joints import IterateUsingMethodOfJoints
 from Structure_Operations import StaticallyDeterminate
 from Structure_Operations import ComputeReactions
+from Structure_Operations import GeometricallyStable
+from Solver_Stats import Phase
 
 import Plotting_Method_of_Joints
 
 # perform the method of joints on a statically
-# determinate truss
-def MethodOfJoints( input_geometry):
+# determinate truss. A SolverStats object given as stats records the
+# phase times and solver counters and is printed at the end. use_cache
+# caches the parsed model next to the CSV file.
+def MethodOfJoints( input_geometry, stats=None, use_cache=False):
     
     # load the input data
-    [nodes, bars] = LoadData(input_geometry)
+    with Phase(stats, "LoadData"):
+        [nodes, bars] = LoadData(input_geometry, use_cache)
     
     # determine if the truss is statically determinate barring parallel or
     # concurrent reactions
-    if not StaticallyDeterminate(nodes,bars):
+    with Phase(stats, "StaticallyDeterminate"):
+        determinate = StaticallyDeterminate(nodes,bars)
+    if not determinate:
         sys.exit("Cannot operate on a truss that is not statically determinate")
     
+    # reject geometrically unstable trusses (mechanisms) before solving
+    with Phase(stats, "GeometricallyStable"):
+        GeometricallyStable(nodes,bars)
+    
     # Compute reaction forces at the supports from external loads
-    ComputeReactions(nodes)
+    with Phase(stats, "ComputeReactions"):
+        ComputeReactions(nodes)
     
     #Check that correct reacion forces computed
     for node in nodes:
@@ -40,7 +52,8 @@ def MethodOfJoints( input_geometry):
             print("Reaction in y at node %d is %f." % (node.idx, node.yforce_reaction))
     # Iterate through all bars using the method of joints
     # to compute internal member loads
-    IterateUsingMethodOfJoints(nodes,bars)
+    with Phase(stats, "IterateUsingMethodOfJoints"):
+        IterateUsingMethodOfJoints(nodes,bars,stats)
     
     # output computed forces in bars
     for bar in bars:
@@ -50,6 +63,9 @@ def MethodOfJoints( input_geometry):
     # plotting functionality to visualize indices
     # see the problem statement for how to plot alternative information
     Plotting_Method_of_Joints.PlotStructureData(nodes,bars,"index")
+    
+    if stats is not None:
+        stats.Print()
 
 # Run the plane truss function 
 MethodOfJoints('Modified_Gabled_Pratt_Six_Panel.csv')
\ No newline at end of file
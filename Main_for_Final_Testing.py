@@ -11,8 +11,15 @@ import sys
 from ImportCSVData import LoadData
 
 from Method_of_Joints import IterateUsingMethodOfJoints
+from Equilibrium_Matrix import SolveUsingEquilibriumMatrix
+from Equilibrium_Matrix import EquilibriumFactorization
+from Direct_Stiffness import SolveUsingDirectStiffness
 from Structure_Operations import StaticallyDeterminate
 from Structure_Operations import ComputeReactions
+from Structure_Operations import GeometricallyStable
+from Influence_Lines import InfluenceLines
+from Load_Combinations import LoadPatterns, ReadPatternFile, ReadPatternColumns, SolveCombinations
+from Solver_Stats import Phase
 
 
 # from Master.Method_of_Joints import IterateUsingMethodOfJoints
@@ -21,29 +28,68 @@ from Structure_Operations import ComputeReactions
 
 # perform the method of joints on a statically
 # determinate truss
-def MethodOfJoints( input_geometry):
+# solver is "joints" for the joint-by-joint sweep or "matrix" to solve the
+# global equilibrium matrix for all bar forces and reactions at once.
+# solver "stiffness" uses the direct stiffness method instead, which also
+# handles statically indeterminate trusses.
+# When a SolverStats object is given as stats, the time (and optionally peak
+# memory) of every phase and the solver counters are recorded in it and it
+# is returned as a third item, [nodes, bars, stats].
+# With use_cache the parsed model is cached next to the CSV file (see
+# ImportCSVData.LoadModel).
+def MethodOfJoints( input_geometry, solver="joints", stats=None, use_cache=False):
     
     # load the input data
-    [nodes, bars] = LoadCSV(input_geometry)
+    with Phase(stats, "LoadData"):
+        [nodes, bars] = LoadCSV(input_geometry, use_cache)
+    
+    if(solver == "stiffness"):
+        # reject geometrically unstable trusses (mechanisms) before solving
+        with Phase(stats, "GeometricallyStable"):
+            GeometricallyStable(nodes,bars)
+        with Phase(stats, "SolveUsingDirectStiffness"):
+            SolveUsingDirectStiffness(nodes,bars)
+        return Result(nodes, bars, stats)
     
     # determine if the truss is statically determinate barring parallel or
     # concurrent reactions
-    if not StaticallyDeterminate(nodes,bars):
+    with Phase(stats, "StaticallyDeterminate"):
+        determinate = StaticallyDeterminate(nodes,bars)
+    if not determinate:
         sys.exit("Cannot operate on a truss that is not statically determinate")
     
+    # reject geometrically unstable trusses (mechanisms) before solving
+    with Phase(stats, "GeometricallyStable"):
+        GeometricallyStable(nodes,bars)
+    
+    if(solver == "matrix"):
+        with Phase(stats, "SolveUsingEquilibriumMatrix"):
+            SolveUsingEquilibriumMatrix(nodes,bars)
+        return Result(nodes, bars, stats)
+    elif(solver != "joints"):
+        sys.exit("Unknown solver %s" % solver)
+    
     # Compute reaction forces at the supports from external loads
-    ComputeReactions(nodes)
+    with Phase(stats, "ComputeReactions"):
+        ComputeReactions(nodes)
     
     # Iterate through all bars using the method of joints
     # to compute internal member loads
-    IterateUsingMethodOfJoints(nodes,bars)
+    with Phase(stats, "IterateUsingMethodOfJoints"):
+        IterateUsingMethodOfJoints(nodes,bars,stats)
     
     # return the answer
-    return [nodes, bars]
+    return Result(nodes, bars, stats)
+
+# solved nodes and bars, followed by the stats when they were requested
+def Result(nodes, bars, stats):
+    if(stats is None):
+        return [nodes, bars]
+    return [nodes, bars, stats]
 
-def LoadCSV(input_geometry): 
+def LoadCSV(input_geometry, use_cache=False): 
     # load the input data only
-    [nodes, bars] = LoadData(input_geometry)
+    [nodes, bars] = LoadData(input_geometry, use_cache)
     return nodes,bars
 
 def LoadAndComputeReactions(input_geometry):
@@ -59,3 +105,43 @@ def LoadAndComputeReactions(input_geometry):
     ComputeReactions(nodes)
 
     return nodes,bars
+
+# solve many load cases on one truss geometry. loads is an
+# (n_cases, n_nodes, 2) array of external x and y nodal forces; the geometry
+# is checked and factorized once and reused for every case
+def MethodOfJointsLoadCases(input_geometry, loads):
+    # load the input data
+    [nodes, bars] = LoadCSV(input_geometry)
+    
+    if not StaticallyDeterminate(nodes,bars):
+        sys.exit("Cannot operate on a truss that is not statically determinate")
+    
+    factorization = EquilibriumFactorization(nodes,bars)
+    [bar_forces, reactions] = factorization.SolveLoadCases(loads)
+    
+    return [bar_forces, reactions, factorization.reaction_dofs]
+
+# influence lines of every bar force for a unit downward load moving over
+# the loaded nodes (node list indices, in order along the loaded chord).
+# Returns the (n_positions, n_bars) influence matrix and the distance of
+# each loaded node along the chord
+def MethodOfJointsInfluenceLines(input_geometry, loaded_nodes):
+    # load the input data
+    [nodes, bars] = LoadCSV(input_geometry)
+    
+    influence = InfluenceLines(nodes,bars,loaded_nodes)
+    
+    return [influence.bar_forces, influence.positions]
+
+# envelope of the bar forces over the ASCE 7 load combinations ("LRFD" or
+# "ASD") of the load patterns in extra columns of the input file and, when
+# given, in a side file of pattern loads
+def MethodOfJointsCombinations(input_geometry, pattern_file=None, method='LRFD'):
+    # load the input data
+    [nodes, bars] = LoadCSV(input_geometry)
+    
+    patterns = ReadPatternColumns(input_geometry, LoadPatterns(nodes.model))
+    if pattern_file is not None:
+        ReadPatternFile(pattern_file, patterns)
+    
+    return SolveCombinations(nodes,bars,patterns,method)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:02:55 2026
+
+Member stresses and utilizations from solved bar forces
+
+Forces are taken in kips, section properties in inches and material
+properties in ksi (as in the AISC shapes database and Material_Data.csv).
+Model lengths are converted to inches with length_to_inches, which defaults
+to 12 for coordinates given in feet.
+"""
+
+import csv
+import os
+import sys
+import numpy as np
+
+import Shape_Catalog as shapes
+
+MATERIAL_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  'Data_Files', 'Material_Data.csv')
+
+# AISC 360 resistance factors for tension yielding (D2) and compression (E1)
+PHI_TENSION = 0.9
+PHI_COMPRESSION = 0.9
+
+# Read the material table into {material name: {property: value}}
+def LoadMaterialData(path=MATERIAL_DATA_FILE):
+    materials = {}
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            name = row.pop('Material').strip()
+            materials[name] = {key: float(value) for key, value in row.items() if key != 'Units'}
+    return materials
+
+# Value of one material property for every bar, gathered through the
+# material codes of the model (NaN for unknown materials)
+def BarMaterialValues(model, materials, name):
+    values = np.array([materials.get(material.strip(), {}).get(name, float("NAN"))
+                       for material in model.material_names])
+    return values[model.material_code]
+
+# Flexural buckling stress Fcr of AISC 360 E3 for slenderness KL/r, with E
+# and Fy in ksi. Works elementwise on broadcastable arrays.
+def FlexuralBucklingStress(slenderness, E, Fy):
+    with np.errstate(divide='ignore'):
+        Fe = np.pi**2 * E / np.square(slenderness)
+    # inelastic buckling when KL/r <= 4.71 sqrt(E/Fy), i.e. Fy/Fe <= 2.25
+    ratio = Fy / Fe
+    return np.where(ratio <= 2.25, 0.658**ratio * Fy, 0.877 * Fe)
+
+# Section and material properties of every bar of a model
+class MemberProperties:
+
+    def __init__(self, model, catalog=None, materials=None, length_to_inches=12.0):
+        if catalog is None:
+            catalog = shapes.GetShapeCatalog()
+        if materials is None:
+            materials = LoadMaterialData()
+        self.section_rows = catalog.BarRows(model)
+        self.area = catalog.BarValues(model, 'A')
+        self.rx = catalog.BarValues(model, 'rx')
+        self.ry = catalog.BarValues(model, 'ry')
+        # single angles buckle about their principal z axis
+        self.r_min = np.fmin(np.fmin(self.rx, self.ry), catalog.BarValues(model, 'rz'))
+        self.E = BarMaterialValues(model, materials, 'E')
+        self.Fy = BarMaterialValues(model, materials, 'Fy')
+        self.length = model.BarGeometry()[1] * length_to_inches
+        self.slenderness = self.length / self.r_min
+
+        missing = np.flatnonzero(self.section_rows < 0)
+        if(len(missing) > 0):
+            sys.exit("Bars %s have sections that are not in the shape catalog" % missing[:10].tolist())
+
+# Axial stresses and utilizations for one or many load cases. Tension is
+# taken over the yield load Fy A and compression over the E3 flexural
+# buckling load Fcr A (both nominal, so a utilization up to the resistance
+# factor 0.9 is covered by the design strength).
+class MemberStresses:
+
+    def __init__(self, properties, forces, capacity=None):
+        # forces is (n_bars,) or (n_cases, n_bars); tension positive.
+        # capacity is a BucklingCapacity, by default with K = 1
+        if capacity is None:
+            capacity = BucklingCapacity(properties)
+        self.forces = np.asarray(forces, dtype=float)
+        self.stress = self.forces / properties.area
+        yield_load = properties.Fy * properties.area
+        self.tension_utilization = np.maximum(self.forces, 0) / yield_load
+        self.compression_utilization = np.maximum(-self.forces, 0) / capacity.nominal
+        self.utilization = np.maximum(self.tension_utilization, self.compression_utilization)
+
+    # Most highly utilized members, ranked. Returns a list of
+    # (bar index, load case, utilization); the load case is None for a
+    # single case.
+    def CriticalMembers(self, count=10):
+        return RankMembers(self.utilization, count)
+
+# Compression buckling capacities of every bar, which do not depend on the
+# forces and can be computed once for repeated checks
+class BucklingCapacity:
+
+    def __init__(self, properties, K=1.0):
+        # K is the effective length factor, a scalar or one per bar
+        self.slenderness = K * properties.slenderness
+        with np.errstate(divide='ignore'):
+            Fe = np.pi**2 * properties.E / np.square(self.slenderness)
+        self.euler_load = Fe * properties.area
+        self.Fcr = FlexuralBucklingStress(self.slenderness, properties.E, properties.Fy)
+        self.nominal = self.Fcr * properties.area
+        self.design = PHI_COMPRESSION * self.nominal
+
+# AISC E3 flexural buckling check of the compression in one or many load
+# cases, with the governing case and demand/capacity ratio of every bar
+class MemberBuckling:
+
+    def __init__(self, capacity, forces):
+        # forces is (n_bars,) or (n_cases, n_bars); tension positive
+        self.capacity = capacity
+        self.forces = np.asarray(forces, dtype=float)
+        self.compression = np.maximum(-self.forces, 0)
+        self.ratio = self.compression / capacity.design
+        if(self.ratio.ndim == 1):
+            self.governing_case = None
+            self.demand_capacity = self.ratio
+        else:
+            self.governing_case = np.argmax(self.ratio, axis=0)
+            self.demand_capacity = self.ratio[self.governing_case, np.arange(self.ratio.shape[1])]
+
+    # Bars whose governing compression exceeds the design capacity
+    @property
+    def failed_bars(self):
+        return np.flatnonzero(self.demand_capacity > 1)
+
+    # Bars in compression beyond the recommended slenderness KL/r of 200
+    @property
+    def slender_bars(self):
+        compressed = self.compression.max(axis=0) if self.compression.ndim == 2 else self.compression
+        return np.flatnonzero((compressed > 0) & (self.capacity.slenderness > 200))
+
+    # Most critical members, ranked. Returns a list of (bar index, load
+    # case, demand/capacity ratio); the load case is None for a single case.
+    def CriticalMembers(self, count=10):
+        return RankMembers(self.ratio, count)
+
+# Rank members by their worst value over all load cases. Returns a list of
+# (bar index, governing load case, value), largest first.
+def RankMembers(values, count=10):
+    values = np.asarray(values)
+    if(values.ndim == 1):
+        worst = values
+        cases = None
+    else:
+        cases = np.argmax(values, axis=0)
+        worst = values[cases, np.arange(values.shape[1])]
+    count = min(count, len(worst))
+    top = np.argpartition(-worst, count - 1)[:count] if count > 0 else np.zeros(0, dtype=np.int64)
+    top = top[np.argsort(-worst[top], kind='stable')]
+    return [(int(bar), None if cases is None else int(cases[bar]), float(worst[bar])) for bar in top]
+
+# Stresses of the current axial loads of a model (or of given forces), with
+# compression checked for buckling at effective length factor K
+def ComputeMemberStresses(model, forces=None, catalog=None, materials=None, length_to_inches=12.0, K=1.0):
+    properties = MemberProperties(model, catalog, materials, length_to_inches)
+    if forces is None:
+        forces = model.axial_load
+    return MemberStresses(properties, forces, BucklingCapacity(properties, K))
+
+# Buckling check of the current axial loads of a model (or of given forces)
+def ComputeMemberBuckling(model, forces=None, K=1.0, catalog=None, materials=None, length_to_inches=12.0):
+    capacity = BucklingCapacity(MemberProperties(model, catalog, materials, length_to_inches), K)
+    if forces is None:
+        forces = model.axial_load
+    return MemberBuckling(capacity, forces)
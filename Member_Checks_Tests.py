@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:37:09 2026
+
+Tests for member stresses, utilizations and checks
+"""
+
+import numpy as np
+import Main_for_Final_Testing as Main
+import Member_Checks as checks
+
+import unittest
+
+class TestMemberStresses(unittest.TestCase):
+
+    def test_Material_Data(self):
+        materials = checks.LoadMaterialData()
+
+        self.assertEqual(29000, materials['Steel ASTM A36']['E'])
+        self.assertEqual(36, materials['Steel ASTM A36']['Fy'])
+        self.assertEqual(50, materials['Steel ASTM A992']['Fy'])
+
+    def test_Stresses_Example_3_3(self):
+        nodes, bars = Main.MethodOfJoints("Example_3_3.csv")
+        stresses = checks.ComputeMemberStresses(nodes.model)
+
+        self.assertAlmostEqual(728.952/7.65, stresses.stress[1], 2)
+        self.assertAlmostEqual(-639.190/2.96, stresses.stress[7], 2)
+        self.assertAlmostEqual(728.952/7.65/36, stresses.tension_utilization[1], 4)
+        self.assertEqual(0, stresses.compression_utilization[1])
+        self.assertEqual(7, stresses.CriticalMembers(3)[0][0])
+
+        # compression is checked against buckling, not yield
+        capacity = checks.BucklingCapacity(checks.MemberProperties(nodes.model))
+        self.assertAlmostEqual(639.190/capacity.nominal[7], stresses.compression_utilization[7], 4)
+        self.assertGreater(stresses.compression_utilization[7], 639.190/2.96/36)
+
+    def test_Batched_Critical_Members(self):
+        nodes, bars = Main.MethodOfJoints("Example_3_3.csv")
+        forces = np.stack([nodes.model.axial_load, -2*nodes.model.axial_load])
+        stresses = checks.ComputeMemberStresses(nodes.model, forces)
+
+        self.assertEqual((2, 9), stresses.utilization.shape)
+        bar, case, utilization = stresses.CriticalMembers(1)[0]
+        # the reversed tension in bar 8 buckles the slender W8X10
+        capacity = checks.BucklingCapacity(checks.MemberProperties(nodes.model))
+        self.assertEqual((8, 1), (bar, case))
+        self.assertAlmostEqual(2*521.896/capacity.nominal[8], utilization, 3)
+
+class TestMemberBuckling(unittest.TestCase):
+
+    def test_Buckling_Example_3_3(self):
+        nodes, bars = Main.MethodOfJoints("Example_3_3.csv")
+        buckling = checks.ComputeMemberBuckling(nodes.model)
+        properties = checks.MemberProperties(nodes.model)
+
+        # bar 7 by hand: Fe = pi^2 E / (L/r)^2, then AISC E3
+        slenderness = properties.length[7] / properties.r_min[7]
+        Fe = np.pi**2 * 29000 / slenderness**2
+        Fcr = 0.658**(36/Fe) * 36 if 36/Fe <= 2.25 else 0.877*Fe
+        self.assertAlmostEqual(Fe * properties.area[7], buckling.capacity.euler_load[7], 6)
+        self.assertAlmostEqual(639.190 / (0.9*Fcr*properties.area[7]), buckling.demand_capacity[7], 3)
+
+        # bars in tension have no buckling demand
+        self.assertEqual(0, buckling.demand_capacity[1])
+        self.assertIsNone(buckling.governing_case)
+
+    def test_Governing_Load_Case(self):
+        nodes, bars = Main.MethodOfJoints("Example_3_3.csv")
+        forces = nodes.model.axial_load
+        capacity = checks.BucklingCapacity(checks.MemberProperties(nodes.model), K=0.8)
+        buckling = checks.MemberBuckling(capacity, np.stack([forces, -3*forces, 0*forces]))
+
+        compressed = forces < 0
+        np.testing.assert_array_equal(np.where(compressed, 0, 1), buckling.governing_case)
+        np.testing.assert_allclose(np.abs(np.where(compressed, forces, 3*forces)) / capacity.design,
+                                   buckling.demand_capacity)
+        bar, case, ratio = buckling.CriticalMembers(1)[0]
+        self.assertEqual(ratio, buckling.demand_capacity.max())
+        self.assertEqual(list(np.flatnonzero(buckling.demand_capacity > 1)), list(buckling.failed_bars))
+
+if __name__ == '__main__':
+    unittest.main()
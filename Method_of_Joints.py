@@ -15,6 +15,7 @@ Updated to fix single- and two-bar force computations
 """
 
 import sys
+from collections import deque
 import numpy as np
 import Geometry_Operations as geom
 
@@ -28,41 +29,33 @@ def UnknownBars(node):
 
 # Determine if a node is solvable
 def NodeIsViable(node):
-    unknown_bars = UnknownBars(node)
-    if len(unknown_bars) == 0:
-        return False
-    elif len(unknown_bars) == 1:
+    return NodeIsViableWithUnknowns(node, len(UnknownBars(node)))
+
+# Determine if a node is solvable given its number of unknown bars
+def NodeIsViableWithUnknowns(node, n_unknown):
+    if n_unknown == 1:
         return True
-    elif len(unknown_bars) == 2:
+    elif n_unknown == 2:
         # Node is solvable if it has at least one known reaction or one bar already computed
         has_known_force = False
         if (0 in node.ConstraintType() and not np.isnan(node.xforce_reaction)) or \
            (1 in node.ConstraintType() and not np.isnan(node.yforce_reaction)):
             has_known_force = True
-        connected_computed = any(bar.is_computed for bar in node.bars if bar not in unknown_bars)
+        connected_computed = len(node.bars) > n_unknown
         return has_known_force or connected_computed
     else:
         return False
 
 # Compute unknown force for a single bar at a node
 def SumOfForcesInLocalX(node, bar):
-    vec = geom.BarNodeToVector(node, bar)
-    length = np.linalg.norm(vec)
-    if length == 0:
-        sys.exit("Zero-length bar detected")
-    
-    cos_theta = vec[0] / length
-    sin_theta = vec[1] / length
+    cos_theta, sin_theta = geom.BarNodeToUnitVector(node, bar)
 
     sum_fx = node.xforce_external + (node.xforce_reaction if not np.isnan(node.xforce_reaction) else 0)
     sum_fy = node.yforce_external + (node.yforce_reaction if not np.isnan(node.yforce_reaction) else 0)
 
     for other_bar in node.bars:
         if other_bar.is_computed and other_bar != bar:
-            vec_o = geom.BarNodeToVector(node, other_bar)
-            length_o = np.linalg.norm(vec_o)
-            cos_o = vec_o[0] / length_o
-            sin_o = vec_o[1] / length_o
+            cos_o, sin_o = geom.BarNodeToUnitVector(node, other_bar)
             sum_fx += other_bar.axial_load * cos_o
             sum_fy += other_bar.axial_load * sin_o
 
@@ -76,24 +69,16 @@ def SumOfForcesInLocalY(node, unknown_bars):
 
     bar1, bar2 = unknown_bars
 
-    vec1 = geom.BarNodeToVector(node, bar1)
-    vec2 = geom.BarNodeToVector(node, bar2)
-
     # Cosine and sine along global x and y
-    cos1 = vec1[0] / np.linalg.norm(vec1)
-    sin1 = vec1[1] / np.linalg.norm(vec1)
-    cos2 = vec2[0] / np.linalg.norm(vec2)
-    sin2 = vec2[1] / np.linalg.norm(vec2)
+    cos1, sin1 = geom.BarNodeToUnitVector(node, bar1)
+    cos2, sin2 = geom.BarNodeToUnitVector(node, bar2)
 
     sum_fx = node.xforce_external + (node.xforce_reaction if not np.isnan(node.xforce_reaction) else 0)
     sum_fy = node.yforce_external + (node.yforce_reaction if not np.isnan(node.yforce_reaction) else 0)
 
     for other_bar in node.bars:
         if other_bar.is_computed:
-            vec_o = geom.BarNodeToVector(node, other_bar)
-            length_o = np.linalg.norm(vec_o)
-            cos_o = vec_o[0] / length_o
-            sin_o = vec_o[1] / length_o
+            cos_o, sin_o = geom.BarNodeToUnitVector(node, other_bar)
             sum_fx += other_bar.axial_load * cos_o
             sum_fy += other_bar.axial_load * sin_o
 
@@ -111,26 +96,54 @@ def SumOfForcesInLocalY(node, unknown_bars):
     bar1.is_computed = True
     bar2.is_computed = True
 
-# Main iterative solver
-def IterateUsingMethodOfJoints(nodes, bars):
-    max_iterations = 5000
-    iteration = 0
-
-    while any(not bar.is_computed for bar in bars):
-        iteration += 1
-        if iteration > max_iterations:
-            sys.exit("Exceeded maximum iterations, possible truss inconsistency")
-
-        progress_made = False
-
-        for node in nodes:
-            if NodeIsViable(node):
-                unknown_bars = UnknownBars(node)
-                if len(unknown_bars) == 1:
-                    SumOfForcesInLocalX(node, unknown_bars[0])
-                elif len(unknown_bars) == 2:
-                    SumOfForcesInLocalY(node, unknown_bars)
-                progress_made = True
-
-        if not progress_made:
-            sys.exit("No solvable nodes found this iteration. Check truss geometry or constraints.")
\ No newline at end of file
+# Main solver: visit joints from a ready queue. Every node keeps a count of
+# its unknown bars, and solving a bar only updates (and possibly enqueues)
+# the two nodes at its ends, so each joint is revisited O(degree) times.
+# Queue pops, solved nodes and 2x2 linear solves are added to the counters
+# of stats when given.
+def IterateUsingMethodOfJoints(nodes, bars, stats=None):
+    n_unknown = {}
+    ready = deque()
+    for node in nodes:
+        n_unknown[id(node)] = len(UnknownBars(node))
+        if NodeIsViableWithUnknowns(node, n_unknown[id(node)]):
+            ready.append(node)
+
+    n_remaining = sum(1 for bar in bars if not bar.is_computed)
+    n_pops = 0
+    n_visits = 0
+    n_solves = 0
+
+    while ready and n_remaining > 0:
+        node = ready.popleft()
+        n_pops += 1
+        # a node may be queued more than once; skip stale entries
+        if not NodeIsViableWithUnknowns(node, n_unknown[id(node)]):
+            continue
+
+        n_visits += 1
+        unknown_bars = UnknownBars(node)
+        if len(unknown_bars) == 1:
+            SumOfForcesInLocalX(node, unknown_bars[0])
+        else:
+            SumOfForcesInLocalY(node, unknown_bars)
+            n_solves += 1
+
+        # update the unknown counters of the ends of every newly solved bar
+        for bar in unknown_bars:
+            n_remaining -= 1
+            for end_node in (bar.init_node, bar.end_node):
+                n_unknown[id(end_node)] -= 1
+                if end_node is not node and \
+                   NodeIsViableWithUnknowns(end_node, n_unknown[id(end_node)]):
+                    ready.append(end_node)
+
+    if stats is not None:
+        stats.Count('queue_pops', n_pops)
+        stats.Count('node_visits', n_visits)
+        stats.Count('linalg_solve_calls', n_solves)
+
+    if n_remaining > 0:
+        unresolved = [node.idx for node in nodes if n_unknown[id(node)] > 0]
+        sys.exit("No solvable nodes remain with %d bars unresolved. Check truss geometry or constraints at nodes %s"
+                 % (n_remaining, unresolved))
@@ -168,6 +168,16 @@ class TestStructureOperations(unittest.TestCase):
             bar = bars[i]
             self.assertAlmostEqual(bar_forces[i], bar.axial_load, decimal_place)
 
+    def test_MethodOfJoints_Reports_Unresolved_Nodes(self):
+        # without reactions no joint of Example 3.3 can be started
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+
+        with self.assertRaises(SystemExit) as context:
+            moj.IterateUsingMethodOfJoints(nodes, bars)
+
+        self.assertIn("[0, 1, 2, 3, 4, 5]", str(context.exception))
+        self.assertFalse(any(bar.is_computed for bar in bars))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:37:05 2026
+
+Monte Carlo bar force statistics under random loads
+
+    python Monte_Carlo.py Example_3_3.csv --samples 1000000 --cov 0.2 --workers 4
+
+Random loads are a sum of load patterns (fixed nodal load arrays) scaled by
+random factors, e.g. snow on the top chord with a Gumbel factor plus
+equipment at one node with a lognormal one. The truss is linear, so every
+pattern is solved once, in one batch, and the bar forces of a chunk of
+samples are a (samples x patterns) by (patterns x bars) product. Per-bar
+statistics are accumulated chunk by chunk, so the full (samples x bars)
+array never exists: running means and variances (merged with Chan's
+parallel form of Welford's update), minima and maxima, exceedance counts
+and a fixed-bin histogram per bar from which quantiles are read.
+
+Every chunk draws from its own generator spawned from one SeedSequence, so
+results only depend on the seed and chunk size, not on the worker count.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+
+from ImportCSVData import LoadData
+from Truss_Solver import TrussSolver
+
+# Default number of (sample, bar) force values per chunk
+MONTE_CARLO_CHUNK_VALUES = 1 << 21
+HISTOGRAM_BINS = 128
+
+DISTRIBUTIONS = ('constant', 'normal', 'lognormal', 'gumbel', 'uniform')
+
+# A nodal load array scaled by a random factor. Distribution parameters are
+# the mean and standard deviation of the factor (low and high for uniform).
+class LoadPattern:
+
+    def __init__(self, name, loads, distribution='constant', mean=1.0, std=0.0, low=0.0, high=1.0):
+        if(distribution not in DISTRIBUTIONS):
+            sys.exit("Unknown distribution %s, expected one of %s" % (distribution, list(DISTRIBUTIONS)))
+        self.name = name
+        self.loads = np.asarray(loads, dtype=float)
+        self.distribution = distribution
+        self.mean = mean
+        self.std = std
+        self.low = low
+        self.high = high
+
+    # n random factors
+    def Sample(self, rng, n):
+        if(self.distribution == 'constant'):
+            return np.full(n, float(self.mean))
+        elif(self.distribution == 'normal'):
+            return rng.normal(self.mean, self.std, n)
+        elif(self.distribution == 'lognormal'):
+            sigma2 = np.log1p((self.std / self.mean)**2)
+            return rng.lognormal(np.log(self.mean) - sigma2/2, np.sqrt(sigma2), n)
+        elif(self.distribution == 'gumbel'):
+            scale = self.std * np.sqrt(6) / np.pi
+            return rng.gumbel(self.mean - np.euler_gamma*scale, scale, n)
+        return rng.uniform(self.low, self.high, n)
+
+# Random factors of every pattern as an (n, n_patterns) array
+def SampleFactors(patterns, rng, n):
+    return np.column_stack([pattern.Sample(rng, n) for pattern in patterns])
+
+# Streaming per-bar statistics of bar force samples. Histograms share fixed
+# bin edges per bar (plus an underflow and an overflow bin), so statistics
+# of separate chunks merge exactly.
+class BarStatistics:
+
+    def __init__(self, lower_edges, upper_edges, bins=HISTOGRAM_BINS, upper_limits=None, lower_limits=None):
+        n_bars = len(lower_edges)
+        self.count = 0
+        self.mean = np.zeros(n_bars)
+        self.M2 = np.zeros(n_bars)
+        self.minimum = np.full(n_bars, np.inf)
+        self.maximum = np.full(n_bars, -np.inf)
+        self.lower_edges = np.asarray(lower_edges, dtype=float)
+        self.upper_edges = np.asarray(upper_edges, dtype=float)
+        self.bins = bins
+        self.histogram = np.zeros((n_bars, bins + 2), dtype=np.int64)
+        # bar forces beyond upper_limits or below lower_limits are exceedances
+        self.upper_limits = upper_limits
+        self.lower_limits = lower_limits
+        self.exceedances = np.zeros(n_bars, dtype=np.int64)
+
+    @property
+    def n_bars(self):
+        return len(self.mean)
+
+    # Histogram edges and limits, everything needed to make compatible
+    # statistics
+    def Settings(self):
+        return (self.lower_edges, self.upper_edges, self.bins, self.upper_limits, self.lower_limits)
+
+    # Empty statistics with the same histogram edges and limits
+    def Empty(self):
+        return BarStatistics(*self.Settings())
+
+    # Add a (n_samples, n_bars) chunk of bar forces
+    def Add(self, forces):
+        n = len(forces)
+        if(n == 0):
+            return
+        chunk = self.Empty()
+        chunk.count = n
+        chunk.mean = forces.mean(axis=0)
+        chunk.M2 = np.square(forces - chunk.mean).sum(axis=0)
+        chunk.minimum = forces.min(axis=0)
+        chunk.maximum = forces.max(axis=0)
+
+        # bin of every value, in place; bars with a zero histogram range put
+        # everything in their first bin
+        span = self.upper_edges - self.lower_edges
+        scale = np.divide(self.bins, span, out=np.zeros(self.n_bars), where=span > 0)
+        position = forces - self.lower_edges
+        position *= scale
+        np.floor(position, out=position)
+        np.clip(position, -1, self.bins, out=position)
+        flat = position.astype(np.int64)
+        flat += 1 + (self.bins + 2)*np.arange(self.n_bars)
+        chunk.histogram = np.bincount(flat.ravel(), minlength=self.n_bars*(self.bins + 2)).reshape(self.n_bars, -1)
+
+        exceeded = np.zeros(forces.shape, dtype=bool)
+        if self.upper_limits is not None:
+            exceeded |= forces > self.upper_limits
+        if self.lower_limits is not None:
+            exceeded |= forces < self.lower_limits
+        chunk.exceedances = np.count_nonzero(exceeded, axis=0)
+        self.Merge(chunk)
+
+    # Combine the statistics of another set of samples into these
+    def Merge(self, other):
+        if(other.count == 0):
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / count)
+        self.M2 = self.M2 + other.M2 + np.square(delta) * (self.count * other.count / count)
+        self.count = count
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        self.histogram += other.histogram
+        self.exceedances += other.exceedances
+
+    @property
+    def variance(self):
+        return self.M2 / max(self.count - 1, 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    @property
+    def exceedance_probability(self):
+        return self.exceedances / max(self.count, 1)
+
+    # Quantiles of every bar from the histograms, interpolated within bins.
+    # Quantiles that fall in the underflow or overflow bin lie outside the
+    # histogram edges, where nothing is known about the distribution, and are
+    # NaN (unresolved); q of 0 and 1 are the observed extremes.
+    # Returns (n_bars,) for a scalar q and (len(q), n_bars) otherwise.
+    def Quantile(self, q):
+        q = np.asarray(q, dtype=float)
+        edges = self.lower_edges[:, None] + np.outer(self.upper_edges - self.lower_edges,
+                                                     np.arange(self.bins + 1) / self.bins)
+        edges = np.column_stack([np.minimum(self.minimum, self.lower_edges), edges,
+                                 np.maximum(self.maximum, self.upper_edges)])
+        cumulative = np.cumsum(self.histogram, axis=1)
+        values = np.empty((q.size, self.n_bars))
+        for k, fraction in enumerate(q.ravel()):
+            target = fraction * self.count
+            bin_idx = np.minimum((cumulative < target).sum(axis=1), self.bins + 1)
+            rows = np.arange(self.n_bars)
+            before = np.where(bin_idx > 0, cumulative[rows, bin_idx - 1], 0)
+            in_bin = self.histogram[rows, bin_idx]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = np.where(in_bin > 0, (target - before) / in_bin, 0.0)
+            low, high = edges[rows, bin_idx], edges[rows, bin_idx + 1]
+            values[k] = np.clip(low + t*(high - low), self.minimum, self.maximum)
+            unresolved = (in_bin > 0) & ((bin_idx == 0) | (bin_idx == self.bins + 1))
+            values[k, unresolved] = float("NAN")
+            if(fraction <= 0):
+                values[k] = self.minimum
+            elif(fraction >= 1):
+                values[k] = self.maximum
+        return values[0] if q.ndim == 0 else values
+
+# Bar forces of the patterns as an (n_patterns, n_bars) array
+def PatternForces(solver, patterns):
+    loads = np.stack([pattern.loads for pattern in patterns])
+    return solver.SolveLoadCases(loads)[0]
+
+# Statistics of one chunk of samples
+def SampleChunk(patterns, pattern_forces, settings, seed, n):
+    rng = np.random.default_rng(seed)
+    statistics = BarStatistics(*settings)
+    statistics.Add(SampleFactors(patterns, rng, n) @ pattern_forces)
+    return statistics
+
+# Run n_samples samples of random loads on a solved truss. chunk_size
+# defaults to about MONTE_CARLO_CHUNK_VALUES force values per chunk. The histogram
+# edges of every bar span a pilot chunk widened by half its range on both
+# sides; quantiles beyond them are unresolved (NaN). Chunks run in this process when workers is 1 and on a process
+# pool otherwise; results are identical either way.
+def RunMonteCarlo(solver, patterns, n_samples, chunk_size=None, seed=None,
+                  workers=1, bins=HISTOGRAM_BINS, upper_limits=None, lower_limits=None):
+    pattern_forces = PatternForces(solver, patterns)
+    if chunk_size is None:
+        chunk_size = max(1, MONTE_CARLO_CHUNK_VALUES // max(pattern_forces.shape[1], 1))
+    seed_sequence = np.random.SeedSequence(seed)
+    n_chunks = -(-n_samples // chunk_size)
+    chunk_seeds = seed_sequence.spawn(n_chunks + 1)
+    sizes = [min(chunk_size, n_samples - k*chunk_size) for k in range(n_chunks)]
+
+    pilot = SampleFactors(patterns, np.random.default_rng(chunk_seeds[-1]), min(chunk_size, 1000)) @ pattern_forces
+    low, high = pilot.min(axis=0), pilot.max(axis=0)
+    margin = np.maximum(high - low, 1e-12 * np.maximum(np.abs(low), 1)) / 2
+    statistics = BarStatistics(low - margin, high + margin, bins, upper_limits, lower_limits)
+
+    if(workers == 1):
+        for seed_k, n in zip(chunk_seeds, sizes):
+            statistics.Merge(SampleChunk(patterns, pattern_forces, statistics.Settings(), seed_k, n))
+        return statistics
+
+    if(workers is None):
+        workers = os.cpu_count() or 1
+    # merge in chunk order so that the floating point sums do not depend on
+    # which worker finishes first
+    results = [None] * n_chunks
+    merged = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        next_chunk = 0
+        while next_chunk < n_chunks or pending:
+            while next_chunk < n_chunks and len(pending) < 2*workers:
+                future = pool.submit(SampleChunk, patterns, pattern_forces, statistics.Settings(),
+                                     chunk_seeds[next_chunk], sizes[next_chunk])
+                pending[future] = next_chunk
+                next_chunk += 1
+            done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+            while merged < n_chunks and results[merged] is not None:
+                statistics.Merge(results[merged])
+                results[merged] = None
+                merged += 1
+    return statistics
+
+def Main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo bar force statistics under random loads")
+    parser.add_argument('model', help="truss CSV file whose loads are scaled by a random factor")
+    parser.add_argument('--samples', type=int, default=100000)
+    parser.add_argument('--distribution', default='lognormal', choices=DISTRIBUTIONS[1:])
+    parser.add_argument('--cov', type=float, default=0.2, help="coefficient of variation of the load factor")
+    parser.add_argument('--chunk-size', type=int, default=None, help="samples per chunk")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (1 runs in process)")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--count', type=int, default=10, help="bars to report")
+    args = parser.parse_args(argv)
+
+    nodes, bars = LoadData(args.model)
+    model = nodes.model
+    pattern = LoadPattern('file', model.force_external, args.distribution, 1.0, args.cov,
+                          1 - np.sqrt(3)*args.cov, 1 + np.sqrt(3)*args.cov)
+    statistics = RunMonteCarlo(TrussSolver(nodes, bars), [pattern], args.samples, args.chunk_size,
+                               args.seed, args.workers)
+    q05, q50, q95 = statistics.Quantile([0.05, 0.5, 0.95])
+    spread = np.argsort(-statistics.std, kind='stable')[:args.count]
+    print("%6s %12s %12s %12s %12s %12s" % ('bar', 'mean', 'std', '5%', '50%', '95%'))
+    for bar in spread.tolist():
+        print("%6d %12.4f %12.4f %12.4f %12.4f %12.4f" % (bar, statistics.mean[bar], statistics.std[bar],
+                                                          q05[bar], q50[bar], q95[bar]))
+
+if __name__ == '__main__':
+    Main()
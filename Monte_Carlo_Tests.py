@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:18:44 2026
+
+Tests for Monte Carlo load sampling and streaming bar statistics
+"""
+
+import numpy as np
+import Main_for_Final_Testing as Main
+import Monte_Carlo as mc
+from Truss_Solver import TrussSolver
+
+import unittest
+
+class TestBarStatistics(unittest.TestCase):
+
+    def test_Streaming_Matches_Full_Array(self):
+        rng = np.random.default_rng(5)
+        forces = rng.normal([0, 10, -5], [1, 2, 0.5], (20000, 3))
+        statistics = mc.BarStatistics([-6, 0, -9], [6, 20, -1], bins=200,
+                                      upper_limits=np.array([2.0, 14.0, np.inf]))
+        for start in range(0, len(forces), 3000):
+            statistics.Add(forces[start:start + 3000])
+
+        np.testing.assert_allclose(forces.mean(axis=0), statistics.mean)
+        np.testing.assert_allclose(forces.var(axis=0, ddof=1), statistics.variance)
+        np.testing.assert_array_equal(forces.min(axis=0), statistics.minimum)
+        np.testing.assert_array_equal(forces.max(axis=0), statistics.maximum)
+        np.testing.assert_allclose(np.mean(forces > [2.0, 14.0, np.inf], axis=0),
+                                   statistics.exceedance_probability)
+        # quantiles within a bin width of the exact ones
+        q = [0.01, 0.5, 0.99]
+        np.testing.assert_allclose(np.quantile(forces, q, axis=0), statistics.Quantile(q), atol=0.1)
+
+    def test_Tail_Quantiles_Beyond_Edges(self):
+        rng = np.random.default_rng(8)
+        forces = rng.normal(0, 1, (10000, 1))
+        statistics = mc.BarStatistics([-1.5], [1.5], bins=60)
+        statistics.Add(forces)
+
+        # about 7% of the samples lie on either side of the edges
+        median, lower, upper = statistics.Quantile([0.5, 0.01, 0.99])
+        self.assertAlmostEqual(np.quantile(forces, 0.5), median[0], delta=0.05)
+        self.assertTrue(np.isnan(lower[0]))
+        self.assertTrue(np.isnan(upper[0]))
+        self.assertEqual(forces.min(), statistics.Quantile(0.0)[0])
+        self.assertEqual(forces.max(), statistics.Quantile(1.0)[0])
+
+    def test_Patterns_On_Example_3_3(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        solver = TrussSolver(nodes, bars)
+        loads = nodes.model.force_external
+        patterns = [mc.LoadPattern('dead', loads),
+                    mc.LoadPattern('snow', loads, 'gumbel', 0.5, 0.1)]
+        statistics = mc.RunMonteCarlo(solver, patterns, 50000, chunk_size=7000, seed=11)
+
+        # bar forces are (1 + snow factor) times those of the file loads
+        base = solver.SolveLoadCases(loads)[0][0]
+        self.assertEqual(50000, statistics.count)
+        np.testing.assert_allclose(1.5*base, statistics.mean, rtol=2e-3, atol=1e-9)
+        np.testing.assert_allclose(0.1*np.abs(base), statistics.std, rtol=3e-2, atol=1e-9)
+
+    def test_Seeded_Runs_Do_Not_Depend_On_Workers(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        solver = TrussSolver(nodes, bars)
+        patterns = [mc.LoadPattern('equipment', nodes.model.force_external, 'lognormal', 1.0, 0.3)]
+        serial = mc.RunMonteCarlo(solver, patterns, 20000, chunk_size=2500, seed=3,
+                                  upper_limits=np.full(9, 800.0))
+        parallel = mc.RunMonteCarlo(solver, patterns, 20000, chunk_size=2500, seed=3, workers=2,
+                                    upper_limits=np.full(9, 800.0))
+        np.testing.assert_array_equal(serial.mean, parallel.mean)
+        np.testing.assert_array_equal(serial.histogram, parallel.histogram)
+        np.testing.assert_array_equal(serial.exceedances, parallel.exceedances)
+        self.assertGreater(serial.exceedances.sum(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
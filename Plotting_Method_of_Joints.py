@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 13:22:07 2026
+
+Headless plots of a truss, its indices and its solved bar values
+
+All bars are drawn as one line collection from the node coordinate and
+connectivity arrays, and the figure is rendered off screen with the Agg
+canvas to a PNG or SVG file (by its extension), so plotting never opens a
+window or waits for one. plot_type is one of
+
+    index        node and bar indices
+    force        axial load (tension positive)
+    stress       axial stress, axial load over section area
+    utilization  axial load over the yield load in tension and the
+                 flexural buckling load in compression
+
+Text labels are the slow part of a plot, so only the bars and nodes asked
+for are labeled, or all of them for small trusses.
+"""
+
+import sys
+import numpy as np
+
+try:
+    from matplotlib.figure import Figure
+    from matplotlib.collections import LineCollection
+    from matplotlib.colors import Normalize
+except ImportError:
+    Figure = None
+
+from Classes import ModelOf
+import Member_Checks as checks
+
+PLOT_TYPES = ('index', 'force', 'stress', 'utilization')
+
+# Largest truss labeled in full when no labels are given, and the largest
+# number of labels drawn at all
+PLOT_LABEL_LIMIT = 200
+PLOT_MAX_LABELS = 1000
+
+# Above this many bars the line collection is drawn without antialiasing and
+# rasterized inside vector output, which would otherwise hold one path per
+# bar
+PLOT_RASTER_BARS = 20000
+
+# Value and color bar label of the bars for a plot type (None for index)
+def BarValues(model, plot_type):
+    if(plot_type == 'index'):
+        return None, None
+    if not np.all(model.is_computed):
+        sys.exit("A %s plot needs the solved axial load of every bar" % plot_type)
+    if(plot_type == 'force'):
+        return model.axial_load.copy(), "Axial load (kip)"
+    stresses = checks.ComputeMemberStresses(model)
+    if(plot_type == 'stress'):
+        return stresses.stress, "Axial stress (ksi)"
+    return stresses.utilization, "Utilization"
+
+# Rows to label from the given ones, or all of n when n is small
+def LabelRows(n, rows):
+    if rows is None:
+        return np.arange(n) if n <= PLOT_LABEL_LIMIT else np.zeros(0, dtype=np.int64)
+    rows = np.unique(np.asarray(rows, dtype=np.int64))
+    return rows[(rows >= 0) & (rows < n)][:PLOT_MAX_LABELS]
+
+# Draw a truss model into a new figure and save it when output is given.
+# values overrides the bar values of the plot type, label_bars and
+# label_nodes are the bars and node rows to label. Returns the figure.
+def PlotModel(model, plot_type='index', output=None, values=None, label_bars=None, label_nodes=None,
+              size=(8, 6), dpi=150, title=None):
+    if Figure is None:
+        print("matplotlib is not installed, the %s plot is skipped" % plot_type)
+        return None
+    if(plot_type not in PLOT_TYPES):
+        sys.exit("Unknown plot type %s, expected one of %s" % (plot_type, list(PLOT_TYPES)))
+    if values is None:
+        values, value_label = BarValues(model, plot_type)
+    else:
+        values = np.asarray(values, dtype=float)
+        value_label = plot_type.capitalize()
+
+    fig = Figure(figsize=size, dpi=dpi)
+    ax = fig.add_subplot()
+    ax.set_aspect('equal')
+    if title is not None:
+        ax.set_title(title)
+
+    # every bar in one collection
+    xy = model.xy
+    drawn = np.all(model.conn >= 0, axis=1)
+    conn = model.conn[drawn].astype(np.int64)
+    many = model.n_bars > PLOT_RASTER_BARS
+    bars = LineCollection(xy[conn], linewidths=0.5 if many else 1.5, antialiaseds=not many)
+    if values is None:
+        bars.set_color('black')
+    else:
+        values = values[drawn]
+        finite = values[np.isfinite(values)]
+        if(plot_type == 'utilization'):
+            norm = Normalize(0, max(1.0, finite.max() if len(finite) else 1.0))
+            bars.set_cmap('plasma')
+        else:
+            # tension red, compression blue, centered on zero
+            extent = np.abs(finite).max() if len(finite) else 0.0
+            extent = extent if extent > 0 else 1.0
+            norm = Normalize(-extent, extent)
+            bars.set_cmap('coolwarm')
+        bars.set_array(values)
+        bars.set_norm(norm)
+        fig.colorbar(bars, ax=ax, label=value_label, shrink=0.8)
+    if many:
+        bars.set_rasterized(True)
+    ax.add_collection(bars)
+
+    # supports, and the nodes of smaller trusses, as two scatter plots
+    supported = np.any(model.SupportMask(), axis=1)
+    if not many:
+        ax.scatter(xy[:, 0], xy[:, 1], s=6, c='black', zorder=3)
+    ax.scatter(xy[supported, 0], xy[supported, 1], s=60, marker='^', c='green', zorder=4)
+
+    bar_rows = LabelRows(model.n_bars, label_bars)
+    bar_rows = bar_rows[drawn[bar_rows]]
+    node_rows = LabelRows(model.n_nodes, label_nodes)
+    if(len(bar_rows) > 0):
+        middle = xy[model.conn[bar_rows]].mean(axis=1)
+        if(plot_type == 'index' or values is None):
+            texts = bar_rows.tolist()
+        else:
+            full = np.full(model.n_bars, float("NAN"))
+            full[drawn] = values
+            # round-off residue of zero-force bars shows as 0
+            largest = np.abs(values[np.isfinite(values)]).max(initial=0.0)
+            if(largest > 0):
+                full[np.abs(full) <= 1e-9 * largest] = 0.0
+            texts = ["%.3g" % value for value in full[bar_rows]]
+        for (x, y), text in zip(middle, texts):
+            ax.text(x, y, text, fontsize=7, color='blue', ha='center', va='center',
+                    bbox=dict(boxstyle='round,pad=0.1', fc='white', ec='none', alpha=0.7))
+    if(plot_type == 'index' and len(node_rows) > 0):
+        for row, (x, y) in zip(node_rows.tolist(), xy[node_rows]):
+            ax.annotate(str(model.node_list_idx[row]), (x, y), xytext=(3, 3), textcoords='offset points',
+                        fontsize=7, color='red')
+
+    ax.autoscale_view()
+    ax.margins(0.05)
+    if output is not None:
+        fig.savefig(output, dpi=dpi)
+    return fig
+
+# Plot the structure of a truss as node and bar views, writing
+# Truss_<plot_type>.png unless another output file is given
+def PlotStructureData(nodes, bars, plot_type, output=None, **options):
+    model = ModelOf(nodes, bars)
+    if(model is None):
+        sys.exit("Plotting needs the nodes and bars of a loaded truss model")
+    if output is None:
+        output = "Truss_%s.png" % plot_type
+    return PlotModel(model, plot_type, output, **options)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 13:58:44 2026
+
+Tests for the headless truss plots
+"""
+
+import os
+import shutil
+import tempfile
+import warnings
+import numpy as np
+import Main_for_Final_Testing as Main
+import Plotting_Method_of_Joints as plotting
+import Truss_Generator as generator
+from Truss_Solver import TrussSolver
+
+import unittest
+
+@unittest.skipIf(plotting.Figure is None, "matplotlib is not installed")
+class TestPlotting(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.nodes, self.bars = Main.LoadCSV("Example_3_3.csv")
+        TrussSolver(self.nodes, self.bars).Solve()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_Plot_Types(self):
+        for plot_type in plotting.PLOT_TYPES:
+            path = os.path.join(self.folder, "%s.png" % plot_type)
+            fig = plotting.PlotStructureData(self.nodes, self.bars, plot_type, path)
+            self.assertTrue(os.path.getsize(path) > 0)
+            ax = fig.axes[0]
+            # one collection holds every bar
+            self.assertEqual(9, len(ax.collections[0].get_segments()))
+            if(plot_type == 'index'):
+                self.assertEqual(9 + 6, len(ax.texts))
+                self.assertEqual(1, len(fig.axes))
+            else:
+                self.assertEqual(9, len(ax.texts))
+                self.assertEqual(2, len(fig.axes))
+
+        fig = plotting.PlotStructureData(self.nodes, self.bars, 'force', os.path.join(self.folder, "force.svg"))
+        np.testing.assert_allclose(self.nodes.model.axial_load, fig.axes[0].collections[0].get_array())
+        self.assertEqual("-693", fig.axes[0].texts[0].get_text())
+        with open(os.path.join(self.folder, "force.svg")) as f:
+            self.assertTrue("<svg" in f.read())
+
+    def test_Selective_Labels(self):
+        fig = plotting.PlotModel(self.nodes.model, 'index', label_bars=[8, 2, 2, 40], label_nodes=[])
+        self.assertEqual(["2", "8"], [text.get_text() for text in fig.axes[0].texts])
+
+        # an unsolved truss has no forces to plot
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        with self.assertRaises(SystemExit):
+            plotting.PlotStructureData(nodes, bars, 'force', os.path.join(self.folder, "force.png"))
+        with self.assertRaises(SystemExit):
+            plotting.PlotStructureData(nodes, bars, 'moment', os.path.join(self.folder, "moment.png"))
+
+    def test_Zero_And_Missing_Values(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            fig = plotting.PlotModel(self.nodes.model, 'force', values=np.zeros(9))
+            self.assertEqual(["0"]*9, [text.get_text() for text in fig.axes[0].texts])
+            fig = plotting.PlotModel(self.nodes.model, 'force', values=np.full(9, float("NAN")))
+            self.assertEqual(["nan"]*9, [text.get_text() for text in fig.axes[0].texts])
+
+    def test_Large_Truss(self):
+        model = generator.GenerateTruss('pratt', 5000)
+        TrussSolver(model.nodes, model.bars).Solve()
+        path = os.path.join(self.folder, "large.png")
+        fig = plotting.PlotModel(model, 'force', path, label_bars=[0])
+        self.assertEqual(model.n_bars, len(fig.axes[0].collections[0].get_segments()))
+        self.assertEqual(1, len(fig.axes[0].texts))
+
+if __name__ == '__main__':
+    unittest.main()
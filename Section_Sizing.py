@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 08:14:36 2026
+
+Lightest adequate section of every bar from a shape type of the AISC catalog
+
+A bar is adequate when its design tensile strength (yielding, AISC D2) and
+design compressive strength (flexural buckling, AISC E3) cover the largest
+tension and compression it carries, and its slenderness KL/r is within the
+limits. The shapes of a type are sorted by weight once, the checks run as
+(bars x shapes) masks in chunks, and the lightest adequate shape is the
+first True column of every row.
+"""
+
+import sys
+import numpy as np
+
+from Classes import ModelOf
+from Truss_Solver import TrussSolver
+import Member_Checks as checks
+import Shape_Catalog as shapes
+
+# AISC recommended slenderness limits for compression and tension members
+MAX_SLENDERNESS_COMPRESSION = 200.0
+MAX_SLENDERNESS_TENSION = 300.0
+
+# Number of (bar, shape) pairs checked at once
+SIZING_CHUNK_PAIRS = 1 << 20
+
+# Shapes of one type sorted by weight per foot, lightest first
+class ShapeTable:
+
+    def __init__(self, catalog, shape_type='W'):
+        rows = catalog.TypeRows(shape_type)
+        if(len(rows) == 0):
+            sys.exit("There are no %s shapes in the catalog" % shape_type)
+        weight = catalog.Column('W')[rows]
+        area = catalog.Column('A')[rows]
+        r_min = np.fmin(np.fmin(catalog.Column('rx')[rows], catalog.Column('ry')[rows]),
+                        catalog.Column('rz')[rows])
+        usable = np.isfinite(weight) & np.isfinite(area) & np.isfinite(r_min)
+        order = np.lexsort((area[usable], weight[usable]))
+        self.shape_type = shape_type
+        self.rows = rows[usable][order]
+        self.labels = catalog.labels[self.rows]
+        self.weight = weight[usable][order]
+        self.area = area[usable][order]
+        self.r_min = r_min[usable][order]
+
+    def __len__(self):
+        return len(self.rows)
+
+    # Section name of a shape as written in the truss CSV files
+    def SectionName(self, shape):
+        return "%s Shapes:%s" % (self.shape_type, self.labels[shape])
+
+# Largest tension and compression (both positive) of every bar over the
+# load cases of (n_bars,) or (n_cases, n_bars) forces
+def ForceEnvelope(forces):
+    forces = np.atleast_2d(np.asarray(forces, dtype=float))
+    return np.maximum(forces.max(axis=0), 0), np.maximum(-forces.min(axis=0), 0)
+
+# Lightest adequate shape of every bar (-1 where no shape is adequate).
+# lengths are in inches and forces in kips; K is the effective length
+# factor.
+def LightestShapes(table, tension, compression, lengths, E, Fy, K=1.0,
+                   max_compression_slenderness=MAX_SLENDERNESS_COMPRESSION,
+                   max_tension_slenderness=MAX_SLENDERNESS_TENSION):
+    n_bars = len(lengths)
+    choice = np.full(n_bars, -1, dtype=np.int64)
+    E = np.broadcast_to(E, (n_bars,))
+    Fy = np.broadcast_to(Fy, (n_bars,))
+
+    # identical demands need to be checked only once
+    demands = np.column_stack([tension, compression, lengths, E, Fy])
+    demands, inverse = np.unique(demands, axis=0, return_inverse=True)
+    unique_choice = np.full(len(demands), -1, dtype=np.int64)
+
+    chunk = max(1, SIZING_CHUNK_PAIRS // max(len(table), 1))
+    for start in range(0, len(demands), chunk):
+        T, C, L, E_chunk, Fy_chunk = (column[:, None] for column in demands[start:start + chunk].T)
+        slenderness = K * L / table.r_min
+        adequate = checks.PHI_TENSION * Fy_chunk * table.area >= T
+        adequate &= (T == 0) | (slenderness <= max_tension_slenderness)
+        compressed = C > 0
+        adequate &= ~compressed | (slenderness <= max_compression_slenderness)
+        Fcr = checks.FlexuralBucklingStress(slenderness, E_chunk, Fy_chunk)
+        adequate &= checks.PHI_COMPRESSION * Fcr * table.area >= C
+        first = np.argmax(adequate, axis=1)
+        found = adequate[np.arange(len(first)), first]
+        unique_choice[start:start + chunk] = np.where(found, first, -1)
+    choice[:] = unique_choice[inverse.ravel()]
+    return choice
+
+# Result of sizing the bars of a model
+class SectionSizing:
+
+    def __init__(self, table, shapes_of_bars, lengths, tension, compression, iterations=1):
+        self.table = table
+        self.shapes = shapes_of_bars
+        self.iterations = iterations
+        self.infeasible_bars = np.flatnonzero(shapes_of_bars < 0)
+        chosen = np.maximum(shapes_of_bars, 0)
+        self.labels = np.where(shapes_of_bars >= 0, table.labels[chosen], '')
+        # weight in lb/ft times length in ft
+        self.weight = np.where(shapes_of_bars >= 0, table.weight[chosen] * lengths / 12.0, float("NAN"))
+        self.tension = tension
+        self.compression = compression
+        # False when the sections of an indeterminate truss were still
+        # changing at the iteration limit
+        self.converged = True
+
+    @property
+    def total_weight(self):
+        return float(np.nansum(self.weight))
+
+    @property
+    def is_feasible(self):
+        return len(self.infeasible_bars) == 0
+
+# Size every bar of a solved model for its axial loads, or for given
+# (n_bars,) or (n_cases, n_bars) forces (an envelope over the cases)
+def SizeSections(model, forces=None, shape_type='W', K=1.0, catalog=None, materials=None,
+                 length_to_inches=12.0, table=None):
+    if catalog is None:
+        catalog = shapes.GetShapeCatalog()
+    if materials is None:
+        materials = checks.LoadMaterialData()
+    if table is None:
+        table = ShapeTable(catalog, shape_type)
+    if forces is None:
+        forces = model.axial_load
+    tension, compression = ForceEnvelope(forces)
+    if not (np.all(np.isfinite(tension)) and np.all(np.isfinite(compression))):
+        sys.exit("Section sizing needs the solved axial loads of every bar")
+    lengths = model.BarGeometry()[1] * length_to_inches
+    E = checks.BarMaterialValues(model, materials, 'E')
+    Fy = checks.BarMaterialValues(model, materials, 'Fy')
+    if(np.any(np.isnan(E)) or np.any(np.isnan(Fy))):
+        sys.exit("Bars %s have materials that are not in the material data"
+                 % np.flatnonzero(np.isnan(E) | np.isnan(Fy))[:10].tolist())
+    choice = LightestShapes(table, tension, compression, lengths, E, Fy, K)
+    return SectionSizing(table, choice, lengths, tension, compression)
+
+# Assign the sized sections to the bars of a model (bars without an
+# adequate shape keep theirs)
+def ApplySections(model, sizing):
+    shapes_of_bars = sizing.shapes
+    chosen = np.unique(shapes_of_bars[shapes_of_bars >= 0])
+    codes = np.full(len(sizing.table), -1, dtype=model.section_code.dtype)
+    for shape in chosen.tolist():
+        codes[shape] = model.CategoryCode(model.section_names, sizing.table.SectionName(shape))
+    sized = shapes_of_bars >= 0
+    model.section_code[sized] = codes[shapes_of_bars[sized]]
+    model.InvalidateStructure()
+
+# Solve a truss, size its bars and assign the sections. A statically
+# determinate truss is solved once; the bar forces of an indeterminate one
+# depend on the sections, so it is re-solved and re-sized until the
+# sections stop changing (at most max_iterations times). If they are still
+# changing then, the forces are solved once more for the last sections and
+# the result is marked as not converged. load_cases is an optional
+# (n_cases, n_nodes, 2) array used instead of the model loads.
+def SizeTruss(nodes, bars, shape_type='W', load_cases=None, K=1.0, max_iterations=10, solver=None):
+    model = ModelOf(nodes, bars)
+    if(model is None):
+        sys.exit("Section sizing needs the nodes and bars of a loaded truss model")
+    if solver is None:
+        solver = TrussSolver(nodes, bars)
+    if load_cases is None:
+        load_cases = model.force_external[None]
+    table = ShapeTable(shapes.GetShapeCatalog(), shape_type)
+    previous = None
+    converged = False
+    for iteration in range(1, max_iterations + 1):
+        bar_forces = solver.SolveLoadCases(load_cases)[0]
+        sizing = SizeSections(model, bar_forces, shape_type, K, table=table)
+        sizing.iterations = iteration
+        ApplySections(model, sizing)
+        if(solver.ResolvedMethod() == 'equilibrium' or np.array_equal(sizing.shapes, previous)):
+            converged = True
+            break
+        previous = sizing.shapes
+    if not converged:
+        # the forces above belong to the sections before the last ones
+        bar_forces = solver.SolveLoadCases(load_cases)[0]
+    sizing.converged = converged
+    model.axial_load[:] = bar_forces[0]
+    model.is_computed[:] = True
+    return sizing
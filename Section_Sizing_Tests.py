@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 08:52:20 2026
+
+Tests for the section sizing engine
+"""
+
+import numpy as np
+import Main_for_Final_Testing as Main
+import Member_Checks as checks
+import Section_Sizing as sizing
+import Shape_Catalog as shapes
+import Truss_Generator as generator
+from Truss_Solver import TrussSolver
+
+import unittest
+
+class TestSectionSizing(unittest.TestCase):
+
+    def test_Buckling_Stress(self):
+        # AISC E3 at the inelastic / elastic limit 4.71 sqrt(E/Fy)
+        limit = 4.71*np.sqrt(29000/50)
+        Fcr = checks.FlexuralBucklingStress(np.array([0, limit, 200]), 29000, 50)
+        self.assertAlmostEqual(50, Fcr[0])
+        self.assertAlmostEqual(0.658**2.25*50, Fcr[1], 1)
+        self.assertAlmostEqual(0.877*np.pi**2*29000/200**2, Fcr[2])
+
+    def test_Lightest_Adequate_Shapes(self):
+        table = sizing.ShapeTable(shapes.GetShapeCatalog(), 'W')
+        self.assertTrue(np.all(np.diff(table.weight) >= 0))
+
+        lengths = np.array([120.0, 120.0, 480.0, 120.0])
+        tension = np.array([100.0, 0.0, 0.0, 1e6])
+        compression = np.array([0.0, 100.0, 100.0, 0.0])
+        choice = sizing.LightestShapes(table, tension, compression, lengths, 29000.0, 50.0)
+
+        # every chosen shape is adequate and the next lighter one is not
+        def Adequate(bar, shape):
+            Fcr = checks.FlexuralBucklingStress(lengths[bar]/table.r_min[shape], 29000, 50)
+            return 0.9*50*table.area[shape] >= tension[bar] and 0.9*Fcr*table.area[shape] >= compression[bar]
+        for bar in range(3):
+            self.assertTrue(Adequate(bar, choice[bar]))
+            self.assertFalse(any(Adequate(bar, shape) for shape in range(choice[bar])))
+        self.assertEqual(0, choice[0])
+        self.assertGreater(table.weight[choice[2]], table.weight[choice[1]])
+        self.assertEqual(-1, choice[3])
+
+    def test_Size_Example_3_3(self):
+        nodes, bars = Main.MethodOfJoints("Example_3_3.csv")
+        result = sizing.SizeSections(nodes.model)
+        self.assertTrue(result.is_feasible)
+
+        sizing.ApplySections(nodes.model, result)
+        stresses = checks.ComputeMemberStresses(nodes.model)
+        self.assertLessEqual(stresses.utilization.max(), 0.9)
+        self.assertEqual('W Shapes:' + result.labels[7], bars[7].section)
+
+    def test_Indeterminate_Truss_Converges(self):
+        model = generator.GenerateTruss('pratt', 8)
+        # a second diagonal in the middle panel makes it indeterminate
+        model.InsertBar(model.n_bars, 4, 12, generator.DEFAULT_SECTION, generator.DEFAULT_MATERIAL)
+        result = sizing.SizeTruss(model.nodes, model.bars)
+        self.assertTrue(result.is_feasible)
+        self.assertGreater(result.iterations, 1)
+        self.assertTrue(result.converged)
+        again = sizing.SizeSections(model)
+        np.testing.assert_array_equal(result.shapes, again.shapes)
+
+    def test_Iteration_Limit(self):
+        model = generator.GenerateTruss('pratt', 8)
+        model.InsertBar(model.n_bars, 4, 12, generator.DEFAULT_SECTION, generator.DEFAULT_MATERIAL)
+        result = sizing.SizeTruss(model.nodes, model.bars, max_iterations=1)
+        self.assertFalse(result.converged)
+        self.assertEqual(1, result.iterations)
+
+        # the stored forces belong to the returned sections
+        forces = TrussSolver(model.nodes, model.bars, 'stiffness').SolveLoadCases(model.force_external[None])[0]
+        np.testing.assert_allclose(forces[0], model.axial_load, rtol=1e-9, atol=1e-9)
+
+    def test_Thousand_Bar_Truss(self):
+        model = generator.GenerateTruss('warren', 250, load=-0.05)
+        result = sizing.SizeTruss(model.nodes, model.bars)
+        self.assertEqual(999, model.n_bars)
+        self.assertTrue(result.is_feasible)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:05:26 2026
+
+Indexed, lazily converted store for the AISC shapes database
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import numpy as np
+
+from ImportCSVData import CompiledModelPath
+from ImportCSVData import FileDigest
+from ImportCSVData import PruneCompiledModels
+
+AISC_SHAPES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'Data_Files', 'aisc_shapes_database_v16_0.csv')
+
+# Format version of the cached catalog, separate from the model cache
+SHAPE_CACHE_VERSION = 1
+
+# placeholder the database uses for properties that do not apply to a shape
+MISSING_VALUE = '–'
+
+# Convert a database entry into a float. Entries are plain numbers, the
+# missing-value dash, or whole-and-fraction strings such as "44  3/4".
+def ParseShapeValue(text):
+    text = text.strip()
+    if(text == '' or text == MISSING_VALUE):
+        return float("NAN")
+    value = 0.0
+    for part in text.split():
+        if('/' in part):
+            numerator, denominator = part.split('/')
+            value += float(numerator) / float(denominator)
+        else:
+            value += float(part)
+    return value
+
+# Convert a column of database entries into floats, taking the vectorized
+# path whenever the column holds no fractions
+def ParseShapeColumn(raw):
+    cleaned = np.where(np.char.strip(raw) == MISSING_VALUE, 'nan', raw)
+    try:
+        return cleaned.astype(float)
+    except ValueError:
+        return np.array([ParseShapeValue(text) for text in raw.tolist()])
+
+# AISC manual label of a section as written in the truss CSV files,
+# e.g. "W Shapes:W12X26" -> "W12X26"
+def SectionLabel(section):
+    return section.split(':')[-1].strip()
+
+# Columnar store of the shapes database. Raw string columns are only read
+# when first requested, and numeric conversion is done per column on demand.
+class ShapeCatalog:
+
+    def __init__(self, column_names, raw_columns):
+        self.column_names = list(column_names)
+        self._column_idx = {name: idx for idx, name in enumerate(self.column_names)}
+        self._raw_columns = raw_columns
+        self._raw = {}
+        self._numeric = {}
+
+        # hash index on the manual label and row index per shape type
+        self.labels = self.RawColumn('AISC_Manual_Label')
+        self.label_index = {label: row for row, label in enumerate(self.labels.tolist())}
+        self.types = self.RawColumn('Type')
+        self.type_index = {}
+        for shape_type in np.unique(self.types):
+            self.type_index[str(shape_type)] = np.flatnonzero(self.types == shape_type)
+
+    @property
+    def n_shapes(self):
+        return len(self.labels)
+
+    # Raw strings of one column
+    def RawColumn(self, name):
+        if(name not in self._raw):
+            if(name not in self._column_idx):
+                sys.exit("Unknown shape property %s" % name)
+            self._raw[name] = self._raw_columns[self._column_idx[name]]
+        return self._raw[name]
+
+    # Float values of one column (NaN where the property does not apply)
+    def Column(self, name):
+        if(name not in self._numeric):
+            self._numeric[name] = ParseShapeColumn(self.RawColumn(name))
+        return self._numeric[name]
+
+    # Row of a shape from its manual label, or -1 if it is not in the catalog
+    def Row(self, label):
+        return self.label_index.get(SectionLabel(label), -1)
+
+    # Rows of many labels at once
+    def Rows(self, labels):
+        return np.fromiter((self.Row(label) for label in labels), dtype=np.int64, count=len(labels))
+
+    # Rows of every shape of one type (W, HSS, L, ...)
+    def TypeRows(self, shape_type):
+        return self.type_index.get(shape_type, np.zeros(0, dtype=np.int64))
+
+    # Property of a single shape
+    def Value(self, label, name):
+        row = self.Row(label)
+        if(row < 0):
+            sys.exit("Shape %s is not in the catalog" % label)
+        return float(self.Column(name)[row])
+
+    # Catalog row of every bar of a model (-1 for unknown sections), looked
+    # up once per distinct section and gathered through the section codes
+    def BarRows(self, model):
+        section_rows = self.Rows(model.section_names)
+        return section_rows[model.section_code]
+
+    # Property of every bar of a model (NaN for unknown sections)
+    def BarValues(self, model, name):
+        rows = self.BarRows(model)
+        values = np.append(self.Column(name), float("NAN"))
+        return values[rows]
+
+# Column lists read straight from the database. Repeated (metric) column
+# names get a "_metric" suffix.
+def ReadShapeColumns(path):
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for row in reader if row]
+    column_names = []
+    for name in header:
+        column_names.append(name + '_metric' if name in column_names else name)
+    raw_columns = [np.array(column, dtype=str) for column in zip(*rows)]
+    return column_names, raw_columns
+
+# Write the raw columns of the database to a cache archive, under a
+# temporary name that is renamed into place
+def WriteShapeCache(cache_path, column_names, raw_columns):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(cache_path[:-4]) + '.tmp', suffix='.npz',
+                                     dir=os.path.dirname(cache_path))
+    os.close(fd)
+    try:
+        np.savez(temp_path, names=np.array(column_names),
+                 **{'c%d' % idx: column for idx, column in enumerate(raw_columns)})
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+# Load the shapes database, using (and writing) a binary cache of the raw
+# columns next to the file so later loads skip CSV parsing. Columns in the
+# cache are only read from disk when first requested. When the cache cannot
+# be written the parsed catalog is used as is.
+def LoadShapeCatalog(path=AISC_SHAPES_FILE, use_cache=True):
+    if not use_cache:
+        return ShapeCatalog(*ReadShapeColumns(path))
+
+    cache_path = CompiledModelPath(path, FileDigest(path), SHAPE_CACHE_VERSION) + '.npz'
+    if not os.path.isfile(cache_path):
+        column_names, raw_columns = ReadShapeColumns(path)
+        try:
+            WriteShapeCache(cache_path, column_names, raw_columns)
+            PruneCompiledModels(path, cache_path)
+        except OSError:
+            # a read-only checkout just goes without the cache
+            pass
+        return ShapeCatalog(column_names, raw_columns)
+
+    archive = np.load(cache_path)
+    column_names = archive['names'].tolist()
+    return ShapeCatalog(column_names, LazyColumns(archive))
+
+# Sequence of raw columns read from a cache archive as they are indexed
+class LazyColumns:
+
+    def __init__(self, archive):
+        self.archive = archive
+
+    def __getitem__(self, idx):
+        return self.archive['c%d' % idx]
+
+# Catalogs loaded in this process, by file path
+_catalogs = {}
+
+# Shape catalog for a database file, loaded once per process
+def GetShapeCatalog(path=AISC_SHAPES_FILE):
+    path = os.path.abspath(path)
+    if(path not in _catalogs):
+        _catalogs[path] = LoadShapeCatalog(path)
+    return _catalogs[path]
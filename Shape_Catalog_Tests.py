@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:41:18 2026
+
+Tests for the AISC shape catalog
+"""
+
+import math
+import os
+import shutil
+import tempfile
+import ImportCSVData as csvdata
+import Main_for_Final_Testing as Main
+import Shape_Catalog as shapes
+
+import unittest
+
+class TestShapeCatalog(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.catalog = shapes.LoadShapeCatalog(use_cache=False)
+
+    def test_ParseShapeValue(self):
+        self.assertAlmostEqual(44.75, shapes.ParseShapeValue("44  3/4 "))
+        self.assertAlmostEqual(0.625, shapes.ParseShapeValue("  5/8 "))
+        self.assertAlmostEqual(1.8125, shapes.ParseShapeValue("1 13/16"))
+        self.assertTrue(math.isnan(shapes.ParseShapeValue("–")))
+
+    def test_Lookup_W12X26(self):
+        self.assertEqual(self.catalog.Row("W12X26"), self.catalog.Row("W Shapes:W12X26"))
+        self.assertAlmostEqual(7.65, self.catalog.Value("W Shapes:W12X26", "A"))
+        self.assertAlmostEqual(5.17, self.catalog.Value("W12X26", "rx"))
+        self.assertAlmostEqual(1.51, self.catalog.Value("W12X26", "ry"))
+        self.assertAlmostEqual(12.25, self.catalog.Value("W12X26", "ddet"))
+        self.assertEqual(-1, self.catalog.Row("W Shapes:W99X1"))
+
+    def test_Type_Index(self):
+        w_rows = self.catalog.TypeRows("W")
+
+        self.assertEqual(289, len(w_rows))
+        self.assertTrue(all(self.catalog.types[w_rows] == "W"))
+        self.assertEqual(0, len(self.catalog.TypeRows("XYZ")))
+
+    def test_Bar_Values_Example_3_2(self):
+        nodes, bars = Main.LoadCSV("Example_3_2.csv")
+        areas = self.catalog.BarValues(nodes.model, "A")
+
+        self.assertAlmostEqual(7.65, areas[0])
+        self.assertAlmostEqual(2.96, areas[10])
+
+    def test_Catalog_Cache(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "shapes.csv")
+            shutil.copy(shapes.AISC_SHAPES_FILE, path)
+            cache_folder = os.path.join(folder, csvdata.CACHE_FOLDER)
+            os.makedirs(cache_folder)
+            stale = ["shapes.csv.v0.%s.npz" % ('0'*32), "shapes.csv.v%d.%s.npz" % (shapes.SHAPE_CACHE_VERSION, 'f'*32)]
+            for name in stale:
+                open(os.path.join(cache_folder, name), 'w').close()
+            # the compiled model folder of the same file is not a catalog
+            os.makedirs(os.path.join(cache_folder, "shapes.csv.v1.%s" % ('0'*32)))
+
+            shapes.LoadShapeCatalog(path)
+            cache_path = csvdata.CompiledModelPath(path, csvdata.FileDigest(path), shapes.SHAPE_CACHE_VERSION) + '.npz'
+            self.assertEqual(sorted([os.path.basename(cache_path), "shapes.csv.v1.%s" % ('0'*32)]),
+                             sorted(os.listdir(cache_folder)))
+            cached = shapes.LoadShapeCatalog(path)
+            self.assertAlmostEqual(7.65, cached.Value("W12X26", "A"))
+
+            # a file where the cache folder belongs makes it unwritable
+            shutil.rmtree(cache_folder)
+            open(cache_folder, 'w').close()
+            self.assertAlmostEqual(7.65, shapes.LoadShapeCatalog(path).Value("W12X26", "A"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:12:08 2026
+
+Resident truss solver that answers JSON-lines requests
+
+    python Solver_Service.py                      (stdin and stdout)
+    python Solver_Service.py --port 8765          (TCP on localhost)
+    python Solver_Service.py --socket truss.sock  (Unix socket)
+
+Every request is one JSON object on a line and gets one JSON response on a
+line, with the "id" of the request copied into it. Requests are handled
+concurrently on a thread pool, so responses may come back out of order.
+
+    {"id": 1, "op": "load", "model": "Example_3_3.csv"}
+    {"id": 2, "op": "solve", "model": "Example_3_3.csv",
+     "cases": [[[1, 0, -10]], [[1, 5, 0], [2, 0, -5]]], "utilization": true}
+
+Load cases are lists of [node index, x force, y force] with the node
+indices of the CSV file; a solve without cases solves the loads in the
+file. Other operations are "ping", "unload", "status" and "shutdown".
+Loaded models keep their factorizations, and the shape catalog and material
+data are read once, so repeated solves only run the substitutions. Models
+that are idle for longer than idle_seconds, or the least recently used
+ones beyond max_models, are dropped. A model whose file changed is
+reloaded on its next request.
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from ImportCSVData import LoadData
+from Truss_Solver import TrussSolver, FactorizationCache
+import Member_Checks as checks
+import Shape_Catalog as shapes
+
+SERVICE_WORKERS = 4
+SERVICE_MAX_MODELS = 32
+SERVICE_IDLE_SECONDS = 600.0
+
+# Size and modification time of a file, to notice when a model changes
+def FileStamp(path):
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime_ns)
+
+# A loaded model with its own solver and factorization cache. Solves of
+# one model are serialized by its lock; different models solve in parallel.
+class ServiceModel:
+
+    def __init__(self, path, method='auto', use_cache=False):
+        self.path = path
+        self.stamp = FileStamp(path)
+        nodes, bars = LoadData(path, use_cache)
+        self.model = nodes.model
+        self.solver = TrussSolver(nodes, bars, method, cache=FactorizationCache(max_entries=1))
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.properties = None
+        self.solves = 0
+        order = np.argsort(self.model.node_list_idx, kind='stable')
+        self._sorted_idx = self.model.node_list_idx[order]
+        self._sorted_rows = order
+
+    # Model rows of CSV node indices
+    def NodeRows(self, list_idx):
+        list_idx = np.asarray(list_idx, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self._sorted_idx, list_idx), len(self._sorted_idx) - 1)
+        unknown = list_idx[self._sorted_idx[pos] != list_idx]
+        if(len(unknown) > 0):
+            sys.exit("Load cases reference undefined nodes %s" % unknown[:10].tolist())
+        return self._sorted_rows[pos]
+
+    # (n_cases, n_nodes, 2) loads of a list of cases of [node, fx, fy]
+    # entries, or the loads of the file when cases is None
+    def LoadCases(self, cases):
+        if(cases is None):
+            return self.model.force_external[None]
+        loads = np.zeros((len(cases), self.model.n_nodes, 2))
+        for k, case in enumerate(cases):
+            entries = np.asarray(case, dtype=float).reshape(-1, 3)
+            if(len(entries) > 0):
+                np.add.at(loads[k], self.NodeRows(entries[:, 0].astype(np.int64)), entries[:, 1:])
+        return loads
+
+    # Section and material properties, looked up on the first request that
+    # needs them
+    def Properties(self, catalog, materials):
+        if(self.properties is None):
+            self.properties = checks.MemberProperties(self.model, catalog, materials)
+        return self.properties
+
+    def Factor(self):
+        with self.lock:
+            self.solver.Factorization()
+            return self.solver.ResolvedMethod()
+
+    def Solve(self, cases=None):
+        loads = self.LoadCases(cases)
+        with self.lock:
+            bar_forces, reactions, displacements = self.solver.SolveLoadCases(loads)
+            reaction_dofs = self.solver.reaction_dofs
+            self.solves += 1
+        return bar_forces, reactions, displacements, reaction_dofs
+
+# Thread-safe store of loaded models with idle and least recently used
+# eviction
+class ModelStore:
+
+    def __init__(self, max_models=SERVICE_MAX_MODELS, idle_seconds=SERVICE_IDLE_SECONDS,
+                 method='auto', use_cache=False):
+        self.max_models = max_models
+        self.idle_seconds = idle_seconds
+        self.method = method
+        self.use_cache = use_cache
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Loaded model of a file, loading (or reloading, when the file changed)
+    # it as needed. Loading happens outside the store lock so that a large
+    # model does not hold up requests for the others.
+    def Get(self, path):
+        path = os.path.abspath(path)
+        if not os.path.isfile(path):
+            sys.exit("Model file %s does not exist" % path)
+        with self.lock:
+            entry = self.entries.get(path)
+        if(entry is None or entry.stamp != FileStamp(path)):
+            entry = ServiceModel(path, self.method, self.use_cache)
+            with self.lock:
+                self.entries[path] = entry
+                self.loads += 1
+        entry.last_used = time.monotonic()
+        self.Evict(keep=path)
+        return entry
+
+    # Drop idle models and then the least recently used ones beyond
+    # max_models. Returns the number of models dropped.
+    def Evict(self, now=None, keep=None):
+        if(now is None):
+            now = time.monotonic()
+        with self.lock:
+            by_age = sorted(self.entries.items(), key=lambda item: item[1].last_used)
+            n_extra = len(by_age) - self.max_models
+            dropped = 0
+            for path, entry in by_age:
+                if(path == keep):
+                    continue
+                if(dropped < n_extra or now - entry.last_used > self.idle_seconds):
+                    del self.entries[path]
+                    dropped += 1
+            self.evictions += dropped
+        return dropped
+
+    def Unload(self, path):
+        with self.lock:
+            return self.entries.pop(os.path.abspath(path), None) is not None
+
+    def Status(self):
+        now = time.monotonic()
+        with self.lock:
+            models = [{'model': path, 'n_nodes': entry.model.n_nodes, 'n_bars': entry.model.n_bars,
+                       'solves': entry.solves, 'idle_seconds': now - entry.last_used}
+                      for path, entry in self.entries.items()]
+        return {'models': models, 'loads': self.loads, 'evictions': self.evictions}
+
+# JSON-lines request handler around a model store and a worker pool
+class SolverService:
+
+    def __init__(self, workers=SERVICE_WORKERS, max_models=SERVICE_MAX_MODELS,
+                 idle_seconds=SERVICE_IDLE_SECONDS, method='auto', use_cache=False):
+        self.store = ModelStore(max_models, idle_seconds, method, use_cache)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.stopped = threading.Event()
+        self._catalog = None
+        self._materials = None
+        self._data_lock = threading.Lock()
+        self.operations = {'ping': self.Ping, 'load': self.Load, 'solve': self.Solve,
+                           'unload': self.Unload, 'status': self.Status, 'shutdown': self.Shutdown}
+        # idle models are also dropped while no requests come in
+        interval = min(max(idle_seconds / 2, 1.0), 60.0)
+        self.reaper = threading.Thread(target=self._Reap, args=(interval,), daemon=True)
+        self.reaper.start()
+
+    def _Reap(self, interval):
+        while not self.stopped.wait(interval):
+            self.store.Evict()
+
+    # Shape catalog and material data, read once and shared by all models
+    def MemberData(self):
+        with self._data_lock:
+            if(self._catalog is None):
+                self._catalog = shapes.GetShapeCatalog()
+                self._materials = checks.LoadMaterialData()
+        return self._catalog, self._materials
+
+    def Ping(self, request):
+        return {}
+
+    def Load(self, request):
+        entry = self.store.Get(Required(request, 'model'))
+        method = entry.Factor()
+        return {'n_nodes': entry.model.n_nodes, 'n_bars': entry.model.n_bars, 'method': method}
+
+    def Solve(self, request):
+        entry = self.store.Get(Required(request, 'model'))
+        bar_forces, reactions, displacements, reaction_dofs = entry.Solve(request.get('cases'))
+        response = {'bar_forces': bar_forces.tolist(),
+                    'reaction_node': entry.model.node_list_idx[reaction_dofs // 2].tolist(),
+                    'reaction_direction': (reaction_dofs % 2).tolist(),
+                    'reactions': reactions.tolist()}
+        if(displacements is not None):
+            response['displacements'] = displacements.tolist()
+        if(request.get('utilization')):
+            stresses = checks.MemberStresses(entry.Properties(*self.MemberData()), bar_forces)
+            response['utilization'] = stresses.utilization.tolist()
+            response['critical_members'] = stresses.CriticalMembers(int(request.get('count', 10)))
+        return response
+
+    def Unload(self, request):
+        return {'unloaded': self.store.Unload(Required(request, 'model'))}
+
+    def Status(self, request):
+        self.store.Evict()
+        return self.store.Status()
+
+    def Shutdown(self, request):
+        self.stopped.set()
+        return {}
+
+    # Response to one request. Nothing raised while handling it, including
+    # the sys.exit calls of the solver, escapes.
+    def Handle(self, request):
+        start = time.perf_counter()
+        response = {'id': request.get('id') if isinstance(request, dict) else None}
+        try:
+            if not isinstance(request, dict):
+                sys.exit("A request must be a JSON object")
+            operation = self.operations.get(request.get('op'))
+            if(operation is None):
+                sys.exit("Unknown operation %s, expected one of %s" % (request.get('op'), list(self.operations)))
+            response.update(operation(request))
+            response['ok'] = True
+        except SystemExit as error:
+            response.update(ok=False, error=str(error.code) if error.code is not None else 'exited')
+        except Exception as error:
+            response.update(ok=False, error='%s: %s' % (type(error).__name__, error))
+        response['seconds'] = time.perf_counter() - start
+        return response
+
+    # Serve the request lines of a text stream, writing every response line
+    # to out as soon as it is ready. Returns after the end of the stream or
+    # a shutdown request, once every pending request has been answered.
+    def ServeStream(self, infile, out):
+        write_lock = threading.Lock()
+
+        def Respond(response):
+            line = json.dumps(response)
+            with write_lock:
+                out.write(line + '\n')
+                out.flush()
+
+        pending = []
+        for line in infile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                Respond({'id': None, 'ok': False, 'error': 'Invalid JSON: %s' % error})
+                continue
+            pending = [future for future in pending if not future.done()]
+            if(isinstance(request, dict) and request.get('op') == 'shutdown'):
+                for future in pending:
+                    future.result()
+                Respond(self.Handle(request))
+                return
+            future = self.pool.submit(self.Handle, request)
+            future.add_done_callback(lambda future: Respond(future.result()))
+            pending.append(future)
+        for future in pending:
+            future.result()
+
+    def Close(self):
+        self.stopped.set()
+        self.pool.shutdown(wait=True)
+
+# Socket server that serves every connection as a stream of request lines
+def MakeServer(service, port=None, socket_path=None):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            infile = (line.decode('utf-8') for line in self.rfile)
+            service.ServeStream(infile, ByteWriter(self.wfile))
+            if(service.stopped.is_set()):
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    if(socket_path is not None):
+        if(os.path.exists(socket_path)):
+            os.remove(socket_path)
+        server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+    else:
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', port), Handler)
+    server.daemon_threads = True
+    return server
+
+# Text writer over a binary socket file
+class ByteWriter:
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text):
+        self.wfile.write(text.encode('utf-8'))
+
+    def flush(self):
+        self.wfile.flush()
+
+# Value of a required request field
+def Required(request, name):
+    if(name not in request):
+        sys.exit("The request needs a %s" % name)
+    return request[name]
+
+def Main(argv=None):
+    parser = argparse.ArgumentParser(description="Resident truss solver answering JSON-lines requests")
+    parser.add_argument('--port', type=int, help="serve TCP connections on localhost")
+    parser.add_argument('--socket', help="serve connections on a Unix socket at this path")
+    parser.add_argument('--workers', type=int, default=SERVICE_WORKERS)
+    parser.add_argument('--max-models', type=int, default=SERVICE_MAX_MODELS)
+    parser.add_argument('--idle-seconds', type=float, default=SERVICE_IDLE_SECONDS)
+    parser.add_argument('--method', default='auto', choices=['auto', 'equilibrium', 'stiffness'])
+    parser.add_argument('--use-cache', action='store_true', help="memory-map compiled models from disk")
+    args = parser.parse_args(argv)
+
+    service = SolverService(args.workers, args.max_models, args.idle_seconds, args.method, args.use_cache)
+    try:
+        if(args.port is None and args.socket is None):
+            service.ServeStream(sys.stdin, sys.stdout)
+        else:
+            with MakeServer(service, args.port, args.socket) as server:
+                server.serve_forever()
+    finally:
+        service.Close()
+
+if __name__ == '__main__':
+    Main()
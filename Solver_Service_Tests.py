@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:40:26 2026
+
+Tests for the resident solver service
+"""
+
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import numpy as np
+import Solver_Service as service
+import Truss_Generator as generator
+
+import unittest
+
+class TestSolverService(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.paths = []
+        for n_panels in (2, 4, 6):
+            path = os.path.join(self.folder, "pratt_%d.csv" % n_panels)
+            generator.WriteTrussCSV(generator.GenerateTruss('pratt', n_panels), path)
+            self.paths.append(path)
+        self.service = service.SolverService(workers=2, max_models=2)
+
+    def tearDown(self):
+        self.service.Close()
+        shutil.rmtree(self.folder)
+
+    def test_Solve_Load_Cases(self):
+        example = self.service.Handle({'id': 7, 'op': 'solve', 'model': "Example_3_3.csv"})
+        self.assertTrue(example['ok'])
+        self.assertEqual(7, example['id'])
+        self.assertAlmostEqual(-692.781, example['bar_forces'][0][0], 2)
+
+        # a unit load at mid span of the 4 panel truss, then twice that
+        # split over two cases, then with the utilization of the members
+        cases = [[[2, 0, -1]], [[2, 0, -1], [2, 0, -1]]]
+        response = self.service.Handle({'op': 'solve', 'model': self.paths[1], 'cases': cases,
+                                        'utilization': True, 'count': 3})
+        self.assertTrue(response['ok'], response.get('error'))
+        forces = np.array(response['bar_forces'])
+        np.testing.assert_allclose(2*forces[0], forces[1])
+        np.testing.assert_allclose([[0.5, 0.5], [1, 1]], np.array(response['reactions'])[:, 1:])
+        self.assertEqual([0, 1, 1], response['reaction_direction'])
+        self.assertEqual(3, len(response['critical_members']))
+        self.assertEqual((2, 13), np.shape(response['utilization']))
+
+    def test_Errors_Are_Responses(self):
+        self.assertEqual("Load cases reference undefined nodes [99]",
+                         self.service.Handle({'op': 'solve', 'model': self.paths[0],
+                                              'cases': [[[99, 1, 0]]]})['error'])
+        self.assertEqual("The request needs a model", self.service.Handle({'op': 'load'})['error'])
+        self.assertFalse(self.service.Handle({'op': 'fly'})['ok'])
+        self.assertFalse(self.service.Handle({'op': 'load', 'model': "missing.csv"})['ok'])
+
+    def test_Models_Stay_Warm_And_Are_Evicted(self):
+        store = self.service.store
+        for path in self.paths[:2] + self.paths[:2]:
+            self.assertTrue(self.service.Handle({'op': 'solve', 'model': path})['ok'])
+        self.assertEqual((2, 0), (store.loads, store.evictions))
+        self.assertEqual(2, store.Get(self.paths[0]).solves)
+
+        # a third model pushes out the least recently used one
+        self.service.Handle({'op': 'load', 'model': self.paths[2]})
+        self.assertEqual(sorted([self.paths[0], self.paths[2]]),
+                         sorted(model['model'] for model in self.service.Handle({'op': 'status'})['models']))
+        self.assertEqual(2, store.Evict(now=float('inf')))
+        self.assertEqual(0, len(store))
+
+        # a changed file is reloaded
+        entry = store.Get(self.paths[0])
+        generator.WriteTrussCSV(generator.GenerateTruss('pratt', 8), self.paths[0])
+        os.utime(self.paths[0], ns=(0, entry.stamp[1] + 1))
+        self.assertEqual(16, store.Get(self.paths[0]).model.n_nodes)
+
+    def test_Stream_And_Socket(self):
+        requests = [{'id': k, 'op': 'solve', 'model': self.paths[k % 3]} for k in range(12)]
+        lines = [json.dumps(request) for request in requests] + ['not json', '{"id": 99, "op": "shutdown"}',
+                                                                  '{"id": 100, "op": "ping"}']
+        out = io.StringIO()
+        self.service.ServeStream(io.StringIO('\n'.join(lines) + '\n'), out)
+        responses = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(sorted(list(range(12)) + [99]), sorted(r['id'] for r in responses if r['id'] is not None))
+        self.assertEqual(99, responses[-1]['id'])
+        self.assertEqual(13, sum(r['ok'] for r in responses))
+
+        server_service = service.SolverService(workers=2)
+        server = service.MakeServer(server_service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with socket.create_connection(server.server_address) as connection:
+                files = connection.makefile('rw')
+                files.write(json.dumps({'id': 1, 'op': 'solve', 'model': "Example_3_3.csv"}) + '\n')
+                files.write('{"id": 2, "op": "shutdown"}\n')
+                files.flush()
+                responses = [json.loads(files.readline()) for _ in range(2)]
+            self.assertAlmostEqual(521.896, responses[0]['bar_forces'][0][8], 2)
+            thread.join(10)
+            self.assertFalse(thread.is_alive())
+        finally:
+            server.server_close()
+            server_service.Close()
+
+if __name__ == '__main__':
+    unittest.main()
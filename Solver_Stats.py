@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:20:44 2026
+
+Opt-in timers, counters and peak memory of the phases of a truss solve
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Statistics of one or more solves. Phase times and counters accumulate
+# when a phase or counter is recorded more than once. Hooks are called as
+# hook(kind, name, value) with kind "phase" (seconds), "memory" (bytes) or
+# "counter" (increment) whenever a value is recorded; solvers record their
+# counters once per call rather than per node, so hooks stay cheap.
+class SolverStats:
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.phase_times = {}
+        self.phase_calls = {}
+        self.peak_memory = {}
+        self.counters = {}
+        self.hooks = []
+        # peaks reached so far by the enclosing phases, which a nested
+        # phase's reset_peak would otherwise lose
+        self._peak_stack = []
+
+    def AddHook(self, hook):
+        self.hooks.append(hook)
+
+    def RemoveHook(self, hook):
+        self.hooks.remove(hook)
+
+    def _Notify(self, kind, name, value):
+        for hook in self.hooks:
+            hook(kind, name, value)
+
+    # Time the enclosed block as a named phase, and trace its peak memory
+    # when trace_memory is set. Phases may be nested; the peak of an outer
+    # phase includes those of the phases inside it.
+    @contextmanager
+    def Phase(self, name):
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if(self.trace_memory):
+            if(tracing):
+                tracemalloc.start()
+            if(self._peak_stack):
+                self._peak_stack[-1] = max(self._peak_stack[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._peak_stack.append(0)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phase_times[name] = self.phase_times.get(name, 0.0) + elapsed
+            self.phase_calls[name] = self.phase_calls.get(name, 0) + 1
+            self._Notify('phase', name, elapsed)
+            if(self.trace_memory):
+                peak = max(tracemalloc.get_traced_memory()[1], self._peak_stack.pop())
+                if(self._peak_stack):
+                    self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+                if(tracing):
+                    tracemalloc.stop()
+                self.peak_memory[name] = max(self.peak_memory.get(name, 0), peak)
+                self._Notify('memory', name, peak)
+
+    # Add to a named counter
+    def Count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+        self._Notify('counter', name, amount)
+
+    @property
+    def total_time(self):
+        return sum(self.phase_times.values())
+
+    # Plain dictionary of everything recorded, e.g. for json
+    def AsDict(self):
+        return {'total_time': self.total_time,
+                'phase_times': dict(self.phase_times),
+                'phase_calls': dict(self.phase_calls),
+                'peak_memory': dict(self.peak_memory),
+                'counters': dict(self.counters)}
+
+    def Print(self):
+        for name, seconds in self.phase_times.items():
+            line = '%-28s %10.6f s' % (name, seconds)
+            if(name in self.peak_memory):
+                line += ' %12d bytes' % self.peak_memory[name]
+            print(line)
+        for name, value in self.counters.items():
+            print('%-28s %10d' % (name, value))
+        print('')
+
+# Time a phase when stats are given, otherwise do nothing
+def Phase(stats, name):
+    if(stats is None):
+        return nullcontext()
+    return stats.Phase(name)
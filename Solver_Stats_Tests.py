@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:46:31 2026
+
+Tests for solver statistics and instrumentation hooks
+"""
+
+import Main_for_Final_Testing as Main
+from Solver_Stats import SolverStats
+
+import unittest
+
+class TestSolverStats(unittest.TestCase):
+
+    def test_Phases_And_Counters_Example_3_3(self):
+        events = []
+        stats = SolverStats(trace_memory=True)
+        stats.AddHook(lambda kind, name, value: events.append((kind, name)))
+        nodes, bars, returned = Main.MethodOfJoints("Example_3_3.csv", stats=stats)
+
+        self.assertIs(stats, returned)
+        self.assertEqual(['LoadData', 'StaticallyDeterminate', 'GeometricallyStable', 'ComputeReactions',
+                          'IterateUsingMethodOfJoints'], list(stats.phase_times))
+        # the last of the 6 joints has no unknown bars left to solve
+        self.assertEqual(5, stats.counters['node_visits'])
+        self.assertGreaterEqual(stats.counters['queue_pops'], stats.counters['node_visits'])
+        self.assertGreater(stats.counters['linalg_solve_calls'], 0)
+        self.assertGreater(stats.peak_memory['LoadData'], 0)
+        self.assertIn(('phase', 'LoadData'), events)
+        self.assertIn(('memory', 'ComputeReactions'), events)
+        self.assertIn(('counter', 'node_visits'), events)
+        self.assertAlmostEqual(-692.781, bars[0].axial_load, 2)
+
+    def test_Accumulates_Over_Solves(self):
+        stats = SolverStats()
+        Main.MethodOfJoints("Example_3_2.csv", solver="matrix", stats=stats)
+        Main.MethodOfJoints("Example_3_2.csv", solver="matrix", stats=stats)
+        summary = stats.AsDict()
+
+        self.assertEqual(2, summary['phase_calls']['SolveUsingEquilibriumMatrix'])
+        self.assertEqual({}, summary['peak_memory'])
+        self.assertAlmostEqual(sum(summary['phase_times'].values()), summary['total_time'])
+
+    def test_Nested_Phase_Memory(self):
+        stats = SolverStats(trace_memory=True)
+        with stats.Phase("outer"):
+            block = bytearray(8 << 20)
+            del block
+            # the inner phase resets the traced peak, but the outer phase
+            # keeps the 8 MB it reached before
+            with stats.Phase("inner"):
+                small = bytearray(1 << 20)
+            del small
+
+        self.assertGreaterEqual(stats.peak_memory['outer'], 8 << 20)
+        self.assertGreaterEqual(stats.peak_memory['inner'], 1 << 20)
+        self.assertLess(stats.peak_memory['inner'], 8 << 20)
+
+    def test_Without_Stats(self):
+        self.assertEqual(2, len(Main.MethodOfJoints("Example_3_2.csv")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,21 @@ Created on Wed Jul 14 14:34:19 2021
 """
 
 import sys
+import numpy as np
+from Classes import ModelOf
+from Equilibrium_Matrix import EquilibriumFactorization
+from Equilibrium_Matrix import ExternalForceVector
+from Equilibrium_Matrix import NodeCoordinates
+from Equilibrium_Matrix import AssembleEquilibriumMatrix
+from Equilibrium_Matrix import BarConnectivity
+
+# scipy is optional; without it stability is always checked densely
+try:
+    import scipy.sparse as sparse
+    import scipy.sparse.csgraph as csgraph
+    import scipy.sparse.linalg as sparse_linalg
+except ImportError:
+    sparse = None
 
 # determine if the bar is statically determinate (and belongs to a truss)
 def StaticallyDeterminate(nodes,bars):                 
@@ -16,14 +31,25 @@ def StaticallyDeterminate(nodes,bars):
     
     # Determine number of (valid) reactions supported by nodes of the truss
     n_reactions = 0
-    for node in nodes:
-        if(any(node.ConstraintType())):
-            if(2 in node.ConstraintType()):
-                sys.exit("Truss cannot support a moment reaction force")
-            elif(-1 in node.ConstraintType()):
-                sys.exit("Invalid constraint type specified for the truss")
-            else:
-                n_reactions += len(node.ConstraintType())
+    model = ModelOf(nodes, bars)
+    if(model is not None):
+        flags = model.ConstraintFlags()
+        if(np.any(flags[:, 2])):
+            sys.exit("Truss cannot support a moment reaction force")
+        elif(np.any(flags[:, 3])):
+            sys.exit("Invalid constraint type specified for the truss")
+        n_reactions = int(np.count_nonzero(flags[:, :2]))
+    else:
+        for node in nodes:
+            # a roller_no_xdisp support has ConstraintType [0], so test the
+            # length rather than any()
+            if(len(node.ConstraintType()) > 0):
+                if(2 in node.ConstraintType()):
+                    sys.exit("Truss cannot support a moment reaction force")
+                elif(-1 in node.ConstraintType()):
+                    sys.exit("Invalid constraint type specified for the truss")
+                else:
+                    n_reactions += len(node.ConstraintType())
     
     # Compute if b + r = 2j (Equation 3-1 of the textbook)
     if(n_bars + n_reactions < 2*n_nodes):
@@ -33,66 +59,289 @@ def StaticallyDeterminate(nodes,bars):
     else:
         return True
  
-def ComputeReactions(nodes):
-    # assume that there is one pin and one roller for our statically determinate structure
-    n_pins = 0
-    n_roller = 0
-    for node in nodes:
-        if(node.constraint=="pin"):
-            pin_node = node
-            n_pins += 1
-        elif(node.constraint=="roller_no_xdisp"):
-            roller_node = node
-            n_roller += 1
-        elif(node.constraint=="roller_no_ydisp"):
-            roller_node = node
-            n_roller += 1
-    
-    if(n_pins != 1 or n_roller != 1):
-        sys.exit("A more clever way must be found to compute the reaction forces")
-    
-    # Continue from here
-    
-    # Extract Locations
-    [pin_x, pin_y] = pin_node.location
-    [roller_x, roller_y] = roller_node.location
-    
-    # Sum of moments about the pin
-    
-    roller_reaction = 0
-    for node in nodes:
-        [node_x,node_y] = node.location
-        roller_reaction += node.yforce_external * (node_x - pin_x)
-        roller_reaction += node.xforce_external * (pin_y - node_y)
-    if(roller_node.constraint=="roller_no_xdisp"):
-            roller_reaction = -roller_reaction/(pin_y - roller_y)
-            roller_node.AddReactionXForce(roller_reaction)
-    elif(roller_node.constraint=="roller_no_ydisp"):
-            roller_reaction = -roller_reaction/(roller_x - pin_x)
-            roller_node.AddReactionYForce(roller_reaction)
-            
-    # sum of forces in y direction
-    sum_yforces=0
-    for node in nodes:
-        [node_x,node_y]=node.location
-        sum_yforces += node.yforce_external
-    if roller_node.constraint=="roller_no_xdisp":
-            reaction_pin_y = -sum_yforces
-            pin_node.AddReactionYForce(reaction_pin_y)
-    elif roller_node.constraint=="roller_no_ydisp":
-            reaction_pin_y= -sum_yforces - roller_reaction
-            pin_node.AddReactionYForce(reaction_pin_y)
-
-    # sum of forces in x direction
-    sum_xforces=0
-    for node in nodes:
-        [node_x,node_y]=node.location
-        sum_xforces += node.xforce_external
-    if roller_node.constraint=="roller_no_xdisp":
-            reaction_pin_x = -sum_xforces - roller_reaction
-            pin_node.AddReactionXForce(reaction_pin_x)
-    elif roller_node.constraint == "roller_no_ydisp":
-            reaction_pin_x = -sum_xforces
-            pin_node.AddReactionXForce(reaction_pin_x)
+# Reaction components supported by the nodes of a truss as arrays of node
+# rows and directions (0 for x, 1 for y, 2 for moment)
+def ReactionComponents(nodes):
+    model = ModelOf(nodes)
+    if(model is not None):
+        flags = model.ConstraintFlags()
+        if(np.any(flags[:, 3])):
+            sys.exit("Invalid constraint type specified for the truss")
+        rows, directions = np.nonzero(flags[:, :3])
+        return rows, directions
     
+    rows = []
+    directions = []
+    for row, node in enumerate(nodes):
+        constraint_type = node.ConstraintType()
+        if(-1 in constraint_type):
+            sys.exit("Invalid constraint type specified for the truss")
+        for direction in sorted(constraint_type):
+            rows.append(row)
+            directions.append(direction)
+    return np.array(rows, dtype=np.int64), np.array(directions, dtype=np.int64)
+
+# 3 x r matrix of the contribution of each unit reaction to the global sums
+# of x forces, y forces and moments about the origin
+def GlobalEquilibriumMatrix(xy, rows, directions):
+    x = xy[rows, 0]
+    y = xy[rows, 1]
+    matrix = np.zeros((3, len(rows)))
+    matrix[0, directions == 0] = 1
+    matrix[1, directions == 1] = 1
+    matrix[2] = np.where(directions == 0, -y, np.where(directions == 1, x, 1.0))
+    return matrix
+
+# Global sums of x forces, y forces and moments about the origin of an
+# (n_cases, n_nodes, 2) array of external loads, as a (3, n_cases) array
+def GlobalLoadSums(xy, loads):
+    return np.vstack([loads[:, :, 0].sum(axis=1),
+                      loads[:, :, 1].sum(axis=1),
+                      loads[:, :, 1] @ xy[:, 0] - loads[:, :, 0] @ xy[:, 1]])
+
+# Describe why three reactions cannot be solved from global equilibrium:
+# their lines of action are either all parallel or meet at a single point
+def ReactionDeficiency(matrix, directions):
+    force_directions = matrix[:2, directions != 2]
+    if(np.linalg.matrix_rank(force_directions) <= 1):
+        return "parallel"
+    return "concurrent"
+
+# Solve the reactions of a truss for one or many load cases. loads is an
+# (n_cases, n_nodes, 2) array and defaults to the external loads on the
+# nodes. Returns the node rows and directions of the reactions and an
+# (n_cases, n_reactions) array of reactions.
+def SolveReactions(nodes, loads=None, bars=None):
+    xy = NodeCoordinates(nodes)
+    rows, directions = ReactionComponents(nodes)
+    if loads is None:
+        loads = ExternalForceVector(nodes).reshape(1, -1, 2)
+    loads = np.asarray(loads, dtype=float)
+    if(loads.ndim == 2):
+        loads = loads[None]
+    n_reactions = len(rows)
     
+    if(n_reactions < 3):
+        sys.exit("The supports provide %d reactions, fewer than the 3 needed for a stable truss" % n_reactions)
+    elif(n_reactions == 3):
+        # ΣFx = ΣFy = ΣM = 0 for the whole truss
+        matrix = GlobalEquilibriumMatrix(xy, rows, directions)
+        # scale the moment row to unit size so the rank test is independent
+        # of the length units
+        scaled = matrix.copy()
+        scaled[2] /= max(np.abs(matrix[2]).max(), np.finfo(float).tiny)
+        if(np.linalg.matrix_rank(scaled) < 3):
+            sys.exit("The reactions are %s, so the truss is geometrically unstable"
+                     % ReactionDeficiency(matrix, directions))
+        reactions = np.linalg.solve(matrix, -GlobalLoadSums(xy, loads)).T
+    else:
+        # more reactions than global equilibrium equations: the reactions
+        # are only determinate together with the equilibrium of every joint
+        if bars is None:
+            model = ModelOf(nodes)
+            if(model is None):
+                sys.exit("The bars are needed to compute more than 3 reactions")
+            bars = model.bars
+        bar_forces, reactions = EquilibriumFactorization(nodes, bars).SolveLoadCases(loads)
+    return rows, directions, reactions
+
+# Compute reaction forces at the supports from the external loads for any
+# statically determinate set of supports
+def ComputeReactions(nodes, bars=None):
+    rows, directions, reactions = SolveReactions(nodes, bars=bars)
+    for row, direction, reaction in zip(rows, directions, reactions[0]):
+        node = nodes[row]
+        if(direction == 0):
+            node.AddReactionXForce(float(reaction))
+        elif(direction == 1):
+            node.AddReactionYForce(float(reaction))
+        else:
+            node.AddReactionMoment(float(reaction))
+
+# Unstable trusses with at most this many equilibrium equations get all of
+# their mechanism modes from a dense SVD; larger ones get their modes from
+# block inverse iteration, starting with MECHANISM_BLOCK_SIZE vectors and
+# doubling up to MAX_MECHANISM_BLOCK while every vector is a mechanism.
+# Without scipy larger trusses are only checked with the counting rule per
+# connected component.
+DENSE_STABILITY_DOFS = 1000
+# Singular values (relative to the largest) below this are taken as zero
+STABILITY_TOLERANCE = 1e-9
+MECHANISM_BLOCK_SIZE = 6
+MAX_MECHANISM_BLOCK = 48
+
+# Label the connected component of every node (union-find over the bars)
+def ConnectedComponents(n_nodes, conn):
+    conn = np.asarray(conn, dtype=np.int64).reshape(-1, 2)
+    if sparse is not None:
+        graph = sparse.coo_matrix((np.ones(len(conn)), (conn[:, 0], conn[:, 1])), shape=(n_nodes, n_nodes))
+        n_components, labels = csgraph.connected_components(graph, directed=False)
+        return labels
+
+    parent = list(range(n_nodes))
+    def Find(row):
+        while parent[row] != row:
+            # path halving
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+    for init, end in conn.tolist():
+        root_init, root_end = Find(init), Find(end)
+        if(root_init != root_end):
+            parent[max(root_init, root_end)] = min(root_init, root_end)
+    roots = np.array([Find(row) for row in range(n_nodes)], dtype=np.int64)
+    return np.unique(roots, return_inverse=True)[1].ravel()
+
+# Left null space of a dense equilibrium matrix A (the mechanism modes u
+# with A^T u = 0) and its numerical rank from a singular value decomposition
+def DenseMechanisms(matrix, tolerance):
+    U, sigma, Vt = np.linalg.svd(matrix, full_matrices=True)
+    largest = sigma[0] if len(sigma) else 0.0
+    rank = int(np.count_nonzero(sigma > tolerance * max(largest, np.finfo(float).tiny)))
+    return rank, U[:, rank:].T
+
+# Screen a sparse equilibrium matrix for rank deficiency with one sparse
+# LU of A (or of A A^T when A is not square). Returns whether every pivot
+# is well away from zero and whether the factorization found the matrix
+# exactly singular. A failed screen on a long, flexible truss is only a
+# false alarm that costs the mechanism search.
+def PivotScreen(matrix, tolerance):
+    square = matrix.shape[0] == matrix.shape[1]
+    screened = matrix.tocsc() if square else (matrix @ matrix.T).tocsc()
+    try:
+        pivots = np.abs(sparse_linalg.splu(screened).U.diagonal())
+    except RuntimeError:
+        return False, True
+    return bool(np.all(pivots > tolerance * pivots.max(initial=0))), False
+
+# Mechanism modes of a large sparse equilibrium matrix by a few steps of
+# block inverse iteration on A A^T, shifted just enough to be factored.
+# The modes are the directions u of the iterated space with |A^T u| below
+# the tolerance. The block is doubled, up to max_block vectors, while all
+# of its vectors are modes. Returns the rank, the modes and whether the
+# rank is exact; it is only an upper bound when the block could not grow
+# any further, or when the LU found A exactly singular but no mode could
+# be isolated.
+def IterativeMechanisms(matrix, tolerance, exactly_singular=False, block_size=MECHANISM_BLOCK_SIZE,
+                        max_block=MAX_MECHANISM_BLOCK, n_steps=6):
+    n_dofs = matrix.shape[0]
+    normal = (matrix @ matrix.T).tocsc()
+    shift = 1e3 * np.finfo(float).eps * abs(normal).sum(axis=1).max()
+    lu = sparse_linalg.splu((normal + shift * sparse.identity(n_dofs)).tocsc())
+    rng = np.random.default_rng(0)
+    n_vectors = min(block_size, n_dofs)
+    while True:
+        basis = rng.standard_normal((n_dofs, n_vectors))
+        for step in range(n_steps):
+            basis = np.linalg.qr(lu.solve(basis))[0]
+
+        # directions of the iterated space in order of decreasing |A^T u|
+        U, sigma, Vt = np.linalg.svd(matrix.T @ basis, full_matrices=False)
+        null = sigma <= tolerance * sparse_linalg.norm(matrix, 1)
+        n_null = int(np.count_nonzero(null))
+        if(n_null < n_vectors or n_vectors >= min(max_block, n_dofs)):
+            break
+        n_vectors = min(2*n_vectors, max_block, n_dofs)
+
+    mechanisms = (basis @ Vt.T)[:, null].T
+    if(exactly_singular and n_null == 0):
+        # on very long trusses A A^T cannot separate a mechanism from the
+        # most flexible modes; the LU proved that there is at least one
+        return n_dofs - 1, mechanisms, False
+    return n_dofs - n_null, mechanisms, n_null < n_vectors or n_vectors == n_dofs
+
+# Rank bound from the counting rule b + r >= 2j applied to every connected
+# component, and the nodes of the components that fail it
+def ComponentDeficiency(components, conn, reaction_dofs):
+    n_components = int(components.max()) + 1 if len(components) else 0
+    n_nodes = np.bincount(components, minlength=n_components)
+    n_bars = np.bincount(components[np.asarray(conn)[:, 0]], minlength=n_components)
+    n_reactions = np.bincount(components[reaction_dofs // 2], minlength=n_components)
+    deficit = np.maximum(2*n_nodes - n_bars - n_reactions, 0)
+    return int(deficit.sum()), np.flatnonzero(deficit[components] > 0)
+
+# Result of a stability check. mechanisms is an (n_mechanisms, n_nodes, 2)
+# array of nodal displacement modes that no bar or support resists, and
+# offending_nodes are the node rows that move in any of them. When exact
+# is False the rank is only an upper bound (so n_mechanisms and the degree
+# of indeterminacy are lower bounds), and not every mode may be given.
+# is_stable is None when no mechanism was found but the rank is a bound.
+class StabilityReport:
+
+    def __init__(self, n_nodes, n_bars, n_reactions, rank, mechanisms, components, offending_nodes=None,
+                 exact=True):
+        self.n_nodes = n_nodes
+        self.n_bars = n_bars
+        self.n_reactions = n_reactions
+        self.rank = rank
+        self.exact = exact
+        self.n_dofs = 2*n_nodes
+        self.mechanisms = np.asarray(mechanisms).reshape(-1, n_nodes, 2)
+        self.components = components
+        self.n_components = int(components.max()) + 1 if len(components) else 0
+        self.is_stable = rank == self.n_dofs if exact or rank < self.n_dofs else None
+        # number of redundant bars and reactions
+        self.degree_of_indeterminacy = n_bars + n_reactions - rank
+
+        if(offending_nodes is None):
+            motion = np.abs(self.mechanisms).max(axis=(0, 2)) if len(self.mechanisms) else np.zeros(n_nodes)
+            offending_nodes = np.flatnonzero(motion > 1e-6 * max(motion.max(initial=0), np.finfo(float).tiny))
+        self.offending_nodes = offending_nodes
+
+    @property
+    def n_mechanisms(self):
+        return self.n_dofs - self.rank
+
+    def Message(self, node_labels=None):
+        if(self.is_stable):
+            return "The truss is geometrically stable"
+        if(self.is_stable is None):
+            return ("The geometric stability of the truss could not be verified; only the counting rule "
+                    "b + r >= 2j holds for every connected part")
+        offending = self.offending_nodes if node_labels is None else np.asarray(node_labels)[self.offending_nodes]
+        message = "The truss is geometrically unstable: %s%d mechanism modes" % (
+            '' if self.exact else 'at least ', self.n_mechanisms)
+        if(len(offending) > 0):
+            message += " involving nodes %s" % offending[:20].tolist()
+        else:
+            message += " that could not be isolated"
+        if(self.n_components > 1):
+            message += " (the bars form %d disconnected parts)" % self.n_components
+        return message
+
+# Pre-solve stability analysis: connected components of the bar graph and
+# the numerical rank of the equilibrium matrix, with the mechanism modes
+# and the nodes that move in them when the truss is unstable
+def CheckStability(nodes, bars, tolerance=STABILITY_TOLERANCE):
+    matrix, reaction_dofs = AssembleEquilibriumMatrix(nodes, bars)
+    conn = BarConnectivity(nodes, bars)
+    components = ConnectedComponents(len(nodes), conn)
+    n_dofs = matrix.shape[0]
+    if(sparse is None and n_dofs > DENSE_STABILITY_DOFS):
+        deficit, offending_nodes = ComponentDeficiency(components, conn, reaction_dofs)
+        return StabilityReport(len(nodes), len(bars), len(reaction_dofs), n_dofs - deficit,
+                               np.zeros((0, n_dofs)), components, offending_nodes, exact=False)
+    exact = True
+    if sparse is None:
+        rank, mechanisms = DenseMechanisms(matrix, tolerance)
+    else:
+        # stable trusses of any size only pay for the pivot screen
+        stable, exactly_singular = PivotScreen(matrix, tolerance)
+        if(stable):
+            rank, mechanisms = n_dofs, np.zeros((0, n_dofs))
+        elif(n_dofs <= DENSE_STABILITY_DOFS):
+            rank, mechanisms = DenseMechanisms(matrix.toarray(), tolerance)
+        else:
+            rank, mechanisms, exact = IterativeMechanisms(matrix, tolerance, exactly_singular)
+    return StabilityReport(len(nodes), len(bars), len(reaction_dofs), rank, mechanisms, components, exact=exact)
+
+# determine if the truss is geometrically stable, exiting with the
+# mechanism and offending nodes if it is not. Returns True, or None (after
+# printing why) when stability could not be verified.
+def GeometricallyStable(nodes, bars):
+    report = CheckStability(nodes, bars)
+    if report.is_stable is None:
+        print(report.Message())
+    elif not report.is_stable:
+        sys.exit(report.Message([node.idx for node in nodes]))
+    return report.is_stable
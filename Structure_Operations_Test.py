@@ -6,7 +6,12 @@ Created on Mon Jan 20 08:20:47 2025
 @author: kendrickshepherd
 """
 
+from unittest import mock
+import numpy as np
 import Main_for_Final_Testing as Main_for_Testing
+import Structure_Operations as so
+import Truss_Generator as generator
+from Classes import TrussModel
 
 import unittest
 
@@ -38,5 +43,174 @@ class TestStructureOperations(unittest.TestCase):
         self.assertAlmostEqual(125.39385, nodes[0].yforce_reaction, decimal_place)
         self.assertAlmostEqual(191.0275, nodes[4].yforce_reaction, decimal_place)
 
+class TestGeneralReactions(unittest.TestCase):
+
+    def test_Fixed_Support(self):
+        model = TrussModel.FromArrays([[0, 0], [3, 0]], [[0, 1]], ['fixed', ''], [[0, 0], [0, -2]])
+        so.ComputeReactions(model.nodes)
+        decimal_place = 6
+        
+        self.assertAlmostEqual(0, model.nodes[0].xforce_reaction, decimal_place)
+        self.assertAlmostEqual(2, model.nodes[0].yforce_reaction, decimal_place)
+        self.assertAlmostEqual(6, model.nodes[0].moment_reaction, decimal_place)
+
+    def test_Parallel_Reactions(self):
+        model = TrussModel.FromArrays([[0, 0], [4, 0], [8, 0]], [[0, 1], [1, 2]],
+                                      ['roller_no_ydisp']*3, [[0, 0], [0, -1], [0, 0]])
+        with self.assertRaises(SystemExit) as context:
+            so.ComputeReactions(model.nodes)
+        self.assertIn("parallel", str(context.exception))
+
+    def test_Concurrent_Reactions(self):
+        model = TrussModel.FromArrays([[0, 0], [0, 5], [4, 0]], [[0, 1], [1, 2], [0, 2]],
+                                      ['pin', 'roller_no_ydisp', ''], [[0, 0], [0, 0], [0, -1]])
+        with self.assertRaises(SystemExit) as context:
+            so.ComputeReactions(model.nodes)
+        self.assertIn("concurrent", str(context.exception))
+
+    def test_Two_Pins(self):
+        # two pins and two bars: b + r = 2j with four reactions
+        model = TrussModel.FromArrays([[0, 0], [4, 0], [2, 2]], [[0, 2], [1, 2]],
+                                      ['pin', 'pin', ''], [[0, 0], [0, 0], [0, -10]])
+        self.assertTrue(so.StaticallyDeterminate(model.nodes, model.bars))
+        so.ComputeReactions(model.nodes)
+        decimal_place = 6
+        
+        self.assertAlmostEqual(5, model.nodes[0].xforce_reaction, decimal_place)
+        self.assertAlmostEqual(-5, model.nodes[1].xforce_reaction, decimal_place)
+        self.assertAlmostEqual(5, model.nodes[0].yforce_reaction, decimal_place)
+        self.assertAlmostEqual(5, model.nodes[1].yforce_reaction, decimal_place)
+
+    def test_Roller_No_Xdisp(self):
+        # a pin and an x roller at the apex: b + r = 3 + 3 = 2j
+        model = TrussModel.FromArrays([[0, 0], [4, 0], [2, 3]], [[0, 1], [1, 2], [0, 2]],
+                                      ['pin', '', 'roller_no_xdisp'], [[0, 0], [0, -6], [0, 0]])
+        self.assertTrue(so.StaticallyDeterminate(model.nodes, model.bars))
+        self.assertTrue(so.StaticallyDeterminate(list(model.nodes), list(model.bars)))
+        so.ComputeReactions(model.nodes)
+        decimal_place = 6
+
+        self.assertAlmostEqual(6, model.nodes[0].yforce_reaction, decimal_place)
+        self.assertAlmostEqual(-model.nodes[0].xforce_reaction, model.nodes[2].xforce_reaction, decimal_place)
+
+    def test_Batched_Reactions_Example_3_3(self):
+        nodes,bars = Main_for_Testing.LoadCSV("Example_3_3.csv")
+        loads = np.stack([nodes.model.force_external, 3*nodes.model.force_external])
+        rows, directions, reactions = so.SolveReactions(nodes, loads)
+        decimal_place = 3
+        
+        self.assertEqual([0, 0, 4], rows.tolist())
+        self.assertEqual([0, 1, 1], directions.tolist())
+        self.assertAlmostEqual(-141.42136, reactions[0, 0], decimal_place)
+        self.assertAlmostEqual(3*191.0275, reactions[1, 2], decimal_place)
+
+class TestStability(unittest.TestCase):
+
+    def test_Stable_Examples(self):
+        nodes, bars = Main_for_Testing.LoadCSV("Example_3_3.csv")
+        report = so.CheckStability(nodes, bars)
+
+        self.assertTrue(report.is_stable)
+        self.assertEqual(12, report.rank)
+        self.assertEqual(0, report.degree_of_indeterminacy)
+        self.assertEqual(1, report.n_components)
+
+    def test_Square_Panel_Mechanism(self):
+        # b + r = 2j, but the unbraced panel on two pins sways sideways
+        model = TrussModel.FromArrays([[0, 0], [1, 0], [1, 1], [0, 1]],
+                                      [[0, 1], [1, 2], [2, 3], [3, 0]],
+                                      ['pin', 'pin', '', ''])
+        self.assertTrue(so.StaticallyDeterminate(model.nodes, model.bars))
+        report = so.CheckStability(model.nodes, model.bars)
+
+        self.assertFalse(report.is_stable)
+        self.assertEqual(1, report.n_mechanisms)
+        self.assertEqual([2, 3], report.offending_nodes.tolist())
+        np.testing.assert_allclose([[0, 0], [0, 0], [1, 0], [1, 0]], np.abs(report.mechanisms[0])*np.sqrt(2), atol=1e-12)
+        with self.assertRaises(SystemExit) as context:
+            so.GeometricallyStable(model.nodes, model.bars)
+        self.assertEqual("The truss is geometrically unstable: 1 mechanism modes involving nodes [2, 3]",
+                         str(context.exception))
+
+    def test_Disconnected_Parts(self):
+        model = TrussModel.FromArrays([[0, 0], [1, 0], [0, 1], [5, 0], [6, 0], [5, 1]],
+                                      [[0, 1], [1, 2], [2, 0], [3, 4], [4, 5], [5, 3]],
+                                      ['pin', 'roller_no_ydisp', '', '', '', ''])
+        report = so.CheckStability(model.nodes, model.bars)
+
+        self.assertEqual(2, report.n_components)
+        self.assertEqual([0, 0, 0, 1, 1, 1], report.components.tolist())
+        self.assertEqual(3, report.n_mechanisms)
+        self.assertEqual([3, 4, 5], report.offending_nodes.tolist())
+        deficit, rows = so.ComponentDeficiency(report.components, model.conn, np.array([0, 1, 3]))
+        self.assertEqual(3, deficit)
+        self.assertEqual([3, 4, 5], rows.tolist())
+
+    def test_Counting_Rule_Is_Not_Verification(self):
+        # without scipy large trusses are only checked by counting, which
+        # misses the sway of a square panel on two pins
+        model = TrussModel.FromArrays([[0, 0], [1, 0], [1, 1], [0, 1]],
+                                      [[0, 1], [1, 2], [2, 3], [3, 0]],
+                                      ['pin', 'pin', '', ''])
+        with mock.patch.object(so, 'sparse', None), mock.patch.object(so, 'DENSE_STABILITY_DOFS', 4):
+            report = so.CheckStability(model.nodes, model.bars)
+            self.assertFalse(report.exact)
+            self.assertIsNone(report.is_stable)
+            self.assertIn("could not be verified", report.Message())
+            self.assertIsNone(so.GeometricallyStable(model.nodes, model.bars))
+
+            # a part that fails the counting rule is unstable for certain
+            model = TrussModel.FromArrays([[0, 0], [1, 0], [1, 1]], [[0, 1], [1, 2]], ['pin', '', ''])
+            report = so.CheckStability(model.nodes, model.bars)
+            self.assertFalse(report.is_stable)
+            self.assertEqual("The truss is geometrically unstable: at least 2 mechanism modes involving nodes [0, 1, 2]",
+                             report.Message())
+
+    @unittest.skipIf(so.sparse is None, "large trusses are only checked by counting without scipy")
+    def test_Large_Mechanism(self):
+        # move one diagonal of a long Pratt truss into another panel
+        model = generator.GenerateTruss('pratt', 1000)
+        conn = model.conn.copy()
+        conn[3*1000 - 1 + 4] = [1000 + 11, 10]
+        constraints = [model.nodes[row].constraint for row in range(model.n_nodes)]
+        unstable = TrussModel.FromArrays(model.xy, conn, constraints)
+
+        self.assertTrue(so.CheckStability(model.nodes, model.bars).is_stable)
+        report = so.CheckStability(unstable.nodes, unstable.bars)
+        self.assertEqual(1, report.n_mechanisms)
+        # the panel with two diagonals has one redundant bar
+        self.assertEqual(1, report.degree_of_indeterminacy)
+
+    @unittest.skipIf(so.sparse is None, "large trusses are only checked by counting without scipy")
+    def test_Many_Large_Mechanisms(self):
+        # every bar of a determinate truss is needed, so removing k bars
+        # leaves k mechanisms
+        model = generator.GenerateTruss('pratt', 1000)
+        constraints = [model.nodes[row].constraint for row in range(model.n_nodes)]
+        for n_removed in (10, 60):
+            keep = np.ones(model.n_bars, dtype=bool)
+            keep[np.linspace(50, model.n_bars - 50, n_removed).astype(int)] = False
+            unstable = TrussModel.FromArrays(model.xy, model.conn[keep], constraints)
+            report = so.CheckStability(unstable.nodes, unstable.bars)
+            self.assertFalse(report.is_stable)
+            if(n_removed <= so.MAX_MECHANISM_BLOCK):
+                self.assertTrue(report.exact)
+                self.assertEqual(n_removed, report.n_mechanisms)
+            else:
+                # more mechanisms than the largest block are only a bound
+                self.assertFalse(report.exact)
+                self.assertEqual(so.MAX_MECHANISM_BLOCK, report.n_mechanisms)
+                self.assertIn("at least %d mechanism modes" % so.MAX_MECHANISM_BLOCK, report.Message())
+            self.assertEqual(report.n_mechanisms, len(report.mechanisms))
+
+        # a singular matrix without an isolated mode yields no made-up mode
+        matrix = so.AssembleEquilibriumMatrix(model.nodes, model.bars)[0]
+        rank, mechanisms, exact = so.IterativeMechanisms(matrix, 0.0, exactly_singular=True)
+        self.assertEqual((matrix.shape[0] - 1, 0, False), (rank, len(mechanisms), exact))
+        report = so.StabilityReport(model.n_nodes, model.n_bars, 3, rank, mechanisms,
+                                    np.zeros(model.n_nodes, dtype=np.int64), exact=exact)
+        self.assertEqual("The truss is geometrically unstable: at least 1 mechanism modes that could not be isolated",
+                         report.Message())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:02:39 2026
+
+Parametric Pratt, Howe, Warren, gabled and scissor trusses of any size
+
+Every truss spans from a pin at the left end of the bottom chord to a roller
+at the right end and is statically determinate (b + r = 2j). A downward load
+is applied at every interior bottom chord node.
+"""
+
+import sys
+import numpy as np
+from Classes import TrussModel
+
+TRUSS_KINDS = ('pratt', 'howe', 'warren', 'gabled', 'scissor')
+
+DEFAULT_SECTION = 'W Shapes:W12X26'
+DEFAULT_MATERIAL = 'Steel ASTM A36'
+
+# Pratt or Howe diagonals of panels 1 .. n-2 between a bottom chord
+# (rows bottom[0..n]) and the nodes above it (rows top[1..n-1]). Pratt
+# diagonals slope down towards the middle of the span, Howe diagonals up.
+def PanelDiagonals(bottom, top, n_panels, pratt=True):
+    panels = np.arange(1, n_panels - 1)
+    left = panels < n_panels / 2
+    if(pratt):
+        upper = np.where(left, panels, panels + 1)
+        lower = np.where(left, panels + 1, panels)
+    else:
+        upper = np.where(left, panels + 1, panels)
+        lower = np.where(left, panels, panels + 1)
+    return np.column_stack([top[upper], bottom[lower]])
+
+# Node coordinates and connectivity of a truss with vertical posts: a bottom
+# chord of n_panels + 1 nodes with heights bottom_y, a top chord node above
+# every interior bottom node with heights top_y, posts, and Pratt or Howe
+# diagonals. The end panels are closed by the first and last top chord bars.
+def PostedTruss(n_panels, span, bottom_y, top_y, pratt=True):
+    x = np.linspace(0, span, n_panels + 1)
+    bottom = np.arange(n_panels + 1)
+    top = np.concatenate([[0], n_panels + np.arange(1, n_panels), [n_panels]])
+    xy = np.vstack([np.column_stack([x, bottom_y]), np.column_stack([x[1:-1], top_y[1:-1]])])
+
+    conn = np.vstack([np.column_stack([bottom[:-1], bottom[1:]]),
+                      np.column_stack([top[:-1], top[1:]]),
+                      np.column_stack([bottom[1:-1], top[1:-1]]),
+                      PanelDiagonals(bottom, top, n_panels, pratt)])
+    return xy, conn
+
+# Node coordinates and connectivity of a Warren truss: top chord nodes at
+# the middle of every panel and alternating diagonals
+def WarrenTruss(n_panels, span, height):
+    x = np.linspace(0, span, n_panels + 1)
+    bottom = np.arange(n_panels + 1)
+    top = n_panels + 1 + np.arange(n_panels)
+    xy = np.vstack([np.column_stack([x, np.zeros(n_panels + 1)]),
+                    np.column_stack([(x[:-1] + x[1:]) / 2, np.full(n_panels, float(height))])])
+    conn = np.vstack([np.column_stack([bottom[:-1], bottom[1:]]),
+                      np.column_stack([top[:-1], top[1:]]),
+                      np.column_stack([bottom[:-1], top]),
+                      np.column_stack([top, bottom[1:]])])
+    return xy, conn
+
+# Build a truss of a given kind with n_panels panels as a TrussModel
+def GenerateTruss(kind, n_panels, span=None, height=None, load=-10.0,
+                  section=DEFAULT_SECTION, material=DEFAULT_MATERIAL):
+    kind = kind.lower()
+    if(kind not in TRUSS_KINDS):
+        sys.exit("Unknown truss kind %s, expected one of %s" % (kind, list(TRUSS_KINDS)))
+    if(n_panels < 2):
+        sys.exit("A truss needs at least 2 panels")
+    elif(kind in ('gabled', 'scissor') and n_panels % 2 != 0):
+        sys.exit("A %s truss needs an even number of panels" % kind)
+    if(span is None):
+        span = 10.0 * n_panels
+    if(height is None):
+        height = span / 8 if kind in ('gabled', 'scissor') else span / n_panels
+
+    if(kind == 'warren'):
+        xy, conn = WarrenTruss(n_panels, span, height)
+    else:
+        # pitched chords rise linearly from the supports to mid span
+        pitch = 1 - np.abs(np.arange(n_panels + 1) - n_panels / 2) / (n_panels / 2)
+        if(kind in ('pratt', 'howe')):
+            bottom_y = np.zeros(n_panels + 1)
+            top_y = np.full(n_panels + 1, float(height))
+        elif(kind == 'gabled'):
+            bottom_y = np.zeros(n_panels + 1)
+            top_y = height * pitch
+        else:
+            bottom_y = height / 2 * pitch
+            top_y = height * pitch
+        xy, conn = PostedTruss(n_panels, span, bottom_y, top_y, pratt=(kind != 'howe'))
+
+    constraints = np.full(len(xy), '', dtype=object)
+    constraints[0] = 'pin'
+    constraints[n_panels] = 'roller_no_ydisp'
+    forces = np.zeros((len(xy), 2))
+    forces[1:n_panels, 1] = load
+
+    model = TrussModel.FromArrays(xy, conn, constraints.astype(str), forces)
+    model.section_names[0] = section
+    model.material_names[0] = material
+    model.BuildIncidence()
+    return model
+
+# Number of panels that gives a truss of a kind roughly n_bars bars
+def PanelsForBars(kind, n_bars):
+    n_panels = max(2, int(round((n_bars + 3) / 4)))
+    if(kind in ('gabled', 'scissor') and n_panels % 2 != 0):
+        n_panels += 1
+    return n_panels
+
+# Write a model in the truss CSV format read by LoadData
+def WriteTrussCSV(model, path):
+    if(model.incidence_ptr is None):
+        model.BuildIncidence()
+    bar_idxs = model.incidence_bars.astype(str).tolist()
+    ptr = model.incidence_ptr.tolist()
+    node_bars = (';'.join(bar_idxs[ptr[row]:ptr[row + 1]]) for row in range(model.n_nodes))
+    list_idx = model.node_list_idx.tolist()
+    constraint = model.constraint_names
+    section = model.section_names
+    material = model.material_names
+    with open(path, 'w', newline='') as f:
+        f.write("Nodes ,,,,,,,\n")
+        f.write("Index,Xcoord (ft),Ycoord (ft),Constraint,Xforce (kip),Yforce (kip),ZForce(kip-ft),BarIdxs\n")
+        f.writelines("%d,%r,%r,%s,%r,%r,0,%s\n" % (idx, x, y, constraint[code], fx, fy, incident)
+                     for idx, (x, y), code, (fx, fy), incident
+                     in zip(list_idx, model.xy.tolist(), model.constraint_code.tolist(),
+                            model.force_external.tolist(), node_bars))
+        f.write("Bars,,,,,,,\n")
+        f.write("Index,Start Node,End Node,Section Type,Material,,,\n")
+        f.writelines("%d,%d,%d,%s,%s,,,\n" % (k, list_idx[init], list_idx[end], section[s], material[m])
+                     for k, ((init, end), s, m)
+                     in enumerate(zip(model.conn.tolist(), model.section_code.tolist(),
+                                      model.material_code.tolist())))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:58:20 2026
+
+Tests for the truss generator and the scaling benchmark
+"""
+
+import os
+import tempfile
+import numpy as np
+import Benchmark_Truss as benchmark
+import Truss_Generator as generator
+from ImportCSVData import LoadData
+from Equilibrium_Matrix import SolveUsingEquilibriumMatrix
+from Method_of_Joints import IterateUsingMethodOfJoints
+from Structure_Operations import StaticallyDeterminate
+from Structure_Operations import ComputeReactions
+
+import unittest
+
+class TestTrussGenerator(unittest.TestCase):
+
+    def test_All_Kinds_Are_Determinate_And_Solvable(self):
+        for kind in generator.TRUSS_KINDS:
+            for n_panels in (2, 6, 9):
+                if(kind in ('gabled', 'scissor') and n_panels % 2 != 0):
+                    continue
+                model = generator.GenerateTruss(kind, n_panels)
+                nodes, bars = model.nodes, model.bars
+                self.assertEqual(2*model.n_nodes, model.n_bars + 3)
+                self.assertTrue(StaticallyDeterminate(nodes, bars))
+
+                SolveUsingEquilibriumMatrix(nodes, bars)
+                matrix_forces = model.axial_load.copy()
+                model.ResetResults()
+                ComputeReactions(nodes)
+                IterateUsingMethodOfJoints(nodes, bars)
+                np.testing.assert_allclose(matrix_forces, model.axial_load, atol=1e-9)
+
+    def test_Pratt_Forces(self):
+        # 4 panels of 10 ft, 10 ft deep, 10 kip loads: 15 kip reactions
+        model = generator.GenerateTruss('pratt', 4)
+        SolveUsingEquilibriumMatrix(model.nodes, model.bars)
+
+        self.assertEqual(13, model.n_bars)
+        self.assertAlmostEqual(15, model.reaction[0, 1])
+        self.assertAlmostEqual(15, model.axial_load[0])
+        self.assertAlmostEqual(-20, model.axial_load[5])
+        self.assertAlmostEqual(10, model.axial_load[8])
+        self.assertAlmostEqual(0, model.axial_load[9])
+
+    def test_CSV_Round_Trip(self):
+        model = generator.GenerateTruss('scissor', 8)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "scissor.csv")
+            generator.WriteTrussCSV(model, path)
+            nodes, bars = LoadData(path)
+
+        np.testing.assert_array_equal(model.xy, nodes.model.xy)
+        np.testing.assert_array_equal(model.conn, nodes.model.conn)
+        np.testing.assert_array_equal(model.force_external, nodes.model.force_external)
+        self.assertEqual('roller_no_ydisp', nodes[8].constraint)
+        self.assertEqual(generator.DEFAULT_SECTION, bars[3].section)
+        self.assertEqual([0, 1, 16], [bar.idx for bar in nodes[1].bars])
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_Benchmark_And_Compare(self):
+        results = benchmark.RunBenchmarks(('warren',), (10, 200), repeat=1)
+        result = results['results']['warren/200']
+
+        self.assertEqual(set(benchmark.BENCHMARK_PHASES), set(result['phases']))
+        self.assertGreater(result['peak_memory'], 0)
+        self.assertEqual([], benchmark.CompareToBaseline(results, results))
+
+        faster = {'results': {'warren/200': {'phases': {'LoadData': {'time': 1e-9, 'peak_memory': 1}}}}}
+        regressions = benchmark.CompareToBaseline(results, faster, min_time=0)
+        self.assertEqual({('warren/200', 'LoadData', 'time'), ('warren/200', 'LoadData', 'peak_memory')},
+                         {regression[:3] for regression in regressions})
+
+if __name__ == '__main__':
+    unittest.main()
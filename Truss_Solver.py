@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:20:37 2026
+
+Reusable truss solver that keeps matrix factorizations in an LRU cache
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from Classes import ModelOf
+from Equilibrium_Matrix import EquilibriumFactorization
+from Direct_Stiffness import StiffnessFactorization
+
+FACTORIZATION_CACHE_SIZE = 8
+SOLVER_METHODS = ('auto', 'equilibrium', 'stiffness')
+
+# Least recently used cache of factorizations keyed by a structure hash.
+# Every access holds a lock, so threads can share one cache.
+class FactorizationCache:
+
+    def __init__(self, max_entries=FACTORIZATION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    # Cached factorization of a key (None if absent), marked as recently used
+    def Get(self, key):
+        with self.lock:
+            factorization = self.entries.get(key)
+            if(factorization is None):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return factorization
+
+    # Store a factorization, evicting the least recently used ones
+    def Put(self, key, factorization):
+        with self.lock:
+            self.entries[key] = factorization
+            self.entries.move_to_end(key)
+            while(len(self.entries) > self.max_entries):
+                self.entries.popitem(last=False)
+
+    def Discard(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def Clear(self):
+        with self.lock:
+            self.entries.clear()
+
+# cache shared by every solver that is not given its own
+DEFAULT_FACTORIZATION_CACHE = FactorizationCache()
+
+# Hash of everything a factorization depends on: node coordinates, bar
+# connectivity and supports, plus the section and material of every bar
+# (or the given axial stiffnesses) for the stiffness method
+def StructureKey(model, method, EA=None):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(method.encode())
+    digest.update(np.asarray(model.xy.shape, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(model.xy, dtype=float).tobytes())
+    digest.update(np.ascontiguousarray(model.conn, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(model.ConstraintFlags()).tobytes())
+    if(method == 'stiffness'):
+        if EA is None:
+            for names, codes in ((model.section_names, model.section_code),
+                                 (model.material_names, model.material_code)):
+                digest.update('\n'.join(names).encode() + b'\0')
+                digest.update(np.ascontiguousarray(codes, dtype=np.int64).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(np.asarray(EA, dtype=float) * np.ones(model.n_bars)).tobytes())
+    return digest.hexdigest()
+
+# Solver for the nodes and bars returned by LoadData. The system matrix is
+# factored once (the equilibrium matrix LU for a statically determinate
+# truss, the stiffness matrix otherwise) and later solves only run the
+# forward and back substitutions.
+class TrussSolver:
+
+    def __init__(self, nodes, bars, method='auto', EA=None, cache=None):
+        self.model = ModelOf(nodes, bars)
+        if(self.model is None):
+            sys.exit("The truss solver needs the nodes and bars of a loaded truss model")
+        if(method not in SOLVER_METHODS):
+            sys.exit("Unknown solver method %s, expected one of %s" % (method, list(SOLVER_METHODS)))
+        self.nodes = nodes
+        self.bars = bars
+        self.method = method
+        self.EA = EA
+        self.cache = DEFAULT_FACTORIZATION_CACHE if cache is None else cache
+        self._revision = None
+        self._method = None
+        self._key = None
+
+    # Method used for the current structure: the equilibrium matrix when it
+    # is square (b + r = 2j), the stiffness matrix otherwise
+    def ResolvedMethod(self):
+        self._Refresh()
+        return self._method
+
+    # Hash of the current structure, recomputed only after it has changed
+    def Key(self):
+        self._Refresh()
+        return self._key
+
+    def _Refresh(self):
+        if(self._revision == self.model.revision):
+            return
+        method = self.method
+        if(method == 'auto'):
+            n_reactions = np.count_nonzero(self.model.SupportMask())
+            method = 'equilibrium' if self.model.n_bars + n_reactions == 2*self.model.n_nodes else 'stiffness'
+        self._method = method
+        self._key = StructureKey(self.model, method, self.EA)
+        self._revision = self.model.revision
+
+    # Factorization of the current structure, from the cache when possible
+    def Factorization(self):
+        key = self.Key()
+        factorization = self.cache.Get(key)
+        if(factorization is None):
+            if(self._method == 'equilibrium'):
+                factorization = EquilibriumFactorization(self.nodes, self.bars)
+            else:
+                factorization = StiffnessFactorization(self.model, self.EA)
+            self.cache.Put(key, factorization)
+        return factorization
+
+    # Drop the cached factorization of the current structure so that the
+    # next solve refactors it
+    def Invalidate(self):
+        self.cache.Discard(self.Key())
+        self._revision = None
+
+    @property
+    def reaction_dofs(self):
+        return self.Factorization().reaction_dofs
+
+    # Solve an (n_cases, n_nodes, 2) array of external nodal loads. Returns
+    # bar forces (n_cases, n_bars), reactions (n_cases, n_reactions) ordered
+    # like reaction_dofs and displacements (n_cases, n_nodes, 2), which are
+    # None for the equilibrium method.
+    def SolveLoadCases(self, loads):
+        factorization = self.Factorization()
+        if(self._method == 'equilibrium'):
+            bar_forces, reactions = factorization.SolveLoadCases(loads)
+            return bar_forces, reactions, None
+        displacements, bar_forces, reactions = factorization.SolveLoadCases(loads)
+        return bar_forces, reactions, displacements
+
+    # Solve the external loads of the model and store the results on the
+    # nodes and bars
+    def Solve(self):
+        model = self.model
+        bar_forces, reactions, displacements = self.SolveLoadCases(model.force_external)
+        model.axial_load[:] = bar_forces[0]
+        model.is_computed[:] = True
+        model.reaction.ravel()[self.reaction_dofs] = reactions[0]
+        if(displacements is not None):
+            model.displacement[:] = displacements[0]
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:48:02 2026
+
+Tests for the cached truss solver
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import Main_for_Final_Testing as Main
+import Truss_Solver as ts
+
+import unittest
+
+class TestTrussSolver(unittest.TestCase):
+
+    def test_Determinate_Uses_Equilibrium_Matrix(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        solver = ts.TrussSolver(nodes, bars, cache=ts.FactorizationCache())
+        solver.Solve()
+
+        self.assertEqual('equilibrium', solver.ResolvedMethod())
+        self.assertAlmostEqual(-692.781, bars[0].axial_load, 2)
+        self.assertAlmostEqual(521.896, bars[8].axial_load, 2)
+
+    def test_Repeated_Solves_Reuse_Factorization(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        cache = ts.FactorizationCache()
+        solver = ts.TrussSolver(nodes, bars, cache=cache)
+        first = solver.SolveLoadCases(nodes.model.force_external)[0]
+        second = solver.SolveLoadCases(2*nodes.model.force_external)[0]
+
+        # a second solver on an identical truss shares the cached factor
+        nodes_2, bars_2 = Main.LoadCSV("Example_3_3.csv")
+        ts.TrussSolver(nodes_2, bars_2, cache=cache).SolveLoadCases(nodes_2.model.force_external)
+
+        self.assertEqual((1, 2), (cache.misses, cache.hits))
+        self.assertEqual(1, len(cache))
+        np.testing.assert_allclose(2*first, second)
+
+    def test_Changes_Invalidate_Factorization(self):
+        nodes, bars = Main.LoadCSV("Example_3_3.csv")
+        cache = ts.FactorizationCache()
+        solver = ts.TrussSolver(nodes, bars, method='stiffness', cache=cache)
+        key = solver.Key()
+
+        bars[0].AddSection(bars[7].section)
+        self.assertNotEqual(key, solver.Key())
+        bars[0].AddSection(bars[2].section)
+        self.assertEqual(key, solver.Key())
+
+        location = nodes[1].location
+        nodes[1].AddLocation([location[0], location[1] + 1])
+        self.assertNotEqual(key, solver.Key())
+        nodes[1].AddLocation(location)
+
+        nodes[0].AddConstraint('roller_no_ydisp')
+        self.assertNotEqual(key, solver.Key())
+
+    def test_Explicit_Invalidate_And_Eviction(self):
+        nodes, bars = Main.LoadCSV("Example_3_2.csv")
+        cache = ts.FactorizationCache(max_entries=1)
+        solver = ts.TrussSolver(nodes, bars, cache=cache)
+        solver.Solve()
+        self.assertIn(solver.Key(), cache)
+
+        solver.Invalidate()
+        self.assertEqual(0, len(cache))
+
+        solver.Solve()
+        ts.TrussSolver(nodes, bars, method='stiffness', cache=cache).Solve()
+        self.assertNotIn(solver.Key(), cache)
+        self.assertEqual(1, len(cache))
+        self.assertAlmostEqual(-8, bars[0].axial_load, 3)
+
+    def test_Shared_Cache_Across_Threads(self):
+        cache = ts.FactorizationCache(max_entries=4)
+
+        def Use(thread):
+            for k in range(2000):
+                key = (thread + k) % 7
+                if cache.Get(key) is None:
+                    cache.Put(key, key)
+                if(k % 50 == 0):
+                    cache.Discard((key + 1) % 7)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(Use, range(8)))
+        self.assertLessEqual(len(cache), 4)
+        self.assertEqual(8*2000, cache.hits + cache.misses)
+
+if __name__ == '__main__':
+    unittest.main()